@@ -0,0 +1,78 @@
+import json
+import os
+import uuid
+import zipfile
+from io import BytesIO
+
+
+class AccountSnapshot(object):
+    """Content of app data directory of a freshly onboarded multiaccount: {path relative to data dir: bytes}"""
+
+    def __init__(self, files: dict, password: str):
+        self.files = files
+        self.password = password
+        self.claimed_path = None  # file of the pool the snapshot is claimed from
+
+    def to_bytes(self):
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            zip_file.writestr('snapshot.json', json.dumps({'password': self.password}))
+            for path, content in self.files.items():
+                zip_file.writestr('data/%s' % path, content)
+        return archive.getvalue()
+
+    @classmethod
+    def from_bytes(cls, content: bytes):
+        with zipfile.ZipFile(BytesIO(content)) as zip_file:
+            meta = json.loads(zip_file.read('snapshot.json'))
+            files = {name[len('data/'):]: zip_file.read(name) for name in zip_file.namelist()
+                     if name.startswith('data/')}
+        return cls(files, meta['password'])
+
+
+class AccountSnapshotPool(object):
+    """
+    Directory of account snapshots made for one apk build. Every snapshot holds its own multiaccount and is
+    claimed by exactly one session (claiming is an atomic rename, so it is safe between xdist workers),
+    which keeps keys of all devices in the run unique. Claimed snapshot is removed once it is restored,
+    or is released back to the pool if restoring fails.
+    """
+
+    def __init__(self, root: str, apk_name: str):
+        self.path = os.path.join(root, apk_name)
+        os.makedirs(self.path, exist_ok=True)
+
+    @property
+    def available(self):
+        return sorted(name for name in os.listdir(self.path) if name.endswith('.zip'))
+
+    def __len__(self):
+        return len(self.available)
+
+    def add(self, snapshot: AccountSnapshot):
+        name = uuid.uuid4().hex
+        tmp_path = os.path.join(self.path, '%s.tmp' % name)
+        with open(tmp_path, 'wb') as file:
+            file.write(snapshot.to_bytes())
+        os.rename(tmp_path, os.path.join(self.path, '%s.zip' % name))
+
+    def claim(self):
+        for name in self.available:
+            path = os.path.join(self.path, name)
+            claimed_path = '%s.claimed.%s' % (path, os.getpid())
+            try:
+                os.rename(path, claimed_path)
+            except OSError:
+                continue  # claimed by another worker
+            with open(claimed_path, 'rb') as file:
+                snapshot = AccountSnapshot.from_bytes(file.read())
+            snapshot.claimed_path = claimed_path
+            return snapshot
+
+    def remove(self, snapshot: AccountSnapshot):
+        """Drops snapshot which is restored: its multiaccount is used by the session"""
+        os.remove(snapshot.claimed_path)
+
+    def release(self, snapshot: AccountSnapshot):
+        """Returns snapshot which failed to be restored to the pool"""
+        os.rename(snapshot.claimed_path, snapshot.claimed_path.rsplit('.claimed.', 1)[0])
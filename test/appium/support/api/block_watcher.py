@@ -0,0 +1,121 @@
+import logging
+import threading
+from collections import deque
+from decimal import Decimal
+
+
+class BlockWatcher(object):
+    """
+    Follows new blocks through `latest` filter of web3 in a background thread and indexes ETH and token
+    transfers of every block by (sender or recipient, value in wei/token units, is token). All waiting tests are woken
+    at once when a block arrives, so one poll of the node serves all of them.
+    Transfers of last `history` blocks are kept. One watcher is shared by the process, see `shared_block_watcher`.
+    """
+    TRANSFER_TOPIC = '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+
+    def __init__(self, w3, poll_interval=2, history=500):
+        self.w3 = w3
+        self.poll_interval = poll_interval
+        self.history = history
+        self.condition = threading.Condition()
+        self.stopped = threading.Event()
+        self.transfers = dict()
+        self.blocks = deque()  # (block number, transfer keys of the block)
+        self.latest_block_number = None
+        threading.Thread(target=self._follow, daemon=True).start()
+
+    @staticmethod
+    def key(address: str, value, token=False, decimals=18):
+        return address.lower().replace('0x', ''), int(Decimal(str(value)) * 10 ** decimals), token
+
+    @staticmethod
+    def _hex(value):
+        return value.hex() if isinstance(value, bytes) else value
+
+    def stop(self):
+        self.stopped.set()
+
+    def _follow(self):
+        block_filter = None
+        while not self.stopped.is_set():
+            try:
+                if block_filter is None:
+                    block_filter = self.w3.eth.filter('latest')
+                for block_hash in block_filter.get_new_entries():
+                    self._add_block(self.w3.eth.getBlock(block_hash, full_transactions=True))
+            except Exception as e:
+                logging.info('Block watcher: failed to get new blocks: %s' % e)
+                block_filter = None  # filters are dropped by node after inactivity, so it is created again
+            self.stopped.wait(self.poll_interval)
+
+    @staticmethod
+    def _index(transfers, transaction, value, token):
+        """Transfer is found by both addresses, as tests wait for transactions of senders as well as of recipients"""
+        for address in transaction['from'], transaction['to']:
+            transfers[(address.lower()[2:], value, token)] = transaction
+
+    def _add_block(self, block):
+        number = block['number']
+        transfers = dict()
+        for transaction in block['transactions']:
+            if transaction['to'] and transaction['value']:
+                self._index(transfers, {
+                    'hash': self._hex(transaction['hash']), 'blockNumber': str(number),
+                    'from': transaction['from'].lower(), 'to': transaction['to'].lower(),
+                    'value': str(transaction['value'])}, transaction['value'], False)
+        for log in self.w3.eth.getLogs({'blockHash': block['hash'], 'topics': [self.TRANSFER_TOPIC]}):
+            if len(log['topics']) != 3:
+                continue  # ERC-721 transfer
+            value = int(self._hex(log['data']), 16)
+            self._index(transfers, {
+                'hash': self._hex(log['transactionHash']), 'blockNumber': str(number),
+                'from': '0x' + self._hex(log['topics'][1])[-40:], 'to': '0x' + self._hex(log['topics'][2])[-40:],
+                'value': str(value), 'contractAddress': log['address'].lower()}, value, True)
+        with self.condition:
+            self.transfers.update(transfers)
+            self.blocks.append((number, list(transfers)))
+            while len(self.blocks) > self.history:
+                for key in self.blocks.popleft()[1]:
+                    self.transfers.pop(key, None)
+            self.latest_block_number = max(number, self.latest_block_number or 0)
+            self.condition.notify_all()
+
+    def wait_for_transfer(self, address: str, value, token=False, decimals=18, timeout=60):
+        """Transaction (in etherscan format) of the transfer which was mined after the watcher start"""
+        key = self.key(address, value, token, decimals)
+        with self.condition:
+            if self.condition.wait_for(lambda: key in self.transfers, timeout):
+                transaction = dict(self.transfers[key])
+                transaction['confirmations'] = str(self.latest_block_number - int(transaction['blockNumber']) + 1)
+                return transaction
+
+    def wait_for_block(self, number: int, timeout=60):
+        """Latest known block number once it reaches `number` or when timeout is over"""
+        with self.condition:
+            self.condition.wait_for(
+                lambda: self.latest_block_number is not None and self.latest_block_number >= number, timeout)
+            return self.latest_block_number
+
+    def wait_for_new_block(self, timeout=60):
+        with self.condition:
+            current = self.latest_block_number
+            self.condition.wait_for(lambda: self.latest_block_number != current, timeout)
+            return self.latest_block_number
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_block_watcher(w3):
+    """Watcher of the process: all NetworkApi instances wait on one poll of the node"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = BlockWatcher(w3)
+        return _shared
+
+
+def running_block_watcher():
+    """Watcher of the process if it is started already, None otherwise"""
+    return _shared
@@ -2,13 +2,17 @@ import logging
 from typing import List
 
 import pytest
+import random
 import requests
 import time
 from json import JSONDecodeError
 from decimal import Decimal
 from os import environ
+from requests.adapters import HTTPAdapter
 import tests
 import support.api.web3_api as w3
+from support.api.block_watcher import running_block_watcher, shared_block_watcher
+from support.api.rate_limiter import SharedTokenBucket
 
 class NetworkApi(object):
 
@@ -16,48 +20,89 @@ class NetworkApi(object):
     def __init__(self):
         self.network_url = 'http://api-ropsten.etherscan.io/api?'
         self.faucet_url = 'https://faucet-ropsten.status.im/donate'
-        self.faucet_backup_address = w3.account_address
         self.headers = {
         'User-Agent':"Mozilla\\5.0 (Macintosh; Intel Mac OS X 10_14_6) AppleWebKit\\537.36 (KHTML, like Gecko) Chrome\\7"
                      "7.0.3865.90 Safari\\537.36", }
         self.chat_bot_url = 'http://offsite.chat:8099'
         self.api_key = environ.get('ETHERSCAN_API_KEY')
+        self.session = requests.Session()
+        for prefix in 'http://', 'https://':
+            self.session.mount(prefix, HTTPAdapter(pool_connections=4, pool_maxsize=20))
+        self.session.headers.update(self.headers)
+        # Etherscan allows 5 calls per second for API key, the limit is shared by all xdist workers
+        self.rate_limiter = SharedTokenBucket('etherscan', rate=4, capacity=4)
+        self.block_ttl = 5
+        self.latest_block = (None, 0)
+        self.cache = dict()
+
+    @property
+    def faucet_backup_address(self):
+        return w3.account_address
+
+    @property
+    def block_watcher(self):
+        return shared_block_watcher(w3.w3)
 
     def log(self, text: str):
         tests.test_suite_data.current_test.testruns[-1].steps.append(text)
         logging.info(text)
 
-    def get_transactions(self, address: str) -> List[dict]:
-        method = self.network_url + 'module=account&action=txlist&address=0x%s&sort=desc&apikey=%s' % (address, self.api_key)
-        for attempt in range(3):
-            try:
-                transactions_response = requests.request('GET', url=method, headers=self.headers).json()
-                if transactions_response:
-                    return transactions_response['result']
-            except TypeError as e:
-                self.log("Check response from etherscan API. Returned values do not match expected. %s" % e)
-            except JSONDecodeError as e:
-                self.log("No valid JSON response from Etherscan: %s " % str(e))
-                pass
-            time.sleep(30)
+    @staticmethod
+    def backoff(attempt: int, base: float = 2, cap: float = 30) -> float:
+        return random.uniform(0, min(cap, base * 2 ** attempt))
 
-    def get_token_transactions(self, address: str) -> List[dict]:
-        method = self.network_url + 'module=account&action=tokentx&address=0x%s&sort=desc&apikey=%s' % (address, self.api_key)
-        for attempt in range(3):
+    def etherscan_request(self, params: str, attempts: int = 4):
+        url = self.network_url + params + '&apikey=%s' % self.api_key
+        for attempt in range(attempts):
+            self.rate_limiter.acquire()
             try:
-                transactions_response = requests.request('GET', url=method, headers=self.headers).json()
-                if transactions_response:
-                    return transactions_response['result']
-            except TypeError as e:
+                response = self.session.get(url, timeout=30).json()
+                if response.get('message') == 'NOTOK':
+                    self.log("Etherscan request is rejected: %s" % response['result'])
+                else:
+                    return response['result']
+            except (TypeError, KeyError, AttributeError) as e:
                 self.log("Check response from etherscan API. Returned values do not match expected. %s" % str(e))
-            except JSONDecodeError as e:
+            except (JSONDecodeError, requests.RequestException) as e:
                 self.log("No valid JSON response from Etherscan: %s " % str(e))
-                pass
-            time.sleep(30)
+            if attempt < attempts - 1:
+                time.sleep(self.backoff(attempt))
+
+    def get_cached_latest_block_number(self):
+        """Block height from the block watcher or the node, so Etherscan calls are spent on data only"""
+        watcher = running_block_watcher()
+        if watcher and watcher.latest_block_number is not None:
+            return watcher.latest_block_number
+        block_number, updated = self.latest_block
+        if time.time() - updated > self.block_ttl:
+            try:
+                block_number = w3.latest_block_number()
+            except Exception as e:
+                logging.info('Failed to get latest block number: %s' % e)
+                block_number = None
+            self.latest_block = (block_number, time.time())
+        return block_number
+
+    def cached_etherscan_request(self, params: str):
+        """Etherscan results are requested again only when a new block is mined"""
+        block_number = self.get_cached_latest_block_number()
+        cached = self.cache.get(params)
+        if block_number is not None and cached and cached[0] == block_number:
+            return cached[1]
+        result = self.etherscan_request(params)
+        if block_number is not None and result is not None:
+            self.cache[params] = (block_number, result)
+        return result
+
+    def get_transactions(self, address: str) -> List[dict]:
+        return self.cached_etherscan_request('module=account&action=txlist&address=0x%s&sort=desc' % address)
+
+    def get_token_transactions(self, address: str) -> List[dict]:
+        return self.cached_etherscan_request('module=account&action=tokentx&address=0x%s&sort=desc' % address)
 
     def is_transaction_successful(self, transaction_hash: str) -> int:
-        method = self.network_url + 'module=transaction&action=getstatus&txhash=%s' % transaction_hash
-        return not int(requests.request('GET', url=method, headers=self.headers).json()['result']['isError'])
+        return not int(self.etherscan_request('module=transaction&action=getstatus&txhash=%s' % transaction_hash)[
+                           'isError'])
 
     def get_balance(self, address):
         address = '0x' + address
@@ -66,8 +111,7 @@ class NetworkApi(object):
         return int(balance)
 
     def get_latest_block_number(self) -> int:
-        method = self.network_url + 'module=proxy&action=eth_blockNumber'
-        return int(requests.request('GET', url=method).json()['result'], 0)
+        return int(self.etherscan_request('module=proxy&action=eth_blockNumber'), 0)
 
     def find_transaction_by_hash(self,transaction_hash: str):
         transaction = w3.transaction_status(transaction_hash)
@@ -76,34 +120,32 @@ class NetworkApi(object):
 
     def find_transaction_by_unique_amount(self, address, amount, token=False, decimals=18, wait_time=300):
         additional_info = 'token transactions' if token else 'ETH transactions'
-        counter = 0
-        while True:
-            if counter >= wait_time:
-                for entry in range(0,5):
-                    self.log('Transaction #%s, amount is %s' %(entry+1, float(int(transactions[entry]['value']) / 10 ** decimals)))
-                    self.log(str(transactions[entry]))
-                pytest.fail(
-                    'Transaction with amount %s is not found in list of %s, address is %s during %ss' %
-                    (amount, additional_info, address, wait_time))
-            else:
-                self.log("Finding tx in %s, attempt #%s" % (additional_info, str(int(counter / 30)+1)))
-                try:
-                    if token:
-                        transactions = self.get_token_transactions(address)
-                    else:
-                        transactions = self.get_transactions(address)
-                    counter += 30
-                    time.sleep(30)
-                except JSONDecodeError as e:
-                    self.log("No valid JSON response from Etherscan: %s " % str(e))
-                    continue
-                try:
-                    for transaction in transactions:
-                        if float(int(transaction['value']) / 10 ** decimals) == float(amount):
-                            return transaction
-                except TypeError as e:
-                    self.log("Failed iterate transactions(Etherscan unexpected error): " + str(e))
-                    continue
+        block_watcher = self.block_watcher  # started before etherscan lookup not to miss blocks in between
+        start_time = time.time()
+        attempt, transactions = 0, list()
+        while time.time() - start_time < wait_time:
+            attempt += 1
+            self.log("Finding tx in %s, attempt #%s" % (additional_info, attempt))
+            transactions = self.get_token_transactions(address) if token else self.get_transactions(address)
+            try:
+                for transaction in transactions:
+                    if float(int(transaction['value']) / 10 ** decimals) == float(amount):
+                        return transaction
+            except TypeError as e:
+                self.log("Failed iterate transactions(Etherscan unexpected error): " + str(e))
+                transactions = list()
+            # new blocks are watched, etherscan is checked again only if watcher doesn't see the transfer
+            transaction = block_watcher.wait_for_transfer(
+                address, amount, token, decimals, timeout=min(30, max(wait_time - (time.time() - start_time), 0)))
+            if transaction:
+                self.log("Transaction %s is found in block %s" % (transaction['hash'], transaction['blockNumber']))
+                return transaction
+        for entry, transaction in enumerate(transactions[:5]):
+            self.log('Transaction #%s, amount is %s' % (entry + 1, float(int(transaction['value']) / 10 ** decimals)))
+            self.log(str(transaction))
+        pytest.fail(
+            'Transaction with amount %s is not found in list of %s, address is %s during %ss' %
+            (amount, additional_info, address, wait_time))
 
     def wait_for_confirmation_of_transaction(self, address, amount, confirmations=6, token=False):
         start_time = time.time()
@@ -112,27 +154,35 @@ class NetworkApi(object):
         else:
             token_info = "ETH transaction"
         self.log('Waiting %s %s for %s to have %s confirmations' % (amount, token_info, address, confirmations))
+        transaction = self.find_transaction_by_unique_amount(address, amount, token)
+        block_number, actual_confirmations = int(transaction['blockNumber']), int(transaction['confirmations'])
         while round(time.time() - start_time, ndigits=2) < 600:  # should be < idleTimeout capability
-            transaction = self.find_transaction_by_unique_amount(address, amount, token)
-            self.log(
-                'Expected amount of confirmations is %s, in fact %s' % (confirmations, transaction['confirmations']))
-            if int(transaction['confirmations']) >= confirmations:
+            self.log('Expected amount of confirmations is %s, in fact %s' % (confirmations, actual_confirmations))
+            if actual_confirmations >= confirmations:
                 return
-            time.sleep(20)
-        pytest.fail('Transaction with amount %s was not confirmed, address is %s, still has %s confirmations' % (amount, address, int(transaction['confirmations'])))
+            latest_block_number = self.block_watcher.wait_for_block(block_number + confirmations - 1, timeout=60)
+            if latest_block_number is None:
+                latest_block_number = self.get_cached_latest_block_number()
+            if latest_block_number is not None:
+                actual_confirmations = max(actual_confirmations, latest_block_number - block_number + 1)
+        pytest.fail('Transaction with amount %s was not confirmed, address is %s, still has %s confirmations' % (
+            amount, address, actual_confirmations))
+
+    def wait_for_balance_change(self, initial_balance, address, wait_time):
+        """Balance is checked once per new block; returns new balance or None if it is not changed in time"""
+        start_time = time.time()
+        while time.time() - start_time < wait_time:
+            balance = self.get_balance(address)
+            if balance != initial_balance:
+                return balance
+            self.block_watcher.wait_for_new_block(timeout=min(30, max(wait_time - (time.time() - start_time), 0)))
+            self.log('Waiting %s seconds for for changing account balance from %s' % (
+                int(time.time() - start_time), initial_balance))
 
     def verify_balance_is_updated(self, initial_balance, recipient_address, wait_time=360):
-        counter = 0
-        while True:
-            if counter >= wait_time:
-                pytest.fail('Balance is not changed during %s seconds' % wait_time)
-            elif initial_balance == self.get_balance(recipient_address):
-                counter += 10
-                time.sleep(10)
-                self.log('Waiting %s seconds for for changing account balance from %s' % (counter, initial_balance))
-            else:
-                self.log('Balance is updated!')
-                return
+        if self.wait_for_balance_change(initial_balance, recipient_address, wait_time) is None:
+            pytest.fail('Balance is not changed during %s seconds' % wait_time)
+        self.log('Balance is updated!')
 
     def verify_balance_is(self, expected_balance: int, recipient_address: str, errors: list):
         balance = self.get_balance(recipient_address)
@@ -142,7 +192,7 @@ class NetworkApi(object):
     def faucet(self, address):
         try:
             self.log("Trying to get funds from %s" % self.faucet_url)
-            return requests.request('GET', '%s/0x%s' % (self.faucet_url, address)).json()
+            return self.session.get('%s/0x%s' % (self.faucet_url, address)).json()
         except JSONDecodeError as e:
             self.log("No valid JSON response from Etherscan: %s " % str(e))
             pass
@@ -154,26 +204,19 @@ class NetworkApi(object):
 
     def get_donate(self, address, external_faucet=False, wait_time=300):
         initial_balance = self.get_balance(address)
-        counter = 0
         if initial_balance < 1000000000000000000:
             if external_faucet:
                 self.faucet_backup(address)
             else:
                 self.faucet(address)
-            while True:
-                if counter >= wait_time:
-                    pytest.fail("Donation was not received during %s seconds!" % wait_time)
-                elif self.get_balance(address) == initial_balance:
-                    counter += 10
-                    time.sleep(10)
-                    self.log('Waiting %s seconds for donation' % counter)
-                else:
-                    self.log('Got %s Gwei for %s' % (self.get_balance(address), address))
-                    return
+            balance = self.wait_for_balance_change(initial_balance, address, wait_time)
+            if balance is None:
+                pytest.fail("Donation was not received during %s seconds!" % wait_time)
+            self.log('Got %s Gwei for %s' % (balance, address))
 
     def start_chat_bot(self, chat_name: str, messages_number: int, interval: int = 1) -> list:
         url = '%s/ping/%s?count=%s&interval=%s' % (self.chat_bot_url, chat_name, messages_number, interval)
-        text = requests.request('GET', url).text
+        text = self.session.get(url).text
         return [i.split(maxsplit=5)[-1].strip('*') for i in text.splitlines()]
 
     def get_rounded_balance(self, fetched_balance, actual_balance):
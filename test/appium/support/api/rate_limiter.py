@@ -0,0 +1,47 @@
+import fcntl
+import json
+import os
+import tempfile
+import time
+
+
+class SharedTokenBucket(object):
+    """
+    Token bucket which state is kept in a file, so the limit of requests per second is shared by all processes
+    (xdist workers) on the host: every process takes a token under an exclusive file lock.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.path = os.path.join(tempfile.gettempdir(), '%s.bucket' % name)
+
+    def _take(self):
+        """Takes a token if there is one, otherwise returns seconds to wait for the next token"""
+        with open(self.path, 'a+') as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                file.seek(0)
+                try:
+                    state = json.loads(file.read())
+                except ValueError:
+                    state = {'tokens': self.capacity, 'updated': time.time()}
+                now = time.time()
+                tokens = min(self.capacity, state['tokens'] + (now - state['updated']) * self.rate)
+                if tokens >= 1:
+                    tokens -= 1
+                    wait = 0
+                else:
+                    wait = (1 - tokens) / self.rate
+                file.seek(0)
+                file.truncate()
+                file.write(json.dumps({'tokens': tokens, 'updated': now}))
+                return wait
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def acquire(self):
+        wait = self._take()
+        while wait:
+            time.sleep(wait)
+            wait = self._take()
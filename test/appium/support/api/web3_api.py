@@ -1,5 +1,31 @@
-from eth_utils import to_checksum_address, is_address
-from web3.auto.infura.ropsten import w3
+import threading
+import time
+
+
+class LazyWeb3(object):
+    """
+    Facade of web3 client: web3 is imported and ropsten provider is set up on the first chain call,
+    not on import of the module, so collection and UI-only runs don't pay for them
+    """
+
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from web3.auto.infura.ropsten import w3 as client
+                    self._client = client
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+w3 = LazyWeb3()
 
 
 token_data = {"STT": [{
@@ -13,10 +39,13 @@ class Account(object):
 
     def __init__(self, account_private_key):
         self.pk = account_private_key
+        self._address = None
 
     @property
     def account_address(self):
-        return w3.eth.account.from_key(self.pk).address
+        if self._address is None:
+            self._address = w3.eth.account.from_key(self.pk).address
+        return self._address
 
     @property
     def nonce(self):
@@ -67,7 +96,50 @@ class ContractInteractions(object):
         )
 
 
+class BalanceWatch(object):
+    """
+    Chain-side balance of the address in ETH or in tokens from `token_data`, so UI can be refreshed only after
+    the change is seen on chain. Other assets are not supported: `balance` is None for them.
+    """
+
+    def __init__(self, address, asset='ETH', poll_interval=5):
+        self.address = address if address.startswith('0x') else '0x' + address
+        self.asset = asset
+        self.poll_interval = poll_interval
+        self.contract = ContractInteractions(token_data[asset][0]['address'], token_data[asset][0]['abi']) \
+            if asset in token_data else None
+        self._decimals = None
+
+    @property
+    def is_supported(self):
+        return self.asset == 'ETH' or self.contract is not None
+
+    @property
+    def balance(self):
+        if self.asset == 'ETH':
+            return balance_of_address(self.address) / 10 ** 18
+        if self.contract:
+            if self._decimals is None:
+                self._decimals = self.contract.decimals
+            return self.contract.balance_of(to_checksumed_address(self.address)) / 10 ** self._decimals
+
+    def wait_until(self, condition, timeout):
+        """Polls chain until condition(balance) is true; returns False if it is not met in `timeout` seconds"""
+        start_time = time.time()
+        while True:
+            try:
+                balance = self.balance
+            except (ValueError, IOError):
+                balance = None
+            if balance is not None and condition(balance):
+                return True
+            if time.time() - start_time >= timeout:
+                return False
+            time.sleep(self.poll_interval)
+
+
 def balance_of_address(address):
+    from eth_utils import to_checksum_address, is_address
     if not is_address(address):
         return ("Invalid address provided")
     else:
@@ -81,9 +153,14 @@ def get_tx_param_by_hash(hash: str, param: str):
 
 
 def to_checksumed_address(address):
+    from eth_utils import to_checksum_address
     return to_checksum_address(address)
 
 
+def latest_block_number():
+    return w3.eth.blockNumber
+
+
 def current_gas_price():
     return str(w3.eth.gasPrice / 1000000000)
 
@@ -98,7 +175,13 @@ def broadcast_signed_tx(signed_txn):
 
 
 account = Account(ACCOUNT_PRIVATE_KEY)
-account_address = account.account_address
+
+
+def __getattr__(name):
+    # address is derived from the key on the first use of `account_address`
+    if name == 'account_address':
+        return account.account_address
+    raise AttributeError('module %s has no attribute %s' % (__name__, name))
 
 
 def donate_testnet_eth(address=str(), amount=float(), inscrease_default_gas_price=int()):
@@ -119,10 +202,10 @@ def donate_testnet_token(token_name=str(), address=str(), amount=float(), inscre
     """
     token_contract = ContractInteractions(token_data[token_name][0]['address'], token_data[token_name][0]['abi'])
     to_address_data = token_contract.transfer_token_to(
-        from_address=account_address,
+        from_address=account.account_address,
         to_address=address,
         number_of_tokens=amount,
-        nonce=token_contract.nonce(account_address),
+        nonce=token_contract.nonce(account.account_address),
         gas_price_increment=inscrease_default_gas_price)
     signed_tx = sign_transaction(tx_data=to_address_data, pk=account.pk)
     return broadcast_signed_tx(signed_tx)
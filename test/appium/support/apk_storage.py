@@ -0,0 +1,202 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+import requests
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ApkCache(object):
+    """
+    Content-addressed cache of APKs: `<sha256>.apk` files and index of sources (URL or path) they came from
+    with their MD5 (which Sauce storage reports for stored files) and size.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.expanduser(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.index_path = os.path.join(self.directory, 'index.json')
+
+    def _index(self):
+        try:
+            with open(self.index_path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return dict()
+
+    def path(self, sha256):
+        return os.path.join(self.directory, '%s.apk' % sha256)
+
+    def lookup(self, source):
+        """{'sha256', 'md5', 'size'} of the source if its APK is in the cache"""
+        entry = self._index().get(source)
+        if entry and os.path.exists(self.path(entry['sha256'])):
+            return entry
+
+    def add(self, source, temp_path, hashes, validators=None):
+        entry = {'sha256': hashes.sha256.hexdigest(), 'md5': hashes.md5.hexdigest(), 'size': hashes.size,
+                 'validators': validators or dict()}
+        os.replace(temp_path, self.path(entry['sha256']))
+        index = self._index()
+        index[source] = entry
+        temp_index = self.index_path + '.%s' % os.getpid()
+        with open(temp_index, 'w') as file:
+            json.dump(index, file, indent=1)
+        os.replace(temp_index, self.index_path)
+        return entry
+
+    def temp_file(self):
+        return tempfile.NamedTemporaryFile(dir=self.directory, suffix='.part', delete=False)
+
+
+def validators(headers):
+    """Headers which tell whether content behind URL is still the same as the cached one"""
+    return dict((name, headers[name]) for name in ('ETag', 'Last-Modified') if headers.get(name))
+
+
+class Hashes(object):
+
+    def __init__(self):
+        self.md5 = hashlib.md5()
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def update(self, chunk):
+        self.md5.update(chunk)
+        self.sha256.update(chunk)
+        self.size += len(chunk)
+
+
+class TeeReader(object):
+    """
+    File-like body for upload which reads the download stream chunk by chunk, writing every chunk to the cache
+    file and hashing it, so APK is not buffered in memory and is downloaded once for upload and cache.
+    """
+
+    def __init__(self, response, cache_file, length):
+        self.raw = response.raw
+        self.cache_file = cache_file
+        self.length = length
+        self.hashes = Hashes()
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=CHUNK_SIZE):
+        chunk = self.raw.read(size if size and size > 0 else CHUNK_SIZE, decode_content=True)
+        if chunk:
+            self.cache_file.write(chunk)
+            self.hashes.update(chunk)
+        return chunk
+
+
+def file_hashes(path):
+    hashes = Hashes()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            hashes.update(chunk)
+    return hashes
+
+
+class SauceApkStorage(object):
+    """
+    Uploads APK to Sauce storage unless the same content is stored under the name already. APK from URL which is
+    not in the cache is not downloaded if a file with the name is stored, as the name identifies the build.
+    Cached APK is uploaded over a different stored one only if the server confirms it is still behind the URL.
+    """
+    upload_url = 'http://saucelabs.com/rest/v1/storage/%s/%s?overwrite=true'
+
+    def __init__(self, sauce, username, access_key, cache: ApkCache):
+        self.sauce = sauce
+        self.auth = (username, access_key)
+        self.username = username
+        self.cache = cache
+
+    def stored_file(self, name):
+        """{'name', 'md5', 'size'} of the file in storage; storage API has no lookup by name, so one listing is used"""
+        for stored_file in self.sauce.storage.get_stored_files()['files']:
+            if stored_file['name'] == name:
+                return stored_file
+
+    def upload(self, name, data):
+        """MD5 of the uploaded file as Sauce storage computed it"""
+        response = requests.post(self.upload_url % (self.username, name), auth=self.auth, data=data,
+                                 headers={'Content-Type': 'application/octet-stream'})
+        response.raise_for_status()
+        return response.json().get('md5')
+
+    @staticmethod
+    def verify(name, uploaded_md5, md5):
+        if uploaded_md5 and uploaded_md5 != md5:
+            raise IOError('%s is corrupted on upload: md5 %s instead of %s' % (name, uploaded_md5, md5))
+
+    def upload_file(self, name, path, md5):
+        with open(path, 'rb') as file:
+            self.verify(name, self.upload(name, file), md5)
+
+    @staticmethod
+    def is_current(source, entry):
+        """
+        Whether cached APK is still the one behind the URL (the URL may be reused for a new build): its ETag or
+        Last-Modified and size match response to HEAD request. Entry without validators is never current.
+        """
+        if not entry.get('validators'):
+            return False
+        try:
+            response = requests.head(source, allow_redirects=True, timeout=30)
+            response.raise_for_status()
+        except requests.RequestException:
+            return False
+        length = response.headers.get('Content-Length')
+        if length and 'Content-Encoding' not in response.headers and int(length) != entry['size']:
+            return False
+        return validators(response.headers) == entry['validators']
+
+    def ensure_uploaded(self, source, name):
+        """Makes APK from URL or local path available in storage as `name` with as few transfers as possible"""
+        stored_file = self.stored_file(name)
+        stored_md5 = stored_file.get('md5') if stored_file else None
+        if not source.startswith('http'):
+            md5 = file_hashes(source).md5.hexdigest()
+            if md5 != stored_md5:
+                self.upload_file(name, source, md5)
+            return
+        cached = self.cache.lookup(source)
+        if cached and cached['md5'] == stored_md5:
+            return
+        if cached and self.is_current(source, cached):
+            logging.info('Uploading %s from APK cache' % name)
+            self.upload_file(name, self.cache.path(cached['sha256']), cached['md5'])
+            return
+        if stored_file and not cached:
+            # there is no local copy to compare with, so APK stored under the build name is not downloaded again
+            logging.info('%s is in storage already' % name)
+            return
+        with requests.get(source, stream=True) as response:
+            response.raise_for_status()
+            length = int(response.headers.get('Content-Length') or 0)
+            streamed = length and 'Content-Encoding' not in response.headers
+            cache_file = self.cache.temp_file()
+            try:
+                with cache_file:
+                    if streamed:
+                        body = TeeReader(response, cache_file, length)
+                        uploaded_md5 = self.upload(name, body)
+                        hashes = body.hashes
+                    else:
+                        # size is unknown, so APK is downloaded to the cache first and uploaded from there
+                        hashes = Hashes()
+                        for chunk in response.iter_content(CHUNK_SIZE):
+                            cache_file.write(chunk)
+                            hashes.update(chunk)
+                entry = self.cache.add(source, cache_file.name, hashes, validators(response.headers))
+            finally:
+                if os.path.exists(cache_file.name):
+                    os.remove(cache_file.name)
+        if streamed:
+            self.verify(name, uploaded_md5, entry['md5'])
+        else:
+            self.upload_file(name, self.cache.path(entry['sha256']), entry['md5'])
@@ -1,15 +1,19 @@
-import time
 import json
 import hmac
 import os
 from hashlib import md5
-from sauceclient import SauceException
 
+from support.report_store import ReportStore
+from support.sauce_assets import SauceAssetResolver
 from support.test_data import SingleTestData
 
 
 class BaseTestReport:
     TEST_REPORT_DIR = "%s/../report" % os.path.dirname(os.path.abspath(__file__))
+    STATS_SUFFIX = '.stats.json'
+    STORE_FILE = 'tests.jsonl'
+    stores = dict()  # report dir: store shared by all reports of the process
+    sauce_asset_resolver = None
 
     def __init__(self):
         self.sauce_username = os.environ.get('SAUCE_USERNAME')
@@ -17,33 +21,32 @@ class BaseTestReport:
         self.init_report()
 
     def init_report(self):
+        if self.TEST_REPORT_DIR in self.stores:
+            return
         if not os.path.exists(self.TEST_REPORT_DIR):
             os.makedirs(self.TEST_REPORT_DIR)
-        # delete all old files in report dir
-        file_list = [f for f in os.listdir(self.TEST_REPORT_DIR)]
-        for f in file_list:
-            os.remove(os.path.join(self.TEST_REPORT_DIR, f))
-
-    def get_test_report_file_path(self, test_name):
-        file_name = "%s.json" % test_name
-        return os.path.join(self.TEST_REPORT_DIR, file_name)
-
-    def save_geth(self, geth: dict):
-        geth_paths = {}
-        for log in geth.keys():
-            geth_path = os.path.join(self.TEST_REPORT_DIR, log)
-            result = open(geth_path, 'wb')
-            result.write(geth[log])
-            result.close()
-            geth_paths[log] = geth_path
-        return geth_paths
-
-    def save_test(self, test, geth: dict = None):
-        if geth:
-            geth_paths = self.save_geth(geth)
-        else:
+        # delete all old files in report dir; xdist workers start when master has done it
+        if not os.environ.get('PYTEST_XDIST_WORKER'):
+            for f in os.listdir(self.TEST_REPORT_DIR):
+                os.remove(os.path.join(self.TEST_REPORT_DIR, f))
+        self.stores[self.TEST_REPORT_DIR] = ReportStore(os.path.join(self.TEST_REPORT_DIR, self.STORE_FILE),
+                                                         load=self.load_test)
+
+    @property
+    def store(self):
+        return self.stores[self.TEST_REPORT_DIR]
+
+    def save_stats(self, name, stats):
+        """Auxiliary data (command traces, benchmarks...) which is stored in report dir but is not a test report"""
+        with open(os.path.join(self.TEST_REPORT_DIR, name + self.STATS_SUFFIX), 'w') as file:
+            json.dump(stats, file)
+
+    def get_geth_path(self, log_name):
+        return os.path.join(self.TEST_REPORT_DIR, log_name)
+
+    def save_test(self, test, geth_paths: dict = None):
+        if not geth_paths:
             geth_paths = test.geth_paths
-        file_path = self.get_test_report_file_path(test.name)
         test_dict = {
             'testrail_case_id': test.testrail_case_id,
             'name': test.name,
@@ -52,42 +55,39 @@ class BaseTestReport:
         }
         for testrun in test.testruns:
             test_dict['testruns'].append(testrun.__dict__)
-        json.dump(test_dict, open(file_path, 'w'))
+        self.store.save(test_dict)
+
+    @staticmethod
+    def load_test(test_data):
+        testruns = list()
+        for testrun_data in test_data['testruns']:
+            testruns.append(SingleTestData.TestRunData(
+                steps=testrun_data['steps'],
+                jobs=testrun_data['jobs'],
+                error=testrun_data['error'],
+                first_commands=testrun_data['first_commands'],
+                duration=testrun_data.get('duration', 0),
+                rerun_reason=testrun_data.get('rerun_reason')))
+        return SingleTestData(name=test_data['name'],
+                              geth_paths=test_data['geth_paths'],
+                              testruns=testruns,
+                              testrail_case_id=test_data['testrail_case_id'])
 
     def get_all_tests(self):
-        tests = list()
-        file_list = [f for f in os.listdir(self.TEST_REPORT_DIR) if f.endswith('json')]
-        for file_name in file_list:
-            file_path = os.path.join(self.TEST_REPORT_DIR, file_name)
-            test_data = json.load(open(file_path))
-            testruns = list()
-            for testrun_data in test_data['testruns']:
-                testruns.append(SingleTestData.TestRunData(
-                    steps=testrun_data['steps'],
-                    jobs=testrun_data['jobs'],
-                    error=testrun_data['error'],
-                    first_commands=testrun_data['first_commands']))
-            tests.append(SingleTestData(name=test_data['name'],
-                                        geth_paths=test_data['geth_paths'],
-                                        testruns=testruns,
-                                        testrail_case_id=test_data['testrail_case_id']))
-        return tests
+        self.store.refresh()
+        return list(self.store.tests.values())
 
     def get_failed_tests(self):
-        tests = self.get_all_tests()
-        failed = list()
-        for test in tests:
-            if not self.is_test_successful(test):
-                failed.append(test)
-        return failed
+        self.store.refresh()
+        return [test for name, test in self.store.tests.items() if name in self.store.failed]
 
     def get_passed_tests(self):
-        tests = self.get_all_tests()
-        passed = list()
-        for test in tests:
-            if self.is_test_successful(test):
-                passed.append(test)
-        return passed
+        self.store.refresh()
+        return [test for name, test in self.store.tests.items() if name not in self.store.failed]
+
+    def get_test_by_testrail_id(self, testrail_case_id):
+        self.store.refresh()
+        return self.store.tests.get(self.store.testrail_ids.get(testrail_case_id))
 
     def get_sauce_token(self, job_id):
         return hmac.new(bytes(self.sauce_username + ":" + self.sauce_access_key, 'latin-1'),
@@ -105,15 +105,43 @@ class BaseTestReport:
         return 'https://ci.status.im/job/end-to-end-tests/job/status-app-prs-rerun/parambuild/' \
                '?BRANCH_NAME=%s&APK_NAME=%s&PR_ID=%s&TR_CASE_IDS=%s' % (branch_name, apk_name, pr_id, tr_case_ids)
 
+    @property
+    def sauce_assets(self):
+        if BaseTestReport.sauce_asset_resolver is None:
+            from tests.conftest import sauce
+            BaseTestReport.sauce_asset_resolver = SauceAssetResolver(sauce, self.sauce_username, self.sauce_access_key)
+        return BaseTestReport.sauce_asset_resolver
+
+    def prefetch_sauce_assets(self, tests):
+        """Starts fetching assets of all sessions of failed tests, so reports don't wait for them one by one"""
+        self.sauce_assets.prefetch([job_id for test in tests if test.testruns[-1].error
+                                    for job_id in test.testruns[-1].jobs])
+
     def get_sauce_final_screenshot_url(self, job_id):
-        token = self.get_sauce_token(job_id)
-        from tests.conftest import sauce
-        for _ in range(10):
-            try:
-                scr_number = sauce.jobs.get_job_assets(job_id)['screenshots'][-1]
-                return 'https://assets.saucelabs.com/jobs/%s/%s?auth=%s' % (job_id, scr_number, token)
-            except SauceException:
-                time.sleep(3)
+        scr_number = self.sauce_assets.final_screenshot(job_id)
+        if scr_number:
+            return 'https://assets.saucelabs.com/jobs/%s/%s?auth=%s' % (job_id, scr_number, self.get_sauce_token(job_id))
+
+    @staticmethod
+    def get_rerun_stats(tests):
+        """{error category: {'reruns': number, 'time': seconds of rerun attempts}}"""
+        stats = dict()
+        for test in tests:
+            for failed, rerun in zip(test.testruns, test.testruns[1:]):
+                if failed.rerun_reason:
+                    category = stats.setdefault(failed.rerun_reason, {'reruns': 0, 'time': 0})
+                    category['reruns'] += 1
+                    category['time'] += rerun.duration
+        return stats
+
+    def get_rerun_summary(self, tests):
+        stats = self.get_rerun_stats(tests)
+        if not stats:
+            return str()
+        return 'Reruns: %d, %.1f min (%s)' % (
+            sum(category['reruns'] for category in stats.values()), sum(c['time'] for c in stats.values()) / 60,
+            ', '.join('%s: %d, %.1f min' % (name, category['reruns'], category['time'] / 60)
+                      for name, category in sorted(stats.items())))
 
     @staticmethod
     def is_test_successful(test):
@@ -0,0 +1,113 @@
+import os
+import sys
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+
+VIEWS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'views')
+
+_thread_state = threading.local()
+
+
+@contextmanager
+def untraced():
+    """Commands sent by the current thread in the block (background pulls) aren't traced or counted"""
+    _thread_state.untraced = True
+    try:
+        yield
+    finally:
+        _thread_state.untraced = False
+
+
+def is_untraced():
+    return getattr(_thread_state, 'untraced', False)
+
+
+class CommandTracer(object):
+    """
+    Records every command issued by the driver: name, locator, calling page object (view/element classes
+    and methods found on the call stack), latency, error and retry number - how many times in a row the same
+    command was sent for the same locator from the same place.
+    """
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self):
+        self.records = list()
+        self.locators = dict()  # element id: locator it was found by
+
+    def reset(self):
+        self.records = list()
+        self.locators = dict()
+
+    @staticmethod
+    def call_site():
+        """'OuterView.method > InnerElement.method' of page objects methods on the stack, test location otherwise"""
+        frame, page_objects, caller = sys._getframe(2), list(), None
+        while frame:
+            code = frame.f_code
+            if code.co_filename.startswith(VIEWS_DIR):
+                owner = frame.f_locals.get('self')
+                name = '%s.%s' % (type(owner).__name__, code.co_name) if owner is not None else code.co_name
+                if not page_objects or page_objects[-1] != name:
+                    page_objects.append(name)
+            elif page_objects or os.path.basename(code.co_filename).startswith('test_'):
+                caller = '%s:%s' % (os.path.basename(code.co_filename), frame.f_lineno)
+                break
+            frame = frame.f_back
+        if page_objects:
+            return ' > '.join(page_objects[::-1] if len(page_objects) < 3 else [page_objects[-1], page_objects[0]])
+        return caller or 'harness'
+
+    def locator(self, params):
+        if 'using' in params:
+            return '%s: %s' % (params['using'], params['value'])
+        return self.locators.get(params.get('id'))
+
+    def record(self, command, params, latency, response=None, error=None):
+        params = params or dict()
+        locator, site = self.locator(params), self.call_site()
+        if command in ('findElement', 'findElements') and response:
+            found = response.get('value')
+            for element in found if isinstance(found, list) else [found]:
+                if hasattr(element, 'id'):
+                    self.locators[element.id] = locator
+        retry = 0
+        if self.records:
+            last = self.records[-1]
+            if (last['command'], last['locator'], last['site']) == (command, locator, site):
+                retry = last['retry'] + 1
+        self.records.append({'command': command, 'locator': locator, 'site': site, 'latency': round(latency, 4),
+                             'retry': retry, 'error': type(error).__name__ if error else None})
+
+    def histogram(self, latencies):
+        counts = [0] * (len(self.BUCKETS) + 1)
+        for latency in latencies:
+            counts[bisect_left(self.BUCKETS, latency)] += 1
+        labels = ['<=%ss' % bucket for bucket in self.BUCKETS] + ['>%ss' % self.BUCKETS[-1]]
+        return dict(zip(labels, counts))
+
+    @staticmethod
+    def percentile(latencies, percent):
+        return round(sorted(latencies)[min(len(latencies) - 1, int(len(latencies) * percent / 100))], 3)
+
+    def report(self, top=10, wait_stats=None):
+        by_command, by_site = defaultdict(list), defaultdict(list)
+        for record in self.records:
+            by_command[record['command']].append(record['latency'])
+            by_site[record['site']].append(record)
+        sites = [{'site': site, 'commands': len(records), 'retries': sum(1 for r in records if r['retry']),
+                  'errors': sum(1 for r in records if r['error']),
+                  'time': round(sum(r['latency'] for r in records), 3)} for site, records in by_site.items()]
+        return {
+            'commands': len(self.records),
+            'time': round(sum(record['latency'] for record in self.records), 3),
+            'histogram': self.histogram(record['latency'] for record in self.records),
+            'by_command': {command: {'count': len(latencies), 'time': round(sum(latencies), 3),
+                                     'p50': self.percentile(latencies, 50), 'p95': self.percentile(latencies, 95),
+                                     'histogram': self.histogram(latencies)}
+                           for command, latencies in by_command.items()},
+            'slowest_call_sites': sorted(sites, key=lambda site: site['time'], reverse=True)[:top],
+            'slowest_commands': sorted(self.records, key=lambda record: record['latency'], reverse=True)[:top],
+            'waits': wait_stats or list(),
+        }
@@ -0,0 +1,384 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lxml import etree
+
+from support.page_source import PageSourceSnapshot
+
+SCENARIOS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_scenarios')
+
+# 1x1 transparent png
+PNG = 'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII='
+
+NO_SUCH_ELEMENT, STALE_ELEMENT = 7, 10
+
+
+class Scenario(object):
+    """
+    Recorded flow of the app: page sources of screens by name, the screen shown after session start and
+    transitions - which screen is shown after tap on element (xpath on the current screen) of a screen:
+    {"start": "welcome", "screens": {"welcome": "<hierarchy>...</hierarchy>"},
+     "transitions": [{"from": "welcome", "xpath": "//*[@text='Get started']", "to": "intro"}]}
+    """
+
+    def __init__(self, start: str, screens: dict, transitions: list):
+        self.start = start
+        self.screens = screens
+        self.transitions = transitions
+
+    @classmethod
+    def load(cls, name_or_path: str):
+        path = name_or_path if os.path.exists(name_or_path) else os.path.join(SCENARIOS_DIR, '%s.json' % name_or_path)
+        with open(path) as file:
+            data = json.load(file)
+        return cls(data['start'], data['screens'], data['transitions'])
+
+    def to_dict(self):
+        return {'start': self.start, 'screens': self.screens, 'transitions': self.transitions}
+
+
+class FakeSession(object):
+
+    def __init__(self, scenario: Scenario):
+        self.scenario = scenario
+        self.trees = dict()  # screens are parsed once and keep typed values until the session end
+        self.screen = scenario.start
+        self.implicit_wait = 0
+
+    @property
+    def tree(self):
+        if self.screen not in self.trees:
+            self.trees[self.screen] = etree.fromstring(self.scenario.screens[self.screen].encode('utf-8'))
+        return self.trees[self.screen]
+
+    def element_id(self, node):
+        return '%s.%s' % (self.screen, list(self.tree.iter()).index(node))
+
+    def node(self, element_id):
+        screen, _, number = element_id.rpartition('.')
+        if screen != self.screen:
+            return None
+        return list(self.tree.iter())[int(number)]
+
+    def find(self, by, locator, parent=None):
+        xpath = PageSourceSnapshot.to_xpath(by, locator)
+        if not xpath:
+            return list()
+        if parent is not None and not xpath.startswith('.'):
+            xpath = '.' + xpath if xpath.startswith('/') else './/' + xpath
+        try:
+            result = (self.tree if parent is None else parent).xpath(xpath)
+        except etree.XPathError:
+            return list()
+        return [node for node in result if isinstance(node, etree._Element)] if isinstance(result, list) else list()
+
+    def click(self, node):
+        for transition in self.scenario.transitions:
+            if transition['from'] == self.screen and node in self.tree.xpath(transition['xpath']):
+                self.screen = transition['to']
+                return
+
+
+class FakeAppiumServer(object):
+    """
+    Local stand-in of appium server (JSON wire protocol) which replays recorded scenario: page sources,
+    element lookups, their attributes and screen transitions on taps, so views and test harness can be exercised
+    without a device. Every command is delayed by `latency` seconds and counted in `commands`;
+    `implicit_wait_time` is time the real server would have spent waiting for elements which are not found.
+    """
+    ROUTES = [
+        ('POST', r'/session', 'newSession'),
+        ('DELETE', r'/session/(?P<session>[^/]+)', 'quit'),
+        ('POST', r'/session/(?P<session>[^/]+)/timeouts/implicit_wait', 'implicitlyWait'),
+        ('GET', r'/session/(?P<session>[^/]+)/source', 'getPageSource'),
+        ('POST', r'/session/(?P<session>[^/]+)/element', 'findElement'),
+        ('POST', r'/session/(?P<session>[^/]+)/elements', 'findElements'),
+        ('POST', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/element', 'findChildElement'),
+        ('POST', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/elements', 'findChildElements'),
+        ('POST', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/click', 'clickElement'),
+        ('POST', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/value', 'sendKeysToElement'),
+        ('POST', r'/session/(?P<session>[^/]+)/appium/element/(?P<element>[^/]+)/value', 'setValue'),
+        ('POST', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/clear', 'clearElement'),
+        ('GET', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/text', 'getElementText'),
+        ('GET', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/displayed', 'isElementDisplayed'),
+        ('GET', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/enabled', 'isElementEnabled'),
+        ('GET', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/selected', 'isElementSelected'),
+        ('GET', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/attribute/(?P<name>[^/]+)',
+         'getElementAttribute'),
+        ('GET', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/location', 'getElementLocation'),
+        ('GET', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/size', 'getElementSize'),
+        ('GET', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/rect', 'getElementRect'),
+        ('GET', r'/session/(?P<session>[^/]+)/element/(?P<element>[^/]+)/screenshot', 'elementScreenshot'),
+        ('GET', r'/session/(?P<session>[^/]+)/screenshot', 'screenshot'),
+        ('GET', r'/session/(?P<session>[^/]+)/window/(?:current/size|rect)', 'getWindowSize'),
+        ('POST', r'/session/(?P<session>[^/]+)/log', 'getLog'),
+        ('GET', r'/session/(?P<session>[^/]+)/appium/device/current_activity', 'getCurrentActivity'),
+    ]
+
+    def __init__(self, scenario: Scenario, latency=0.0, host='127.0.0.1', port=0):
+        self.scenario = scenario
+        self.latency = latency
+        self.sessions = dict()
+        self.commands = Counter()
+        self.implicit_wait_time = 0.0
+        self.lock = threading.Lock()
+        self.routes = [(method, re.compile('^%s$' % pattern), name) for method, pattern, name in self.ROUTES]
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def executor(self):
+        return 'http://%s:%s/wd/hub' % self.httpd.server_address[:2]
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @property
+    def stats(self):
+        return {'commands': sum(self.commands.values()), 'by_command': dict(self.commands),
+                'implicit_wait_time': round(self.implicit_wait_time, 2)}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                params = json.loads(self.rfile.read(length) or b'{}') if length else dict()
+                session_id, status, value = server.dispatch(self.command, self.path, params)
+                body = json.dumps({'sessionId': session_id, 'status': status, 'value': value}).encode('utf-8')
+                self.send_response(200)  # errors are passed by status in the body as JSON wire protocol does
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_DELETE = _respond
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def dispatch(self, method, path, params):
+        path = path.split('?')[0]
+        path = path[len('/wd/hub'):] if path.startswith('/wd/hub') else path
+        for route_method, pattern, name in self.routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                args = match.groupdict()
+                break
+        else:
+            name, args = '%s %s' % (method, re.sub(r'/session/[^/]+', '/session/:id', path)), dict()
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.commands[name] += 1
+            if name == 'newSession':
+                session_id = uuid.uuid4().hex
+                self.sessions[session_id] = FakeSession(self.scenario)
+                return session_id, 0, params.get('desiredCapabilities', dict())
+            session_id = args.get('session') or (re.findall(r'/session/([^/]+)', path) or [None])[0]
+            session = self.sessions.get(session_id)
+            if session is None:
+                return session_id, 6, 'No such session'  # no such driver
+            handler = getattr(self, '_%s' % name, None)
+            if handler is None:
+                return session_id, 0, None
+            try:
+                status, value = handler(session, params, **{key: value for key, value in args.items()
+                                                            if key != 'session'})
+            except LookupError as e:
+                status, value = STALE_ELEMENT, str(e)
+            if name == 'quit':
+                del self.sessions[session_id]
+            return session_id, status, value
+
+    def _element(self, session, element_id):
+        node = session.node(element_id)
+        if node is None:
+            raise LookupError('Element %s is not attached to the page document' % element_id)
+        return node
+
+    def _found(self, session, nodes, single):
+        if single and not nodes:
+            self.implicit_wait_time += session.implicit_wait
+            return NO_SUCH_ELEMENT, 'An element could not be located on the page using the given search parameters.'
+        elements = [{'ELEMENT': session.element_id(node)} for node in nodes]
+        return 0, elements[0] if single else elements
+
+    def _quit(self, session, params):
+        return 0, None
+
+    def _implicitlyWait(self, session, params):
+        session.implicit_wait = params.get('ms', 0) / 1000
+        return 0, None
+
+    def _getPageSource(self, session, params):
+        return 0, etree.tostring(session.tree, encoding='unicode')
+
+    def _findElement(self, session, params):
+        return self._found(session, session.find(params['using'], params['value']), single=True)
+
+    def _findElements(self, session, params):
+        return self._found(session, session.find(params['using'], params['value']), single=False)
+
+    def _findChildElement(self, session, params, element):
+        nodes = session.find(params['using'], params['value'], self._element(session, element))
+        return self._found(session, nodes, single=True)
+
+    def _findChildElements(self, session, params, element):
+        nodes = session.find(params['using'], params['value'], self._element(session, element))
+        return self._found(session, nodes, single=False)
+
+    def _clickElement(self, session, params, element):
+        session.click(self._element(session, element))
+        return 0, None
+
+    def _sendKeysToElement(self, session, params, element):
+        node = self._element(session, element)
+        text = params.get('text') or ''.join(params.get('value', list()))
+        node.set('text', node.get('text', '') + text)
+        return 0, None
+
+    def _setValue(self, session, params, element):
+        text = params.get('text') or ''.join(params.get('value', list()))
+        self._element(session, element).set('text', text)
+        return 0, None
+
+    def _clearElement(self, session, params, element):
+        self._element(session, element).set('text', '')
+        return 0, None
+
+    def _getElementText(self, session, params, element):
+        return 0, self._element(session, element).get('text', '')
+
+    def _isElementDisplayed(self, session, params, element):
+        return 0, self._element(session, element).get('displayed', 'true') == 'true'
+
+    def _isElementEnabled(self, session, params, element):
+        return 0, self._element(session, element).get('enabled', 'true') == 'true'
+
+    def _isElementSelected(self, session, params, element):
+        return 0, self._element(session, element).get('selected', 'false') == 'true'
+
+    def _getElementAttribute(self, session, params, element, name):
+        attribute = {'contentDescription': 'content-desc', 'resourceId': 'resource-id', 'className': 'class',
+                     'name': 'content-desc'}.get(name, name)
+        return 0, self._element(session, element).get(attribute)
+
+    def _rect(self, session, element):
+        return PageSourceSnapshot.bounds(self._element(session, element)) or {'x': 0, 'y': 0, 'width': 0, 'height': 0}
+
+    def _getElementLocation(self, session, params, element):
+        rect = self._rect(session, element)
+        return 0, {'x': rect['x'], 'y': rect['y']}
+
+    def _getElementSize(self, session, params, element):
+        rect = self._rect(session, element)
+        return 0, {'width': rect['width'], 'height': rect['height']}
+
+    def _getElementRect(self, session, params, element):
+        return 0, self._rect(session, element)
+
+    def _elementScreenshot(self, session, params, element):
+        return 0, PNG
+
+    def _screenshot(self, session, params):
+        return 0, PNG
+
+    def _getWindowSize(self, session, params):
+        root = session.tree
+        return 0, {'width': int(root.get('width', 1080)), 'height': int(root.get('height', 2028))}
+
+    def _getLog(self, session, params):
+        return 0, list()
+
+    def _getCurrentActivity(self, session, params):
+        return 0, '.MainActivity'
+
+
+class ScenarioRecorder(object):
+    """
+    Records scenario for FakeAppiumServer from a real session: page source is saved before every tap on element
+    found by a top level locator, and the tap becomes transition to the screen shown before the next tap.
+    Scenario is saved to `directory` as <session id>.json when session is closed.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.start = None
+        self.screens = dict()
+        self.transitions = list()
+        self.locators = dict()
+        self.last_tap = None
+        self.recording = False
+
+    def add_screen(self, page_source: str):
+        name = 'screen_%s' % hashlib.md5(page_source.encode('utf-8')).hexdigest()[:8]
+        self.screens[name] = page_source
+        if self.start is None:
+            self.start = name
+        if self.last_tap:
+            screen, xpath = self.last_tap
+            if screen != name:
+                self.transitions.append({'from': screen, 'xpath': xpath, 'to': name})
+            self.last_tap = None
+        return name
+
+    def before(self, driver, command, params):
+        if self.recording:
+            return
+        self.recording = True
+        try:
+            if command == 'clickElement' and params.get('id') in self.locators:
+                self.last_tap = (self.add_screen(driver.page_source), self.locators[params['id']])
+            elif command == 'quit':
+                self.add_screen(driver.page_source)
+                self.save(os.path.join(self.directory, '%s.json' % driver.session_id))
+        finally:
+            self.recording = False
+
+    def after(self, command, params, response):
+        if command in ('findElement', 'findElements') and response:
+            xpath = PageSourceSnapshot.to_xpath(params.get('using'), params.get('value'))
+            found = response.get('value')
+            for element in found if isinstance(found, list) else [found]:
+                if xpath and hasattr(element, 'id'):
+                    self.locators[element.id] = xpath
+
+    def save(self, path):
+        with open(path, 'w') as file:
+            json.dump(Scenario(self.start, self.screens, self.transitions).to_dict(), file, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake appium server replaying recorded scenario')
+    parser.add_argument('scenario', help='name of scenario in %s or path to scenario file' % SCENARIOS_DIR)
+    parser.add_argument('--port', type=int, default=4723)
+    parser.add_argument('--latency', type=float, default=0.0, help='delay of every command, seconds')
+    args = parser.parse_args()
+    server = FakeAppiumServer(Scenario.load(args.scenario), latency=args.latency, port=args.port)
+    print('Fake appium server is listening on %s' % server.executor)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(json.dumps(server.stats))
+
+
+if __name__ == '__main__':
+    main()
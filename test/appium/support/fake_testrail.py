@@ -0,0 +1,138 @@
+import argparse
+import json
+import re
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeTestRailServer(object):
+    """
+    In-memory stand-in for TestRail API v2 used by support/testrail_report.py: runs, bulk results, attachments,
+    paginated tests of a run. Counts requests by API method, so number of round-trips of a report is checked.
+    Point the report to it with TESTRAIL_URL=<url> or `report.url`/`report.api_url`.
+    """
+    page_size = 250
+
+    def __init__(self, cases=(), host='127.0.0.1', port=0):
+        self.cases = list(cases)
+        self.runs = dict()
+        self.results = list()
+        self.attachments = list()  # (result id, size of file)
+        self.requests = Counter()
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        return 'http://%s:%s/index.php?/' % self.httpd.server_address[:2]
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def _respond(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                status, value = server.dispatch(self.path, body, self.headers.get('Content-Type', ''))
+                data = json.dumps(value).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = _respond
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def dispatch(self, path, body, content_type):
+        query = path.split('index.php?/api/v2/', 1)[-1]
+        method, args = re.match(r'([a-z_]+)/?([^&]*)', query).groups()
+        params = dict(re.findall(r'&(\w+)=([^&]*)', query))
+        with self.lock:
+            self.requests[method] = self.requests[method] + 1
+            handler = getattr(self, '_%s' % method, None)
+            if handler is None:
+                return 400, {'error': 'Unknown method %s' % method}
+            if content_type.startswith('application/json'):
+                body = json.loads(body or b'{}')
+            return handler(int(args) if args.isdigit() else args, params, body)
+
+    def _get_milestones(self, project_id, params, body):
+        return 200, {'milestones': [{'id': 1}]}
+
+    def _get_cases(self, project_id, params, body):
+        return 200, {'cases': [{'id': case_id} for case_id in self.cases]}
+
+    def _get_runs(self, project_id, params, body):
+        return 200, {'runs': list(self.runs.values())}
+
+    def _get_run(self, run_id, params, body):
+        return 200, self.runs[run_id]
+
+    def _add_run(self, project_id, params, body):
+        run_id = len(self.runs) + 1
+        self.runs[run_id] = dict(body, id=run_id, description='')
+        self.runs[run_id]['case_ids'] = body.get('case_ids') or self.cases
+        return 200, self.runs[run_id]
+
+    def _update_run(self, run_id, params, body):
+        self.runs[run_id].update(body)
+        return 200, self.runs[run_id]
+
+    def _test_id(self, run_id, case_id):
+        return run_id * 100000 + case_id
+
+    def _get_tests(self, run_id, params, body):
+        offset = int(params.get('offset', 0))
+        case_ids = self.runs[run_id]['case_ids'][offset:offset + self.page_size]
+        next_page = '/api/v2/get_tests/%s&offset=%s' % (run_id, offset + self.page_size) \
+            if offset + self.page_size < len(self.runs[run_id]['case_ids']) else None
+        return 200, {'offset': offset, 'size': len(case_ids), '_links': {'next': next_page},
+                     'tests': [{'id': self._test_id(run_id, case_id), 'case_id': case_id} for case_id in case_ids]}
+
+    def _add_results_for_cases(self, run_id, params, body):
+        added = list()
+        for result in body['results']:
+            result = dict(result, id=len(self.results) + 1, test_id=self._test_id(run_id, result['case_id']))
+            self.results.append(result)
+            added.append(result)
+        return 200, added
+
+    def _get_results_for_run(self, run_id, params, body):
+        return 200, {'results': [result for result in self.results
+                                 if result['test_id'] // 100000 == run_id]}
+
+    def _add_attachment_to_result(self, result_id, params, body):
+        self.attachments.append((result_id, len(body)))
+        return 200, {'attachment_id': len(self.attachments)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local TestRail stand-in for report uploads')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--cases', default='', help='comma separated case ids of regression suite')
+    args = parser.parse_args()
+    server = FakeTestRailServer([int(case) for case in args.cases.split(',') if case], port=args.port)
+    print('Fake TestRail is listening, use TESTRAIL_URL=%s' % server.url)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(json.dumps(dict(server.requests)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+import base64
+import gzip
+import re
+
+from selenium.common.exceptions import WebDriverException
+
+
+class GethLog(object):
+    """
+    Reads geth.log of the driver by chunks: every chunk is cut, gzipped and base64-encoded on the device by
+    `mobile: shell`, so only compressed `chunk_size` bytes are transferred and held in memory at once.
+    Remembers `offset` - size of the log which was already read, so `tail=True` reads new entries only.
+    `mobile: shell` needs appium server started with `--relaxed-security` (local/docker runs), Sauce doesn't allow it:
+    there the whole log is downloaded by `pull_file` on every read and held in memory base64-encoded, only decoding
+    is done by chunks and `tail` just skips already read content locally.
+    """
+    SHELL = 'tail -c +%s %s | head -c %s | gzip -c | base64'
+    OVERLAP = 4096  # bytes of previous chunk searched again not to miss values on a chunk border
+
+    def __init__(self, driver, path, chunk_size=4 * 1024 * 1024, shell=None):
+        self.driver = driver
+        self.path = path
+        self.chunk_size = chunk_size
+        self.offset = 0
+        self._shell_allowed = shell  # None - checked on the first read
+
+    @property
+    def shell_allowed(self):
+        if self._shell_allowed is None:
+            try:
+                output = self.driver.execute_script('mobile: shell', {'command': 'echo', 'args': ['ok']})
+                self._shell_allowed = bool(output) and output.strip() == 'ok'
+            except WebDriverException:
+                self._shell_allowed = False
+        return self._shell_allowed
+
+    def _shell_chunk(self, start):
+        output = self.driver.execute_script('mobile: shell', {
+            'command': 'sh', 'args': ['-c', self.SHELL % (start + 1, self.path, self.chunk_size)]})
+        if not output or not output.strip():
+            # gzip of even empty content isn't empty: no output means missing gzip/file or error printed to stderr
+            raise ValueError('No output of shell command for %s' % self.path)
+        return gzip.decompress(base64.b64decode(''.join(output.split())))
+
+    def _shell_chunks(self, start):
+        while True:
+            chunk = self._shell_chunk(start)
+            if chunk:
+                yield chunk
+            if len(chunk) < self.chunk_size:
+                return
+            start += len(chunk)
+
+    def _pulled_chunks(self, start):
+        b64_log = self.driver.pull_file(self.path)
+        step = self.chunk_size // 3 * 4  # whole base64 quantums only
+        position = 0
+        for index in range(0, len(b64_log), step):
+            chunk = base64.b64decode(b64_log[index:index + step])
+            if position + len(chunk) > start:
+                yield chunk[max(start - position, 0):]
+            position += len(chunk)
+
+    def chunks(self, tail=False):
+        """
+        Content of the log since remembered offset (if `tail`) or since the beginning; only `tail` reading moves
+        the offset. If shell is not allowed or fails, the rest of the log is read by `pull_file`.
+        """
+        start, pulled = self.offset if tail else 0, not self.shell_allowed
+        if not pulled:
+            try:
+                for chunk in self._shell_chunks(start):
+                    start += len(chunk)
+                    yield chunk
+            except (WebDriverException, OSError, ValueError):
+                pulled = True  # e.g. gzip is missing or file is rotated, shell is tried again by the next read
+        if pulled:
+            for chunk in self._pulled_chunks(start):
+                start += len(chunk)
+                yield chunk
+        if tail:
+            self.offset = max(self.offset, start)
+
+    def save(self, file_path, tail=False):
+        """Writes the log to `file_path` chunk by chunk; returns size of written content"""
+        size = 0
+        with open(file_path, 'wb') as file:
+            for chunk in self.chunks(tail):
+                file.write(chunk)
+                size += len(chunk)
+        return size
+
+    def search(self, *values, tail=False):
+        """Values (regular expressions) which are found in the log"""
+        patterns = {value: re.compile(value.encode('utf-8')) for value in values}
+        found = set()
+        previous = b''
+        for chunk in self.chunks(tail):
+            text = previous + chunk
+            for value, pattern in patterns.items():
+                if value not in found and pattern.search(text):
+                    found.add(value)
+            if len(found) == len(patterns):
+                break
+            previous = chunk[-self.OVERLAP:]
+        return found
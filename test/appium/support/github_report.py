@@ -8,6 +8,7 @@ class GithubHtmlReport(BaseTestReport):
 
     def __init__(self):
         super(GithubHtmlReport, self).__init__()
+        self.testrail_report = TestrailReport()
 
     def list_of_failed_testrail_ids(self, tests_data):
         ids_failed_test = []
@@ -22,11 +23,15 @@ class GithubHtmlReport(BaseTestReport):
         failed_tests = self.get_failed_tests()
 
         if len(tests) > 0:
+            self.prefetch_sauce_assets(failed_tests)
             title_html = "## %.0f%% of end-end tests have passed\n" % (len(passed_tests) / len(tests) * 100)
             summary_html = "```\n"
             summary_html += "Total executed tests: %d\n" % len(tests)
             summary_html += "Failed tests: %d\n" % len(failed_tests)
             summary_html += "Passed tests: %d\n" % len(passed_tests)
+            rerun_summary = self.get_rerun_summary(tests)
+            if rerun_summary:
+                summary_html += "%s\n" % rerun_summary
             summary_html += "```\n"
             failed_tests_html = str()
             passed_tests_html = str()
@@ -74,7 +79,7 @@ class GithubHtmlReport(BaseTestReport):
         return html
 
     def build_test_row_html(self, index, test, run_id):
-        test_rail_link = TestrailReport().get_test_result_link(run_id, test.testrail_case_id)
+        test_rail_link = self.testrail_report.get_test_result_link(run_id, test.testrail_case_id)
         if test_rail_link:
             html = "<tr><td><b>%s. <a href=\"%s\">%s</a>, id: %s </b></td></tr>" % (
             index + 1, test_rail_link, test.name, test.testrail_case_id)
@@ -95,6 +100,9 @@ class GithubHtmlReport(BaseTestReport):
                 html += "</p>"
             html += "<code>%s</code>" % last_testrun.error[:255]
             html += "<br/><br/>"
+        rerun_summary = self.get_rerun_summary([test])
+        if rerun_summary:
+            html += "<p>%s</p>" % rerun_summary
         if last_testrun.jobs:
             html += self.build_device_sessions_html(last_testrun)
         html += "</td></tr>"
@@ -0,0 +1,82 @@
+import os
+import threading
+
+import imagehash
+import numpy as np
+from PIL import Image
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'views', 'elements_templates')
+
+
+class Template(object):
+    """Template image decoded once: PIL image, array of pixels and average hash"""
+
+    def __init__(self, name, image: Image.Image):
+        self.name = name
+        self.image = image
+        self.array = np.asarray(image, dtype=np.int16)
+        self.hash = imagehash.average_hash(image)
+
+
+class TemplateRegistry(object):
+    """Templates from views/elements_templates, loaded on first use and kept for the whole worker process"""
+
+    def __init__(self, directory=TEMPLATES_DIR):
+        self.directory = directory
+        self.templates = dict()
+        self.lock = threading.Lock()
+
+    def get(self, name) -> Template:
+        with self.lock:
+            if name not in self.templates:
+                path = os.path.join(self.directory, name)
+                if not os.path.exists(path):
+                    raise FileNotFoundError('Please add %s image as template' % name)
+                with Image.open(path) as image:
+                    image.load()
+                    self.templates[name] = Template(name, image)
+            return self.templates[name]
+
+
+templates = TemplateRegistry()
+
+
+def to_array(image: Image.Image, template: Template):
+    """Pixels of the image in the mode of the template, both cut to their common size"""
+    if image.mode != template.image.mode:
+        image = image.convert(template.image.mode)
+    array = np.asarray(image, dtype=np.int16)
+    height, width = min(array.shape[0], template.array.shape[0]), min(array.shape[1], template.array.shape[1])
+    return array[:height, :width], template.array[:height, :width]
+
+
+def difference(image: Image.Image, template: Template):
+    """Absolute per-pixel difference"""
+    array, template_array = to_array(image, template)
+    return np.abs(array - template_array)
+
+
+def is_equal(image: Image.Image, template: Template):
+    """
+    Same result as `ImageChops.difference(image, template).getbbox()` which was used before:
+    bbox of images with alpha channel is computed by alpha only.
+    """
+    diff = difference(image, template)
+    if template.image.mode in ('RGBA', 'LA', 'PA'):
+        diff = diff[..., -1]
+    return not diff.any()
+
+
+def difference_ratio(image: Image.Image, template: Template):
+    """Mean absolute difference of all channels, 0..1"""
+    diff = difference(image, template)
+    return float(diff.mean()) / 255 if diff.size else 0.0
+
+
+def is_similar(image: Image.Image, template: Template, max_distance=0):
+    """Average hashes of the images differ in no more than `max_distance` bits"""
+    return template.hash - imagehash.average_hash(image) <= max_distance
+
+
+def crop(screen: Image.Image, rect: dict):
+    return screen.crop((rect['x'], rect['y'], rect['x'] + rect['width'], rect['y'] + rect['height']))
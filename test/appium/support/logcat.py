@@ -0,0 +1,125 @@
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from support.command_tracer import untraced
+
+
+class LogcatCollector(object):
+    """
+    Collects logcat of the driver incrementally: appium returns only entries which appeared since the previous
+    request, so every pull transfers new lines only. Keeps last `size` entries and indexes them by re-frame
+    event keywords (e.g. `:multiaccounts.login.callback/login-success`) and by timestamp.
+    If `interval` is set, entries are pulled in background not to overflow appium logcat buffer, until `stop`;
+    background pulls are not traced as commands of the running test.
+    """
+    EVENT = re.compile(r'(?<![\w:])(:[\w.\-]+(?:/[\w.\-?!]+)?)')
+
+    def __init__(self, driver, size=100000, interval=None):
+        self.driver = driver
+        self.size = size
+        self.timestamps = list()
+        self.messages = list()
+        self.first_number = 0  # number of the first kept entry among all collected ones
+        self.events = defaultdict(list)
+        self.lock = threading.RLock()
+        self.stopped = threading.Event()
+        if interval:
+            threading.Thread(target=self._pull_periodically, args=(interval,), daemon=True).start()
+
+    def __len__(self):
+        return len(self.messages)
+
+    def _pull_periodically(self, interval):
+        with untraced():
+            while not self.stopped.wait(interval):
+                try:
+                    self.pull()
+                except Exception:
+                    return  # session is closed
+
+    def stop(self):
+        self.stopped.set()
+
+    def pull(self):
+        with self.lock:
+            entries = self.driver.get_log('logcat')
+            for entry in entries:
+                number = self.first_number + len(self.messages)
+                self.timestamps.append(entry['timestamp'])
+                self.messages.append(entry['message'])
+                for event in self.EVENT.findall(entry['message']):
+                    self.events[event].append(number)
+            if len(self.messages) > self.size * 1.25:
+                self._trim()
+        return len(entries)
+
+    def _trim(self):
+        dropped = len(self.messages) - self.size
+        self.timestamps = self.timestamps[dropped:]
+        self.messages = self.messages[dropped:]
+        self.first_number += dropped
+        for event in list(self.events):
+            numbers = self.events[event][bisect_left(self.events[event], self.first_number):]
+            if numbers:
+                self.events[event] = numbers
+            else:
+                del self.events[event]
+
+    def _entries(self, numbers):
+        return [(self.timestamps[i - self.first_number], self.messages[i - self.first_number]) for i in numbers]
+
+    def find(self, event):
+        """
+        (timestamp, message) of all entries with the event; it may consist of several keywords. Entries are
+        looked up by indexed keywords which contain the first keyword (`:a/b` is found in `:a/b-c` as well),
+        all entries are scanned if there are no such keywords.
+        """
+        with self.lock:
+            keywords = self.EVENT.findall(event)
+            keys = [key for key in self.events if keywords[0] in key] if keywords else None
+            if not keys:
+                return [(timestamp, message) for timestamp, message in zip(self.timestamps, self.messages)
+                        if event in message]
+            numbers = sorted(set().union(*(self.events[key] for key in keys)))
+            return [entry for entry in self._entries(numbers) if event in entry[1]]
+
+    def last(self, event):
+        entries = self.find(event)
+        return entries[-1] if entries else None
+
+    def first_after(self, timestamp, event=None):
+        with self.lock:
+            if event:
+                return next((entry for entry in self.find(event) if entry[0] >= timestamp), None)
+            position = bisect_left(self.timestamps, timestamp)
+            if position < len(self.messages):
+                return self.timestamps[position], self.messages[position]
+
+    def between(self, start, end, event=None):
+        with self.lock:
+            if event:
+                return [entry for entry in self.find(event) if start <= entry[0] <= end]
+            first, last = bisect_left(self.timestamps, start), bisect_right(self.timestamps, end)
+            return list(zip(self.timestamps[first:last], self.messages[first:last]))
+
+    def find_values(self, values, exclude=()):
+        """
+        Values which are found in messages as separate words. Alternation of all values only selects messages
+        to check, as it can't find overlapping values (e.g. a word of passphrase inside the passphrase),
+        so every value is searched in them separately.
+        """
+        values = set(value for value in values if value)
+        if not values:
+            return set()
+        candidates = re.compile('|'.join(re.escape(value) for value in values))
+        patterns = dict((value, re.compile(r'(?<!\w)%s(?!\w)' % re.escape(value))) for value in values)
+        found = set()
+        with self.lock:
+            for message in self.messages:
+                if not candidates.search(message) or any(part in message.lower() for part in exclude):
+                    continue
+                found.update(value for value, pattern in patterns.items()
+                             if value not in found and pattern.search(message))
+        return found
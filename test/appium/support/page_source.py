@@ -0,0 +1,128 @@
+import re
+import time
+
+from appium.webdriver.common.mobileby import MobileBy
+from lxml import etree
+
+# Commands which never change what is shown on the screen; any other command invalidates the snapshot
+READ_ONLY_COMMANDS = {
+    'newSession', 'getSession', 'quit', 'status', 'getAllSessions', 'implicitlyWait', 'setTimeouts',
+    'findElement', 'findElements', 'findChildElement', 'findChildElements', 'getPageSource',
+    'getElementText', 'getElementAttribute', 'getElementProperty', 'getElementTagName', 'getElementValue',
+    'isElementDisplayed', 'isElementEnabled', 'isElementSelected', 'getElementLocation', 'getElementSize',
+    'getElementRect', 'getElementValueOfCssProperty', 'elementScreenshot', 'screenshot', 'getWindowSize',
+    'getWindowRect', 'getLog', 'getAvailableLogTypes', 'getCurrentContext', 'getContexts', 'getCurrentActivity',
+    'getCurrentPackage', 'getSettings', 'getNetworkConnection', 'getCurrentUrl', 'getTitle', 'pullFile',
+    'pullFolder', 'getClipboard', 'getDeviceTime', 'getDisplayDensity', 'getSystemBars', 'isKeyboardShown',
+}
+
+
+class PageSourceSnapshot(object):
+    """
+    Keeps the last fetched page source of the device and evaluates element locators against it locally,
+    so several presence/visibility/text checks of the same screen cost a single remote command.
+    Snapshot is dropped by the driver after every command that may change the screen (click, swipe, keys...).
+    Returns None from lookups whenever the answer can't be given locally, so callers fall back to the device.
+    Indexes (e.g. of chat messages) can be built from the same page source and are dropped together with it.
+    Page source older than `max_age` seconds is fetched again, as screen may change by itself (incoming messages).
+    """
+    BOUNDS = re.compile(r'\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]')
+
+    def __init__(self, driver, enabled=False, max_age=2):
+        self.driver = driver
+        self.enabled = enabled
+        self.max_age = max_age
+        self._tree = None
+        self._tree_time = 0
+        self._indexes = dict()
+
+    def __enter__(self):
+        self._enabled_before, self.enabled = self.enabled, True
+        self.invalidate()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.enabled = self._enabled_before
+        self.invalidate()
+
+    def invalidate(self):
+        self._tree = None
+        self._indexes = dict()
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            self._tree = etree.fromstring(self.driver.page_source.encode('utf-8'))
+            self._tree_time = time.time()
+        return self._tree
+
+    @property
+    def tree_time(self):
+        """When the current page source was fetched, None if it is not fetched yet"""
+        return self._tree_time if self._tree is not None else None
+
+    def expire(self, max_age):
+        """Drops page source older than `max_age` seconds, so it is fetched again on the next use"""
+        if self._tree is not None and time.time() - self._tree_time > max_age:
+            self.invalidate()
+
+    def index(self, index_class, max_age=None):
+        """`index_class(tree)` built once per page source; page source older than `max_age` seconds is fetched again"""
+        if max_age is not None:
+            self.expire(max_age)
+        if index_class not in self._indexes:
+            self._indexes[index_class] = index_class(self.tree)
+        return self._indexes[index_class]
+
+    @classmethod
+    def bounds(cls, node):
+        match = cls.BOUNDS.match(node.get('bounds', ''))
+        if match:
+            x1, y1, x2, y2 = [int(value) for value in match.groups()]
+            return {'x': x1, 'y': y1, 'width': x2 - x1, 'height': y2 - y1}
+
+    @staticmethod
+    def quote(value):
+        if '"' not in value:
+            return '"%s"' % value
+        elif "'" not in value:
+            return "'%s'" % value
+
+    @classmethod
+    def to_xpath(cls, by, locator):
+        if by == MobileBy.XPATH:
+            return locator
+        attribute = {MobileBy.ACCESSIBILITY_ID: 'content-desc',
+                     MobileBy.ID: 'resource-id',
+                     MobileBy.CLASS_NAME: 'class'}.get(by)
+        value = cls.quote(locator)
+        if attribute and value:
+            return '//*[@%s=%s]' % (attribute, value)
+
+    def find(self, by, locator):
+        if not self.enabled:
+            return None
+        xpath = self.to_xpath(by, locator)
+        if not xpath:
+            return None
+        self.expire(self.max_age)
+        try:
+            result = self.tree.xpath(xpath)
+        except (etree.XPathError, etree.XMLSyntaxError):
+            return None
+        if not isinstance(result, list):
+            return None
+        return [node for node in result if isinstance(node, etree._Element)]
+
+    def is_present(self, by, locator):
+        nodes = self.find(by, locator)
+        return bool(nodes)
+
+    def is_displayed(self, by, locator):
+        nodes = self.find(by, locator)
+        return bool(nodes) and nodes[0].get('displayed', 'true') == 'true'
+
+    def text(self, by, locator):
+        nodes = self.find(by, locator)
+        if nodes:
+            return nodes[0].get('text')
@@ -0,0 +1,47 @@
+import fcntl
+import json
+import os
+
+
+class ReportStore(object):
+    """
+    Append-only JSON-lines file with results of tests, written by all xdist workers.
+    Every `save` appends the whole test (all its testruns), so the last line of a test is its current state.
+    Reading is incremental: only lines appended since the previous `refresh` are parsed and given to `load`.
+    """
+
+    def __init__(self, path, load=lambda record: record):
+        self.path = path
+        self.load = load
+        self.offset = 0
+        self.tests = dict()  # test name: loaded last record, in order of first save
+        self.failed = set()
+        self.testrail_ids = dict()  # testrail case id: test name
+
+    def save(self, record: dict):
+        line = json.dumps(record) + '\n'
+        with open(self.path, 'a') as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                file.write(line)
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def refresh(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as file:
+            file.seek(self.offset)
+            data = file.read()
+        end = data.rfind(b'\n') + 1  # the last line may be still being written
+        self.offset += end
+        for line in data[:end].splitlines():
+            record = json.loads(line)
+            name = record['name']
+            self.tests[name] = self.load(record)
+            if record['testruns'] and record['testruns'][-1]['error'] is not None:
+                self.failed.add(name)
+            else:
+                self.failed.discard(name)
+            if record['testrail_case_id']:
+                self.testrail_ids[record['testrail_case_id']] = name
@@ -0,0 +1,73 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from sauceclient import SauceException
+
+
+class SauceAssetResolver(object):
+    """
+    Assets of Sauce jobs (list of assets, log.json with commands) fetched once per job and shared by everything
+    in the process - report builders and teardowns. Jobs are fetched concurrently, see `prefetch`.
+    Assets of a job may appear some time after it is finished, so requests are retried.
+    """
+
+    def __init__(self, sauce, username, access_key, threads=8, retries=10, interval=3):
+        self.sauce = sauce
+        self.retries = retries
+        self.interval = interval
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        self.futures = dict()  # (job id, asset): future
+        self.lock = threading.Lock()
+        self.session = requests.Session()
+        self.session.auth = (username, access_key)
+        self.session.mount('https://', HTTPAdapter(pool_maxsize=threads))
+
+    def _submit(self, job_id, asset, fetch):
+        with self.lock:
+            if (job_id, asset) not in self.futures:
+                self.futures[(job_id, asset)] = self.executor.submit(fetch, job_id)
+            return self.futures[(job_id, asset)]
+
+    def _fetch_assets(self, job_id):
+        for _ in range(self.retries):
+            try:
+                return self.sauce.jobs.get_job_assets(job_id)
+            except SauceException:
+                time.sleep(self.interval)
+        logging.info('Assets of job %s are not available' % job_id)
+
+    def _fetch_log(self, job_id, timeout=60):
+        url = self.sauce.jobs.get_job_asset_url(job_id=job_id, filename='log.json')
+        end_time = time.time() + timeout
+        while True:
+            response = self.session.get(url)
+            if response.status_code == 200:
+                return response.json()
+            if time.time() > end_time:
+                logging.info('log.json of job %s is not available' % job_id)
+                return None
+            time.sleep(2)
+
+    def prefetch(self, job_ids, assets=True, log=False):
+        """Starts fetching assets and/or log.json of all jobs in background"""
+        for job_id in job_ids:
+            if assets:
+                self._submit(job_id, 'assets', self._fetch_assets)
+            if log:
+                self._submit(job_id, 'log.json', self._fetch_log)
+
+    def assets(self, job_id):
+        return self._submit(job_id, 'assets', self._fetch_assets).result()
+
+    def log(self, job_id):
+        """Commands of the job, None if log is not available"""
+        return self._submit(job_id, 'log.json', self._fetch_log).result()
+
+    def final_screenshot(self, job_id):
+        assets = self.assets(job_id)
+        if assets and assets.get('screenshots'):
+            return assets['screenshots'][-1]
@@ -0,0 +1,73 @@
+import base64
+import time
+from io import BytesIO
+
+from PIL import Image
+from lxml import etree
+
+from support import image_templates
+from support.page_source import PageSourceSnapshot
+
+
+class ScreenCapture(object):
+    """
+    Images of elements cut locally from one full screen screenshot, with element bounds taken from the page source
+    fetched together with it, so N visual checks of the same screen cost a screenshot and a page source instead of
+    2N remote commands. Screenshot is dropped by the driver together with page source snapshot after every command
+    that may change the screen, and both are fetched again if either of them is dropped or older than `max_age`
+    seconds, as screen may change by itself (incoming messages, animations).
+    """
+
+    def __init__(self, driver, max_age=2):
+        self.driver = driver
+        self.max_age = max_age
+        self._frame = None
+        self._frame_time = 0
+        self._tree_time = None
+
+    def invalidate(self):
+        self._frame = None
+
+    def is_current(self):
+        """Whether frame is fetched, not older than `max_age` and page source of the snapshot is fetched with it"""
+        snapshot = self.driver.page_source_snapshot
+        snapshot.expire(self.max_age)
+        return self._frame is not None and time.time() - self._frame_time <= self.max_age \
+            and snapshot.tree_time == self._tree_time
+
+    def capture(self):
+        """Screenshot and page source tree of the same screen"""
+        snapshot = self.driver.page_source_snapshot
+        if not self.is_current():
+            snapshot.invalidate()
+            tree = snapshot.tree
+            data = base64.b64decode(self.driver.get_screenshot_as_base64())
+            self._frame = Image.open(BytesIO(data))
+            self._frame.load()
+            self._frame_time, self._tree_time = time.time(), snapshot.tree_time
+            return self._frame, tree
+        return self._frame, snapshot.tree
+
+    @property
+    def frame(self) -> Image.Image:
+        return self.capture()[0]
+
+    @staticmethod
+    def element_rect(by, locator, find_element, tree=None):
+        """{'x', 'y', 'width', 'height'} of the first node matching the locator in page source or of found element"""
+        xpath = PageSourceSnapshot.to_xpath(by, locator)
+        if xpath and tree is not None:
+            try:
+                nodes = tree.xpath(xpath)
+            except (etree.XPathError, etree.XMLSyntaxError):
+                nodes = None
+            if isinstance(nodes, list) and nodes and isinstance(nodes[0], etree._Element):
+                rect = PageSourceSnapshot.bounds(nodes[0])
+                if rect:
+                    return rect
+        element = find_element()
+        return dict(element.location, **element.size)
+
+    def element_image(self, by, locator, find_element):
+        frame, tree = self.capture()
+        return image_templates.crop(frame, self.element_rect(by, locator, find_element, tree))
@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SessionPool(object):
+    """
+    Keeps `standby` sessions provisioning in background threads while current tests of the worker are running,
+    so the next class which needs drivers gets already booted devices with installed app.
+    Ready standby sessions are pinged every `keep_alive` seconds not to hit Sauce `idleTimeout`. Before they are
+    handed out they are health-checked: failed, dead or older than `max_age` (`maxDuration` is counted
+    from the session start) sessions are quit and replaced.
+    """
+
+    def __init__(self, create_session, standby=1, max_age=900, keep_alive=240):
+        self.create_session = create_session
+        self.standby = standby
+        self.max_age = max_age
+        self.keep_alive = keep_alive
+        self.stopped = threading.Event()
+        self.executor = ThreadPoolExecutor(max_workers=max(standby, 3), thread_name_prefix='session-pool')
+        self.pending = deque()
+        self.stats = {'provisioned': 0, 'failed': 0, 'discarded': 0, 'handed_out': 0, 'from_standby': 0,
+                      'provisioning_time': 0.0, 'wait_time': 0.0}
+        threading.Thread(target=self._keep_alive, daemon=True).start()
+
+    def _keep_alive(self):
+        while not self.stopped.wait(self.keep_alive):
+            for future in list(self.pending):
+                if future.done() and not future.exception():
+                    driver, _ = future.result()
+                    self.is_alive(driver)
+
+    def _provision(self):
+        start = time.time()
+        try:
+            return self.create_session(), start
+        finally:
+            self.stats['provisioning_time'] += time.time() - start
+
+    def _submit(self, standby=False):
+        future = self.executor.submit(self._provision)
+        future.standby = standby
+        self.pending.append(future)
+
+    def refill(self):
+        while len(self.pending) < self.standby:
+            self._submit(standby=True)
+
+    @staticmethod
+    def is_alive(driver):
+        try:
+            driver.current_activity
+            return True
+        except Exception:
+            return False
+
+    def is_healthy(self, driver, started):
+        return time.time() - started < self.max_age and self.is_alive(driver)
+
+    @staticmethod
+    def quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def acquire(self, quantity):
+        start = time.time()
+        drivers = list()
+        while len(drivers) < quantity:
+            while len(self.pending) < quantity - len(drivers):
+                self._submit()
+            future = self.pending.popleft()
+            try:
+                driver, started = future.result()
+            except Exception as exception:
+                self.stats['failed'] += 1
+                logging.info('Session pool: failed to start session: %s' % exception)
+                continue
+            self.stats['provisioned'] += 1
+            if not self.is_healthy(driver, started):
+                self.stats['discarded'] += 1
+                self.quit(driver)
+                continue
+            self.stats['from_standby'] += int(future.standby)
+            drivers.append(driver)
+        self.stats['handed_out'] += quantity
+        self.stats['wait_time'] += time.time() - start
+        self.refill()
+        return drivers
+
+    def close(self, worker='master'):
+        """Standby sessions which are not starting yet are cancelled, only already starting ones are waited for"""
+        self.stopped.set()
+        starting = [future for future in self.pending if not future.cancel()]
+        for future in starting:
+            try:
+                driver, _ = future.result()
+                self.stats['provisioned'] += 1
+                self.quit(driver)
+            except Exception:
+                self.stats['failed'] += 1
+        self.pending.clear()
+        self.executor.shutdown(wait=False)
+        provisioned = self.stats['provisioned']
+        self.stats['utilisation'] = round(self.stats['handed_out'] / provisioned, 2) if provisioned else 0
+        logging.info('Session pool (%s): %s' % (worker, self.stats))
+        return self.stats
@@ -9,11 +9,13 @@ class SingleTestData(object):
         self.geth_paths = geth_paths
 
     class TestRunData(object):
-        def __init__(self, steps, jobs, error, first_commands: Dict[str, int]):
+        def __init__(self, steps, jobs, error, first_commands: Dict[str, int], duration=0, rerun_reason=None):
             self.steps = steps
             self.jobs = jobs
             self.error = error
             self.first_commands = first_commands
+            self.duration = duration
+            self.rerun_reason = rerun_reason
 
     def create_new_testrun(self):
         self.testruns.append(SingleTestData.TestRunData(list(), dict(), None, dict()))
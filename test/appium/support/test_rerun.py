@@ -1,33 +1,95 @@
-RERUN_ERRORS = [
-    "can't receive further commands",
-    'Original error: Error: ESOCKETTIMEDOUT',
-    "The server didn't respond in time.",
-    'An unknown server-side error occurred while processing the command.',
-    'Could not proxy command to remote server. Original error: Error: socket hang up',
-    'The server returned an invalid or incomplete response.',
-    '502 Bad Gateway',
-    'Unexpected server error',
-    '504 Gateway Time-out',
-    'Internal Server Error',
-    'failed to start the browser or device',
-    'ERROR The test with session id',
-    "503 Service Unavailable",
-    "object has no attribute",
-    "[Errno 104] Connection reset by peer",
-    "Sauce could not start your job",
-    "HTTP Error 303",
-    "http.client.RemoteDisconnected: Remote end closed connection without response",
-    "[Errno 110] Connection timed out",
-    "replacement transaction underpriced",
-    "StaleElementReferenceException",
-    "'GetStartedButton' is not found on the screen",
-    "'AccessKeyButton' is not found on the screen",
-    "'SignInPhraseText' is not found on the screen"
-]
+import fcntl
+import json
+import re
+
+RERUN_ERRORS = {
+    # Appium / Sauce Labs side
+    'infra': [
+        "can't receive further commands",
+        "The server didn't respond in time.",
+        'An unknown server-side error occurred while processing the command.',
+        'Could not proxy command to remote server. Original error: Error: socket hang up',
+        'The server returned an invalid or incomplete response.',
+        '502 Bad Gateway',
+        'Unexpected server error',
+        '504 Gateway Time-out',
+        'Internal Server Error',
+        'ERROR The test with session id',
+        "503 Service Unavailable",
+        "Sauce could not start your job",
+        "HTTP Error 303",
+    ],
+    # emulator is not started or is too slow
+    'device': [
+        'failed to start the browser or device',
+        "StaleElementReferenceException",
+        "'GetStartedButton' is not found on the screen",
+        "'AccessKeyButton' is not found on the screen",
+        "'SignInPhraseText' is not found on the screen",
+    ],
+    'network': [
+        'Original error: Error: ESOCKETTIMEDOUT',
+        "[Errno 104] Connection reset by peer",
+        "http.client.RemoteDisconnected: Remote end closed connection without response",
+        "[Errno 110] Connection timed out",
+        "replacement transaction underpriced",
+    ],
+    # app is not on expected screen, so page object is None
+    'app': [
+        "object has no attribute",
+    ],
+}
+
+RERUN_PATTERN = re.compile('|'.join('(?P<%s>%s)' % (category, '|'.join(re.escape(error) for error in errors))
+                                    for category, errors in RERUN_ERRORS.items()))
+
+
+def classify_error(test_error):
+    """Category of the first known error found in the test error, None if the test should not be rerun"""
+    match = RERUN_PATTERN.search(test_error or '')
+    return match.lastgroup if match else None
 
 
 def should_rerun_test(test_error):
-    for rerun_error in RERUN_ERRORS:
-        if rerun_error in test_error:
-            return True
-    return False
+    return classify_error(test_error) is not None
+
+
+class RerunBudget(object):
+    """
+    Time (seconds) and number of reruns per category which all xdist workers may spend on reruns during the run.
+    State is kept in a file under exclusive lock; a rerun is accounted by duration of the failed attempt.
+    """
+    limits = {'infra': 10, 'device': 5, 'network': 5, 'app': 2}
+
+    def __init__(self, path, seconds, limits: dict = None):
+        self.path = path
+        self.seconds = seconds
+        self.limits = dict(self.limits, **(limits or dict()))
+
+    @staticmethod
+    def parse_limits(value):
+        """'infra=10,app=0' to {'infra': 10, 'app': 0}"""
+        return {category.strip(): int(limit) for category, limit in
+                [pair.split('=') for pair in value.split(',') if pair.strip()]} if value else dict()
+
+    def take(self, category, estimate):
+        """Accounts the rerun if it fits into the budget and the category limit"""
+        with open(self.path, 'a+') as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                file.seek(0)
+                try:
+                    state = json.loads(file.read())
+                except ValueError:
+                    state = {'time': 0, 'reruns': dict()}
+                reruns = state['reruns'].get(category, 0)
+                if reruns >= self.limits.get(category, 0) or state['time'] + estimate > self.seconds:
+                    return False
+                state['reruns'][category] = reruns + 1
+                state['time'] += estimate
+                file.seek(0)
+                file.truncate()
+                file.write(json.dumps(state))
+                return True
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
@@ -4,13 +4,17 @@ import logging
 import itertools
 import emoji
 import base64
+from concurrent.futures import ThreadPoolExecutor
 from os import environ
+from requests.adapters import HTTPAdapter
 from support.base_test_report import BaseTestReport
 from sys import argv
 from json import JSONDecodeError
 
 
 class TestrailReport(BaseTestReport):
+    upload_threads = 8
+    results_chunk = 250
 
     def __init__(self):
         super(TestrailReport, self).__init__()
@@ -32,24 +36,29 @@ class TestrailReport(BaseTestReport):
         self.headers['Content-Type'] = 'application/json'
         self.headers['x-api-ident'] = 'beta'
 
-        self.url = 'https://ethstatus.testrail.net/index.php?/'
+        self.url = environ.get('TESTRAIL_URL', 'https://ethstatus.testrail.net/index.php?/')
         self.api_url = self.url + 'api/v2/'
 
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_maxsize=self.upload_threads))
+        self.session.mount('https://', HTTPAdapter(pool_maxsize=self.upload_threads))
+        self.test_ids = dict()  # run id: {case id: test id}
+
     def get(self, method):
-        rval = requests.get(self.api_url + method, headers=self.headers).json()
+        rval = self.session.get(self.api_url + method, headers=self.headers).json()
         if 'error' in rval:
             logging.error("Failed TestRail request: %s" % rval['error'])
         return rval
 
     def post(self, method, data):
         data = bytes(json.dumps(data), 'utf-8')
-        return requests.post(self.api_url + method, data=data, headers=self.headers).json()
+        return self.session.post(self.api_url + method, data=data, headers=self.headers).json()
 
     def add_attachment(self, method, path):
-        files = {'attachment': (open(path, 'rb'))}
-        result = requests.post(self.api_url + method, headers={'Authorization': self.headers['Authorization']},
-                               files=files)
-        files['attachment'].close()
+        with open(path, 'rb') as file:
+            result = self.session.post(self.api_url + method,
+                                       headers={'Authorization': self.headers['Authorization']},
+                                       files={'attachment': file})
         try:
             return result.json()
         except JSONDecodeError:
@@ -58,8 +67,16 @@ class TestrailReport(BaseTestReport):
     def get_suites(self):
         return self.get('get_suites/%s' % self.project_id)
 
-    def get_tests(self):
-        return self.get('get_tests/%s' % self.run_id)['tests']
+    def get_tests(self, run_id=None):
+        method, tests = 'get_tests/%s' % (run_id or self.run_id), list()
+        while method:
+            page = self.get(method)
+            if isinstance(page, list):  # TestRail before 6.7 returns all tests without pagination
+                return page
+            tests.extend(page.get('tests', list()))
+            next_page = (page.get('_links') or dict()).get('next')
+            method = next_page.split('api/v2/', 1)[-1] if next_page else None
+        return tests
 
     def get_milestones(self):
         return self.get('get_milestones/%s' % self.project_id)['milestones']
@@ -129,41 +146,71 @@ class TestrailReport(BaseTestReport):
                             case_ids.append(case['id'])
         return case_ids
 
-    def add_results(self):
-        for test in self.get_all_tests():
-            test_steps = "# Steps: \n"
-            devices = str()
-            method = 'add_result_for_case/%s/%s' % (self.run_id, test.testrail_case_id)
-            last_testrun = test.testruns[-1]
-            for step in last_testrun.steps:
-                test_steps += step + "\n"
-            for i, device in enumerate(last_testrun.jobs):
-                if last_testrun.first_commands:
-                    devices += "# [Device %d](%s) \n" % (
-                        i + 1, self.get_sauce_job_url(job_id=device, first_command=last_testrun.first_commands[device]))
-                else:
-                    devices += "# [Device %d](%s) \n" % (i + 1, self.get_sauce_job_url(job_id=device))
-            data = {'status_id': self.outcomes['undefined_fail'] if last_testrun.error else self.outcomes['passed'],
-                    'comment': '%s' % ('# Error: \n %s \n' % emoji.demojize(
-                        last_testrun.error)) + devices + test_steps if last_testrun.error
-                    else devices + test_steps}
-            try:
-                result_id = self.post(method, data=data)['id']
-            except KeyError:
-                result_id = ''
-            if last_testrun.error:
-                try:
-                    for geth in test.geth_paths.keys():
-                        self.add_attachment(method='add_attachment_to_result/%s' % str(result_id),
-                                            path=test.geth_paths[geth])
-                except AttributeError:
-                    pass
-        self.change_test_run_description()
-
-    def change_test_run_description(self):
-        tests = self.get_all_tests()
-        passed_tests = self.get_passed_tests()
-        failed_tests = self.get_failed_tests()
+    def get_result(self, test):
+        last_testrun = test.testruns[-1]
+        test_steps = "# Steps: \n"
+        devices = str()
+        rerun_summary = self.get_rerun_summary([test])
+        if rerun_summary:
+            test_steps = "# %s \n" % rerun_summary + test_steps
+        for step in last_testrun.steps:
+            test_steps += step + "\n"
+        for i, device in enumerate(last_testrun.jobs):
+            if last_testrun.first_commands:
+                devices += "# [Device %d](%s) \n" % (
+                    i + 1, self.get_sauce_job_url(job_id=device, first_command=last_testrun.first_commands[device]))
+            else:
+                devices += "# [Device %d](%s) \n" % (i + 1, self.get_sauce_job_url(job_id=device))
+        return {'case_id': test.testrail_case_id,
+                'status_id': self.outcomes['undefined_fail'] if last_testrun.error else self.outcomes['passed'],
+                'comment': '%s' % ('# Error: \n %s \n' % emoji.demojize(
+                    last_testrun.error)) + devices + test_steps if last_testrun.error
+                else devices + test_steps}
+
+    def post_results(self, tests):
+        return self.post('add_results_for_cases/%s' % self.run_id,
+                         data={'results': [self.get_result(test) for test in tests]})
+
+    def get_run_case_ids(self, run_id=None):
+        """{case id: test id} of tests in the run"""
+        run_id = run_id or self.run_id
+        if run_id not in self.test_ids:
+            self.test_ids[run_id] = {test['case_id']: test['id'] for test in self.get_tests(run_id)}
+        return self.test_ids[run_id]
+
+    def add_results(self, tests=None):
+        """All results in bulk requests, then geth logs of failed tests are attached concurrently"""
+        all_tests = tests if tests is not None else self.get_all_tests()
+        tests = [test for test in all_tests if test.testrail_case_id]
+        attachments = list()
+        for start in range(0, len(tests), self.results_chunk):
+            chunk = tests[start:start + self.results_chunk]
+            results = self.post_results(chunk)
+            if not isinstance(results, list):
+                # whole chunk is rejected if any case is not in the run, so it is sent again without such cases
+                case_ids = self.get_run_case_ids()
+                skipped = [test.testrail_case_id for test in chunk if test.testrail_case_id not in case_ids]
+                logging.error("Failed TestRail request: %s; cases not in run %s: %s" % (
+                    results.get('error'), self.run_id, ', '.join(map(str, skipped))))
+                chunk = [test for test in chunk if test.testrail_case_id in case_ids]
+                results = self.post_results(chunk) if chunk and skipped else results
+                if not isinstance(results, list):
+                    logging.error("Failed TestRail request: %s" % results.get('error'))
+                    continue
+            # results are returned in order of submitted ones
+            for test, result in zip(chunk, results):
+                if test.testruns[-1].error and test.geth_paths:
+                    attachments.extend(('add_attachment_to_result/%s' % result['id'], path)
+                                       for path in test.geth_paths.values())
+        with ThreadPoolExecutor(max_workers=self.upload_threads) as executor:
+            list(executor.map(lambda attachment: self.add_attachment(*attachment), attachments))
+        self.change_test_run_description(all_tests)
+
+    def change_test_run_description(self, tests=None):
+        tests = tests if tests is not None else self.get_all_tests()
+        passed_tests = [test for test in tests if self.is_test_successful(test)]
+        failed_tests = [test for test in tests if not self.is_test_successful(test)]
+        self.prefetch_sauce_assets(failed_tests)
         final_description = "Nothing to report this time..."
         if len(tests) > 0:
             description_title = "# %.0f%% of end-end tests have passed\n" % (len(passed_tests) / len(tests) * 100)
@@ -171,6 +218,9 @@ class TestrailReport(BaseTestReport):
             description_title += "Total executed tests: %d\n" % len(tests)
             description_title += "Failed tests: %d\n" % len(failed_tests)
             description_title += "Passed tests: %d\n" % len(passed_tests)
+            rerun_summary = self.get_rerun_summary(tests)
+            if rerun_summary:
+                description_title += "%s\n" % rerun_summary
             description_title += "\n"
             ids_failed_test = []
             description, case_info = '', ''
@@ -211,8 +261,7 @@ class TestrailReport(BaseTestReport):
             return True
 
     def get_test_result_link(self, test_run_id, test_case_id):
-        try:
-            test_id = self.get('get_results_for_case/%s/%s' % (test_run_id, test_case_id))['results'][0]['test_id']
-            return '%stests/view/%s' % (self.url, test_id)
-        except KeyError:
-            return None
\ No newline at end of file
+        if not test_run_id:
+            return None
+        test_id = self.get_run_case_ids(test_run_id).get(test_case_id)
+        return '%stests/view/%s' % (self.url, test_id) if test_id else None
\ No newline at end of file
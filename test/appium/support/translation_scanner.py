@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from support.translations import APPIUM_ROOT, TRANSLATIONS_PATH
+
+PROJECT_ROOT = os.path.normpath(os.path.join(APPIUM_ROOT, '..', '..'))
+SOURCE_PATHS = ('src/status_im', 'components/src')
+EXCLUDED_DIRS = ('test', 'translations')
+CACHE_PATH = os.path.join(APPIUM_ROOT, '.pytest_cache', 'translation_scan.pickle')
+# clojure symbols and keywords: `:t/are-you-sure?` gives `t` and `are-you-sure?`, (str "ens-" n) gives `ens-`
+TOKEN = re.compile(r'[\w?!*+<>=-]+')
+
+ScanResult = namedtuple('ScanResult', ['used', 'unused', 'dynamic'])
+
+_keys = frozenset()
+
+
+def _init_worker(keys):
+    global _keys
+    _keys = keys
+
+
+def scan_file(path):
+    """Content hash, translation keys found in the file as whole tokens and prefixes like `ens-` keys may be built of"""
+    with open(path, 'rb') as file:
+        content = file.read()
+    sha1 = hashlib.sha1(content).hexdigest()
+    try:
+        tokens = set(TOKEN.findall(content.decode('utf-8')))
+    except UnicodeDecodeError:
+        return path, sha1, frozenset(), frozenset()
+    prefixes = frozenset(token for token in tokens if token[-1] in '-_' and len(token) > 1)
+    return path, sha1, frozenset(tokens & _keys), prefixes
+
+
+def key_prefixes(key):
+    return [key[:index + 1] for index, char in enumerate(key[:-1]) if char in '-_']
+
+
+class TranslationScanner(object):
+    """
+    Finds which translation keys are used in clojurescript sources: every file is split into tokens by one compiled
+    regex and tokens are matched against the set of keys, files are scanned in parallel by a process pool.
+    Results are cached per file by its mtime and size, and by content hash when mtime changes (e.g. on checkout),
+    so repeated scans only read changed files. Unused keys which end with a digit or start with a prefix found
+    in sources (keys built in runtime, like (keyword (str "ens-" n))) are returned as `dynamic` to recheck.
+    """
+
+    def __init__(self, root=PROJECT_ROOT, translations_path=TRANSLATIONS_PATH, cache_path=CACHE_PATH,
+                 processes=None):
+        self.root = root
+        self.translations_path = translations_path
+        self.cache_path = cache_path
+        self.processes = processes
+        self.scanned_files = 0
+
+    def sources(self):
+        for path in SOURCE_PATHS:
+            for root, dirs, files in os.walk(os.path.join(self.root, path)):
+                dirs[:] = [directory for directory in dirs if directory not in EXCLUDED_DIRS]
+                for file in files:
+                    if file.endswith('.cljs'):
+                        yield os.path.join(root, file)
+
+    def _load_cache(self, keys_hash):
+        try:
+            with open(self.cache_path, 'rb') as file:
+                cache = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, AttributeError):
+            return dict()
+        return cache['files'] if cache.get('keys') == keys_hash else dict()
+
+    def _save_cache(self, keys_hash, files):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        temp_path = '%s.%s' % (self.cache_path, os.getpid())
+        with open(temp_path, 'wb') as file:
+            pickle.dump({'keys': keys_hash, 'files': files}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.cache_path)
+
+    def scan(self):
+        with open(self.translations_path, 'rb') as file:
+            content = file.read()
+        keys = frozenset(json.loads(content.decode('utf-8')))
+        keys_hash = hashlib.sha1(content).hexdigest()
+        cached = self._load_cache(keys_hash)
+        files, changed, touched = dict(), list(), False
+        for path in self.sources():
+            stat = os.stat(path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            entry = cached.get(path)
+            if entry and entry['stamp'] != stamp:
+                with open(path, 'rb') as file:
+                    if hashlib.sha1(file.read()).hexdigest() == entry['sha1']:
+                        entry['stamp'], touched = stamp, True
+                    else:
+                        entry = None
+            if entry:
+                files[path] = entry
+            else:
+                changed.append(path)
+                files[path] = {'stamp': stamp}
+        if changed:
+            with ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=(keys,)) as executor:
+                for path, sha1, used, prefixes in executor.map(scan_file, changed, chunksize=16):
+                    files[path].update(sha1=sha1, used=used, prefixes=prefixes)
+        if changed or touched or len(files) != len(cached):
+            self._save_cache(keys_hash, files)
+        self.scanned_files = len(changed)
+
+        used = frozenset().union(*(entry['used'] for entry in files.values()))
+        prefixes = frozenset().union(*(entry['prefixes'] for entry in files.values()))
+        unused = keys - used
+        dynamic = frozenset(key for key in unused
+                            if key[-1].isdigit() or any(prefix in prefixes for prefix in key_prefixes(key)))
+        return ScanResult(used, unused - dynamic, dynamic)
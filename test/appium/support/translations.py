@@ -0,0 +1,138 @@
+import json
+import os
+import pickle
+import re
+from collections.abc import Mapping
+from itertools import chain
+
+APPIUM_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRANSLATIONS_PATH = os.path.normpath(os.path.join(APPIUM_ROOT, '..', '..', 'translations', 'en.json'))
+LOCATORS_PATH = os.path.join(APPIUM_ROOT, '.pytest_cache', 'translation_locators.pickle')
+SOURCE_DIRS = ('views', 'tests')
+# translation ids given as literals to elements, views and `transl`
+USAGE = re.compile(
+    r'''(?:translation_id=|element_by_translation_id\(|get_translation_by_key\(|transl\[)\s*['"]([\w.-]+)['"]''')
+
+
+class Translations(Mapping):
+    """translations/en.json loaded on the first lookup instead of on import of `tests` in every worker"""
+
+    def __init__(self, path=TRANSLATIONS_PATH):
+        self.path = path
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            with open(self.path) as file:
+                self._data = json.load(file)
+        return self._data
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+
+def text_locators(text):
+    """Locator of element with the text and locator which matches its uppercase text too"""
+    return '//*[@text="%s"]' % text, '//*[@text="%s" or @text="%s"]' % (text, text.upper())
+
+
+class LocatorTable(object):
+    """
+    Locators of elements by translation ids which views/ and tests/ use, compiled from translations/en.json
+    and pickled together with modification stamps of en.json and sources, so workers load the small table
+    instead of parsing en.json. Table is rebuilt when any of these files changes; ids which are used
+    but not translated (`missing`) and ids whose text changed since the previous build (`changed`) are
+    reported at collection. Ids which are not in the table (built in runtime) are looked up in en.json.
+    """
+
+    def __init__(self, translations: Translations, path=LOCATORS_PATH, root=APPIUM_ROOT):
+        self.translations = translations
+        self.path = path
+        self.root = root
+        self.changed = set()
+        self._table = None
+
+    def sources(self):
+        for directory in SOURCE_DIRS:
+            for root, dirs, files in os.walk(os.path.join(self.root, directory)):
+                for file in files:
+                    if file.endswith('.py'):
+                        yield os.path.join(root, file)
+
+    def stamps(self):
+        stamps = dict()
+        for path in chain([self.translations.path], self.sources()):
+            stat = os.stat(path)
+            stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    @staticmethod
+    def used_ids(paths):
+        ids = set()
+        for path in paths:
+            with open(path, encoding='utf-8') as file:
+                ids.update(USAGE.findall(file.read()))
+        return ids
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as file:
+                return pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, AttributeError):
+            return None
+
+    def build(self, stamps=None, previous=None):
+        stamps = stamps or self.stamps()
+        used = self.used_ids(path for path in stamps if path != self.translations.path)
+        texts = self.translations.data
+        table = {'stamps': stamps,
+                 'locators': dict((key, (texts[key],) + text_locators(texts[key])) for key in used if key in texts),
+                 'missing': sorted(used - set(texts))}
+        if previous:
+            self.changed = set(key for key, value in previous['locators'].items()
+                               if key in table['locators'] and table['locators'][key][0] != value[0])
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = '%s.%s' % (self.path, os.getpid())
+        with open(temp_path, 'wb') as file:
+            pickle.dump(table, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.path)
+        return table
+
+    @property
+    def table(self):
+        if self._table is None:
+            stamps = self.stamps()
+            previous = self._load()
+            if previous and previous.get('stamps') == stamps:
+                self._table = previous
+            else:
+                self._table = self.build(stamps, previous)
+        return self._table
+
+    @property
+    def missing(self):
+        return self.table['missing']
+
+    def locator(self, translation_id, uppercase=False):
+        entry = self.table['locators'].get(translation_id)
+        if entry is None:
+            entry = (self.translations[translation_id],) + text_locators(self.translations[translation_id])
+        return entry[2] if uppercase else entry[1]
+
+
+def main():
+    table = LocatorTable(Translations()).build()
+    print('%s locators are compiled to %s' % (len(table['locators']), LOCATORS_PATH))
+    if table['missing']:
+        print('Not in translations/en.json: %s' % ', '.join(table['missing']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.wait import WebDriverWait
+
+
+class BackoffWait(WebDriverWait):
+    """
+    WebDriverWait which multiplies poll interval by `backoff` after every unsuccessful check (up to `max_poll`).
+    Every check is a remote command, so long waits issue a few dozens of commands instead of hundreds.
+    """
+
+    def __init__(self, driver, timeout, poll_frequency=0.5, ignored_exceptions=None, max_poll=3, backoff=1.5):
+        super(BackoffWait, self).__init__(driver, timeout, poll_frequency, ignored_exceptions)
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self.checks = 0
+
+    def until(self, method, message=''):
+        screen, stacktrace = None, None
+        poll = self._poll
+        end_time = time.time() + self._timeout
+        while True:
+            self.checks += 1
+            try:
+                value = method(self._driver)
+                if value:
+                    return value
+            except self._ignored_exceptions as exc:
+                screen = getattr(exc, 'screen', None)
+                stacktrace = getattr(exc, 'stacktrace', None)
+            time_left = end_time - time.time()
+            if time_left <= 0:
+                break
+            time.sleep(min(poll, time_left))
+            poll = min(poll * self.backoff, self.max_poll)
+        raise TimeoutException(message, screen, stacktrace)
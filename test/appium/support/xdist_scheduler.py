@@ -0,0 +1,136 @@
+import fcntl
+import json
+import os
+
+from xdist.scheduler import LoadGroupScheduling
+
+
+class TestDurations(object):
+    """
+    History of test durations (seconds, including class setup for the first test of shared-drivers class)
+    and number of devices they use, merged from JSON reports of every run. It is kept outside of report dir
+    which is cleaned on start.
+    """
+    __test__ = False
+    smoothing = 0.5  # weight of the last run
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return dict()
+
+    def update(self, tests):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'a+') as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                file.seek(0)
+                try:
+                    history = json.loads(file.read())
+                except ValueError:
+                    history = dict()
+                for test in tests:
+                    durations = [testrun.duration for testrun in test.testruns if testrun.duration]
+                    if not durations:
+                        continue
+                    duration = sum(durations)  # reruns take the worker too
+                    devices = max(len(testrun.jobs) for testrun in test.testruns) or 1
+                    if test.name in history:
+                        duration = self.smoothing * duration + (1 - self.smoothing) * history[test.name]['duration']
+                    history[test.name] = {'duration': round(duration, 1), 'devices': devices}
+                file.seek(0)
+                file.truncate()
+                json.dump(history, file, indent=1, sort_keys=True)
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+
+class DurationScheduling(LoadGroupScheduling):
+    """
+    `--dist loadgroup` which hands out work units (xdist groups and single tests) longest first, by durations
+    of previous runs, and only when devices they need fit into `max_devices` along with running units.
+    As in loadscope, a node is refilled when it has 2 or less pending tests: worker keeps its last test until it gets
+    more work or shutdown, so that test is not running and its unit does not take devices yet.
+    `standby` sessions which session pool of every working node keeps are counted as devices in use too.
+    """
+    default_duration = 300
+
+    def __init__(self, config, log=None, durations: dict = None, max_devices=0, standby=0):
+        super().__init__(config, log)
+        self.durations = durations or dict()
+        self.max_devices = max_devices
+        self.standby = standby
+        known = [test['duration'] for test in self.durations.values()]
+        self.unknown_duration = sum(known) / len(known) if known else self.default_duration
+
+    @staticmethod
+    def test_name(nodeid):
+        """Test name as in reports, of node id 'path::Class::test_name[params]@group'"""
+        if nodeid.rfind('@') > nodeid.rfind(']'):
+            nodeid = nodeid.rsplit('@', 1)[0]
+        return nodeid.rsplit('::', 1)[-1]
+
+    def cost(self, work_unit):
+        """(seconds, devices) of the unit"""
+        tests = [self.durations.get(self.test_name(nodeid)) for nodeid in work_unit]
+        duration = sum(test['duration'] if test else self.unknown_duration for test in tests)
+        devices = max(test['devices'] if test else 1 for test in tests)
+        return duration, devices
+
+    def devices_in_use(self, exclude=None):
+        """Devices of units which other nodes hold: tests of a node run one by one, so it is the first unfinished
+        unit of every node with pending tests. Shared drivers of the unit are alive until the node gets the next unit
+        or shuts down, even when only the last test of the unit is pending (worker keeps it until then)"""
+        in_use = 0
+        for node, workload in self.assigned_work.items():
+            if node is exclude or not self._pending_of(workload):
+                continue
+            unfinished = [work_unit for work_unit in workload.values() if not all(work_unit.values())]
+            in_use += self.cost(unfinished[0])[1]
+        return in_use
+
+    def is_running(self, exclude=None):
+        """Whether other nodes run tests: a node with one pending test waits for more work before running it"""
+        return any(self._pending_of(workload) > 1 for node, workload in self.assigned_work.items()
+                   if node is not exclude)
+
+    def standby_devices(self):
+        return self.standby * len([node for node in self.nodes if not node.shutting_down])
+
+    def _assign_work_unit(self, node):
+        in_use = self.devices_in_use(exclude=node)
+        reserved = in_use + self.standby_devices()
+        # a unit is started anyway when no other node runs tests, as devices of waiting nodes are freed only when
+        # they get work, so the run can't get stuck
+        running = self.is_running(exclude=node)
+        fitting = [(self.cost(work_unit)[0], scope) for scope, work_unit in self.workqueue.items()
+                   if not self.max_devices or not running or reserved + self.cost(work_unit)[1] <= self.max_devices]
+        if not fitting:
+            self.log('No devices for the next unit, %s in use' % reserved)
+            return  # node gets work when a running unit finishes
+        _, scope = max(fitting)
+        work_unit = self.workqueue.pop(scope)
+        self.assigned_work.setdefault(node, dict())[scope] = work_unit
+        collection = self.registered_collections[node]
+        node.send_runtest_some([collection.index(nodeid) for nodeid, completed in work_unit.items() if not completed])
+
+    def _reschedule(self, node):
+        if node.shutting_down:
+            return
+        if not self.workqueue:
+            node.shutdown()
+            return
+        if self._pending_of(self.assigned_work.get(node, dict())) <= 2:
+            self._assign_work_unit(node)
+
+    def mark_test_complete(self, node, item_index, duration=0):
+        super().mark_test_complete(node, item_index, duration)
+        # devices may be freed for units which idle nodes could not take before
+        for idle_node in self.nodes:
+            if idle_node is not node:
+                self._reschedule(idle_node)
@@ -2,9 +2,10 @@ import asyncio
 import logging
 from datetime import datetime
 import os
-import json
+import re
 from support.appium_container import AppiumContainer
 from support.test_data import TestSuiteData
+from support.translations import LocatorTable, Translations
 
 async def start_threads(quantity: int, func: type, returns: dict, *args):
     loop = asyncio.get_event_loop()
@@ -22,6 +23,14 @@ def get_current_time():
 def debug(text: str):
     logging.debug(text)
 
+
+def get_app_package():
+    """Package of the app under test, PR builds have their own one"""
+    apk = pytest_config_global['apk']
+    if re.findall(r'pr\d\d\d\d\d', apk) or re.findall(r'\d\d\d\d\d.apk', apk):
+        return 'im.status.ethereum.pr'
+    return 'im.status.ethereum'
+
 appium_root_project_path = os.path.join(os.sep.join(__file__.split(os.sep)[:-1]), '../')
 
 pytest_config_global = dict()
@@ -55,6 +64,5 @@ test_dapp_name = 'simpledapp.eth'
 
 emojis = {'thumbs-up': 2, 'thumbs-down': 3, 'love': 1, 'laugh': 4, 'angry': 6, 'sad': 5}
 
-
-with open(os.sep.join(__file__.split(os.sep)[:-1]) + '/../../../translations/en.json') as json_file:
-    transl = json.load(json_file)
+transl = Translations()
+translation_locators = LocatorTable(transl)
@@ -19,8 +19,7 @@ class TestPublicChatMultipleDeviceMerged(MultipleSharedDeviceTestCase):
     @classmethod
     def setup_class(cls):
         cls.drivers, cls.loop = create_shared_drivers(2)
-        device_1, device_2 = SignInView(cls.drivers[0]), SignInView(cls.drivers[1])
-        cls.home_1, cls.home_2 = device_1.create_user(), device_2.create_user()
+        cls.home_1, cls.home_2 = cls.run_on_all(lambda driver: SignInView(driver).create_user())
         profile_1 = cls.home_1.profile_button.click()
         cls.username_1 = profile_1.default_username_text.text
         profile_1.home_button.click()
@@ -29,7 +28,8 @@ class TestPublicChatMultipleDeviceMerged(MultipleSharedDeviceTestCase):
         cls.home_1.join_public_chat(cls.pub_chat_delete_long_press)
         [home.home_button.click() for home in (cls.home_1, cls.home_2)]
         cls.public_chat_name = cls.home_1.get_random_chat_name()
-        cls.chat_1, cls.chat_2 = cls.home_1.join_public_chat(cls.public_chat_name), cls.home_2.join_public_chat(cls.public_chat_name)
+        cls.chat_1, cls.chat_2 = cls.gather(lambda: cls.home_1.join_public_chat(cls.public_chat_name),
+                                            lambda: cls.home_2.join_public_chat(cls.public_chat_name))
         cls.chat_1.send_message(cls.text_message)
 
     @marks.testrail_id(5313)
@@ -16,7 +16,7 @@ class TestTransactionWalletSingleDevice(SingleDeviceTestCase):
         sign_in = SignInView(self.driver)
         home = sign_in.recover_access(sender['passphrase'], keycard=True)
         wallet = home.wallet_button.click()
-        wallet.wait_balance_is_changed()
+        wallet.wait_balance_is_changed(address=sender['address'])
         transaction_amount = wallet.get_unique_amount()
         wallet.send_transaction(amount=transaction_amount, sign_transaction=True, keycard=True, recipient='0x%s' % recipient['address'])
 
@@ -65,7 +65,7 @@ class TestTransactionWalletSingleDevice(SingleDeviceTestCase):
         wallet = sign_in_view.wallet_button.click()
         status_account_address = wallet.get_wallet_address()[2:]
         self.network_api.get_donate(status_account_address, external_faucet=True)
-        wallet.wait_balance_is_changed()
+        wallet.wait_balance_is_changed(address=status_account_address)
         account_name = 'subaccount'
         wallet.add_account(account_name, keycard=True)
         wallet.get_account_by_name(account_name).click()
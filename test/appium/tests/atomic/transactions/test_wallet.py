@@ -63,7 +63,7 @@ class TestTransactionWalletSingleDevice(SingleDeviceTestCase):
         home = sign_in.recover_access(sender['passphrase'])
         sign_in.toggle_airplane_mode()
         wallet = home.wallet_button.click()
-        [wallet.wait_balance_is_changed(asset) for asset in ("ETH", "STT")]
+        [wallet.wait_balance_is_changed(asset, address=sender['address']) for asset in ("ETH", "STT")]
         self.driver.reset()
 
         sign_in.just_fyi('Keycard: checking if balance will be restored after going back online')
@@ -73,7 +73,7 @@ class TestTransactionWalletSingleDevice(SingleDeviceTestCase):
         sign_in.recover_access(sender['passphrase'], keycard=True)
         sign_in.toggle_airplane_mode()
         wallet = home.wallet_button.click()
-        [wallet.wait_balance_is_changed(asset) for asset in ("ETH", "STT")]
+        [wallet.wait_balance_is_changed(asset, address=sender['address']) for asset in ("ETH", "STT")]
 
     @marks.testrail_id(5461)
     @marks.medium
@@ -116,7 +116,7 @@ class TestTransactionWalletSingleDevice(SingleDeviceTestCase):
         sender = wallet_users['E']
         home = SignInView(self.driver).recover_access(sender['passphrase'])
         wallet = home.wallet_button.click()
-        [wallet.wait_balance_is_changed(asset) for asset in ['ETH', 'STT']]
+        [wallet.wait_balance_is_changed(asset, address=sender['address']) for asset in ['ETH', 'STT']]
         eth_value, stt_value = wallet.get_asset_amount_by_name('ETH'), wallet.get_asset_amount_by_name('STT')
         if eth_value == 0 or stt_value == 0:
             self.driver.fail('No funds!')
@@ -221,7 +221,7 @@ class TestTransactionWalletSingleDevice(SingleDeviceTestCase):
         wallet = sign_in.wallet_button.click()
         status_account_address = wallet.get_wallet_address()[2:]
         self.network_api.get_donate(status_account_address, external_faucet=True)
-        wallet.wait_balance_is_changed()
+        wallet.wait_balance_is_changed(address=status_account_address)
 
         account_name = 'subaccount'
         wallet.add_account(account_name)
@@ -314,7 +314,7 @@ class TestTransactionWalletSingleDevice(SingleDeviceTestCase):
         sign_in = SignInView(self.driver)
         sign_in.recover_access(transaction_senders['C']['passphrase'])
         wallet = sign_in.wallet_button.click()
-        wallet.wait_balance_is_changed()
+        wallet.wait_balance_is_changed(address=transaction_senders['C']['address'])
         send_transaction_view = SendTransactionView(self.driver)
 
         sign_in.just_fyi("Setting up wallet")
@@ -630,7 +630,7 @@ class TestTransactionWalletSingleDevice(SingleDeviceTestCase):
         sign_in = SignInView(self.driver)
         sign_in.recover_access(sender['passphrase'])
         wallet = sign_in.wallet_button.click()
-        wallet.wait_balance_is_changed()
+        wallet.wait_balance_is_changed(address=sender['address'])
         wallet.accounts_status_account.click()
 
         send_transaction = wallet.send_transaction_button.click()
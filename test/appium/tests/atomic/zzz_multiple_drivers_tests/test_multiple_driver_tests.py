@@ -17,11 +17,16 @@ class TestPublicChatMultipleDeviceMerged(MultipleSharedDeviceTestCase):
         cls.message_to_admin = 'Hey, admin!'
 
         cls.homes, cls.public_keys, cls.usernames, cls.chats = {}, {}, {}, {}
-        for key in cls.drivers:
-            sign_in = SignInView(cls.drivers[key])
-            cls.homes[key] = sign_in.create_user(enable_notifications=True)
-            cls.public_keys[key], cls.usernames[key] = sign_in.get_public_key_and_username(True)
+
+        def create_user(driver):
+            sign_in = SignInView(driver)
+            home = sign_in.create_user(enable_notifications=True)
+            public_key, username = sign_in.get_public_key_and_username(True)
             sign_in.home_button.click()
+            return home, public_key, username
+
+        for key, (home, public_key, username) in enumerate(cls.run_on_all(create_user)):
+            cls.homes[key], cls.public_keys[key], cls.usernames[key] = home, public_key, username
         cls.chat_name = cls.homes[0].get_random_chat_name()
 
         cls.homes[0].just_fyi('Admin adds future members to contacts')
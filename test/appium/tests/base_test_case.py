@@ -3,26 +3,33 @@ import logging
 import re
 import subprocess
 import sys
+import threading
+import time
+import tracemalloc
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from http.client import RemoteDisconnected
 from os import environ
 
 import pytest
-import requests
 from appium import webdriver
 from appium.webdriver.common.mobileby import MobileBy
 from sauceclient import SauceException
 from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import WebDriverException
-from selenium.webdriver.support.wait import WebDriverWait
 
 from tests import transl
 
 from support.api.network_api import NetworkApi
+from support.command_tracer import CommandTracer, is_untraced
+from support.fake_appium import FakeAppiumServer, Scenario, ScenarioRecorder
+from support.geth_log import GethLog
 from support.github_report import GithubHtmlReport
-from tests import test_suite_data, start_threads, appium_container, pytest_config_global
-import base64
-from re import findall
+from support.logcat import LogcatCollector
+from support.page_source import PageSourceSnapshot, READ_ONLY_COMMANDS
+from support.screen_capture import ScreenCapture
+from support.session_pool import SessionPool
+from tests import test_suite_data, start_threads, appium_container, pytest_config_global, get_app_package
 
 from tests.conftest import sauce
 
@@ -36,6 +43,9 @@ executor_local = 'http://localhost:4723/wd/hub'
 
 implicit_wait = 5
 
+# steps of flows run concurrently on several devices are buffered per thread, see `run_on_all`
+step_buffer = threading.local()
+
 
 def get_capabilities_local():
     desired_caps = dict()
@@ -108,13 +118,13 @@ class AbstractTestCase:
     def get_translation_by_key(self, key):
         return transl[key]
 
+    @property
+    def app_package(self):
+        return get_app_package()
+
     @property
     def app_path(self):
-        app_folder = 'im.status.ethereum'
-        apk = pytest_config_global['apk']
-        if findall(r'pr\d\d\d\d\d', apk) or findall(r'\d\d\d\d\d.apk', apk):
-            app_folder += '.pr'
-        app_path = '/storage/emulated/0/Android/data/%s/files/Download/' % app_folder
+        app_path = '/storage/emulated/0/Android/data/%s/files/Download/' % self.app_package
         return app_path
 
     @property
@@ -152,30 +162,102 @@ class AbstractTestCase:
             test_suite_data.current_test.testruns[-1].error += "; also Unexpected Alert is shown: '%s'" \
                                                                % self.get_alert_text(driver)
 
-    def pull_geth(self, driver):
-        result = ""
+    def save_traces(self, drivers):
+        traces = dict()
+        for driver in drivers:
+            traces[driver.session_id] = driver.pop_trace()
+        self.github_report.save_stats('%s_trace' % test_suite_data.current_test.name, traces)
+
+    def pull_geth(self, driver, name, tail=False):
+        geth_path = self.github_report.get_geth_path(name)
         try:
-            result = driver.pull_file(self.geth_path)
+            driver.geth_log.save(geth_path, tail)
         except WebDriverException:
             pass
-        return base64.b64decode(result)
+        return geth_path
 
 
 class Driver(webdriver.Remote):
 
+    def __init__(self, *args, **kwargs):
+        self.command_count = 0
+        self.wait_stats = list()
+        self.tracer = CommandTracer()
+        self._logcat_collector = None
+        self._geth_log = None
+        self.page_source_snapshot = PageSourceSnapshot(self, enabled=pytest_config_global.get('page_source_snapshot'))
+        self.screen_capture = ScreenCapture(self)
+        record_scenario = pytest_config_global.get('record_scenario')
+        self.scenario_recorder = ScenarioRecorder(record_scenario) if record_scenario else None
+        super(Driver, self).__init__(*args, **kwargs)
+
+    def execute(self, driver_command, params=None):
+        if is_untraced():
+            return super(Driver, self).execute(driver_command, params)
+        self.command_count += 1
+        if self.scenario_recorder:
+            self.scenario_recorder.before(self, driver_command, params or dict())
+        start_time, response, error = time.time(), None, None
+        try:
+            response = super(Driver, self).execute(driver_command, params)
+        except Exception as exception:
+            error = exception
+            raise
+        finally:
+            self.tracer.record(driver_command, params, time.time() - start_time, response, error)
+            if driver_command not in READ_ONLY_COMMANDS:
+                self.page_source_snapshot.invalidate()
+                self.screen_capture.invalidate()
+        if self.scenario_recorder:
+            self.scenario_recorder.after(driver_command, params or dict(), response)
+        return response
+
+    def quit(self):
+        if self._logcat_collector is not None:
+            self._logcat_collector.stop()
+        super(Driver, self).quit()
+
+    def pop_trace(self):
+        """Trace of commands and waits since the previous call"""
+        trace = self.tracer.report(wait_stats=self.wait_stats)
+        self.tracer.reset()
+        self.wait_stats = list()
+        return trace
+
     @property
     def number(self):
         return test_suite_data.current_test.testruns[-1].jobs[self.session_id]
 
+    @property
+    def logcat_collector(self):
+        if self._logcat_collector is None:
+            self._logcat_collector = LogcatCollector(self, interval=60)
+        return self._logcat_collector
+
+    @property
+    def geth_log(self):
+        if self._geth_log is None:
+            # Sauce doesn't allow `mobile: shell`
+            self._geth_log = GethLog(self, AbstractTestCase().geth_path,
+                                     shell=False if pytest_config_global.get('env') == 'sauce' else None)
+        return self._geth_log
+
     def info(self, text: str, device=True):
         if device:
             text = 'Device %s: %s ' % (self.number, text)
         logging.info(text)
-        test_suite_data.current_test.testruns[-1].steps.append(text)
+        steps = getattr(step_buffer, 'steps', None)
+        (steps if steps is not None else test_suite_data.current_test.testruns[-1].steps).append(text)
 
     def fail(self, text: str):
         pytest.fail('Device %s: %s' % (self.number, text))
 
+    def record_wait(self, element_name: str, condition: str, seconds: int, commands: int):
+        self.wait_stats.append({'element': element_name, 'condition': condition,
+                                'timeout': seconds, 'commands': commands})
+        logging.debug("Session %s: waiting for %s of '%s' (max %ss) took %s commands" % (
+            self.session_id, condition, element_name, seconds, commands))
+
 
 class Errors(object):
     def __init__(self):
@@ -189,6 +271,50 @@ class Errors(object):
             pytest.fail('\n '.join([self.errors.pop(0) for _ in range(len(self.errors))]))
 
 
+class AbstractMultipleDeviceTestCase(AbstractTestCase):
+
+    @staticmethod
+    def _run_flow(flow):
+        step_buffer.steps = list()
+        try:
+            return flow(), None, step_buffer.steps
+        except (Exception, pytest.fail.Exception) as error:
+            return None, error, step_buffer.steps
+        finally:
+            step_buffer.steps = None
+
+    @classmethod
+    def gather(cls, *flows, errors=None):
+        """
+        Runs flows (one per device, in device order) concurrently and returns their results.
+        Steps of every flow are added to the report after all of them finish, device by device.
+        Failures of all flows are reported together: appended to `errors` if given, test fails otherwise.
+        """
+        with ThreadPoolExecutor(max_workers=len(flows) or 1) as executor:
+            outcomes = list(executor.map(cls._run_flow, flows))
+        steps = test_suite_data.current_test.testruns[-1].steps
+        failures = errors if errors is not None else Errors()
+        for number, (_, error, flow_steps) in enumerate(outcomes, start=1):
+            steps.extend(flow_steps)
+            if error is not None:
+                text = str(error).strip() or type(error).__name__
+                # errors of driver.fail() and of elements tell the device already
+                if not re.match(r'(Message: )?Device \d+:', text):
+                    text = 'Device %s: %s' % (number, text)
+                logging.info(text)
+                failures.append(text)
+        if errors is None:
+            failures.verify_no_errors()
+        return [result for result, _, _ in outcomes]
+
+    @classmethod
+    def run_on_all(cls, flow, drivers: dict = None, errors=None):
+        """`flow(driver)` run concurrently on every driver (`cls.drivers` by default), results in device order"""
+        drivers = drivers if drivers is not None else cls.drivers
+        return cls.gather(*[lambda driver=driver: flow(driver) for _, driver in sorted(drivers.items())],
+                          errors=errors)
+
+
 class SingleDeviceTestCase(AbstractTestCase):
 
     def setup_method(self, method, **kwargs):
@@ -213,18 +339,19 @@ class SingleDeviceTestCase(AbstractTestCase):
             self.print_sauce_lab_info(self.driver)
         try:
             self.add_alert_text_to_report(self.driver)
-            geth_content = self.pull_geth(self.driver)
+            geth_name = '%s_geth.log' % test_suite_data.current_test.name
+            geth_paths = {geth_name: self.pull_geth(self.driver, geth_name)}
+            self.save_traces([self.driver])
             self.driver.quit()
             if pytest_config_global['docker']:
                 appium_container.stop_container()
         except (WebDriverException, AttributeError):
             pass
         finally:
-            self.github_report.save_test(test_suite_data.current_test,
-                                         {'%s_geth.log' % test_suite_data.current_test.name: geth_content})
+            self.github_report.save_test(test_suite_data.current_test, geth_paths)
 
 
-class LocalMultipleDeviceTestCase(AbstractTestCase):
+class LocalMultipleDeviceTestCase(AbstractMultipleDeviceTestCase):
 
     def setup_method(self, method):
         self.drivers = dict()
@@ -238,6 +365,7 @@ class LocalMultipleDeviceTestCase(AbstractTestCase):
             self.drivers[driver].implicitly_wait(self.implicitly_wait)
 
     def teardown_method(self, method):
+        self.save_traces(self.drivers.values())
         for driver in self.drivers:
             try:
                 self.add_alert_text_to_report(self.drivers[driver])
@@ -246,7 +374,7 @@ class LocalMultipleDeviceTestCase(AbstractTestCase):
                 pass
 
 
-class SauceMultipleDeviceTestCase(AbstractTestCase):
+class SauceMultipleDeviceTestCase(AbstractMultipleDeviceTestCase):
 
     @classmethod
     def setup_class(cls):
@@ -270,25 +398,38 @@ class SauceMultipleDeviceTestCase(AbstractTestCase):
                 custom_implicitly_wait if custom_implicitly_wait else implicit_wait)
 
     def teardown_method(self, method):
-        geth_names, geth_contents = [], []
+        geth_paths = dict()
         for driver in self.drivers:
             try:
                 self.print_sauce_lab_info(self.drivers[driver])
                 self.add_alert_text_to_report(self.drivers[driver])
-                geth_names.append(
-                    '%s_geth%s.log' % (test_suite_data.current_test.name, str(self.drivers[driver].number)))
-                geth_contents.append(self.pull_geth(self.drivers[driver]))
+                geth_name = '%s_geth%s.log' % (test_suite_data.current_test.name, str(self.drivers[driver].number))
+                geth_paths[geth_name] = self.pull_geth(self.drivers[driver], geth_name)
                 self.drivers[driver].quit()
             except (WebDriverException, AttributeError):
                 pass
-        geth = {geth_names[i]: geth_contents[i] for i in range(len(geth_names))}
-        self.github_report.save_test(test_suite_data.current_test, geth)
+        self.save_traces(self.drivers.values())
+        self.github_report.save_test(test_suite_data.current_test, geth_paths)
 
     @classmethod
     def teardown_class(cls):
         cls.loop.close()
 
 
+session_pool = None
+
+
+def get_session_pool():
+    global session_pool
+    if session_pool is None:
+        # pooled session may wait in standby up to max_age, so it still has usual 1800 sec for the tests
+        pool = SessionPool(None, standby=int(pytest_config_global['standby_sessions']))
+        capabilities = update_capabilities_sauce_lab({'maxDuration': 1800 + pool.max_age})
+        pool.create_session = lambda: Driver(executor_sauce_lab, capabilities)
+        session_pool = pool
+    return session_pool
+
+
 def create_shared_drivers(quantity):
     drivers = dict()
     if pytest_config_global['env'] == 'local':
@@ -302,19 +443,22 @@ def create_shared_drivers(quantity):
     else:
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        capabilities = {'maxDuration': 1800}
-        drivers = loop.run_until_complete(start_threads(quantity,
-                                                        Driver,
-                                                        drivers,
-                                                        executor_sauce_lab,
-                                                        update_capabilities_sauce_lab(capabilities)))
+        if int(pytest_config_global.get('standby_sessions', 0)):
+            drivers = dict(enumerate(get_session_pool().acquire(quantity)))
+        else:
+            capabilities = {'maxDuration': 1800}
+            drivers = loop.run_until_complete(start_threads(quantity,
+                                                            Driver,
+                                                            drivers,
+                                                            executor_sauce_lab,
+                                                            update_capabilities_sauce_lab(capabilities)))
         for i in range(quantity):
             test_suite_data.current_test.testruns[-1].jobs[drivers[i].session_id] = i + 1
             drivers[i].implicitly_wait(implicit_wait)
     return drivers, loop
 
 
-class LocalSharedMultipleDeviceTestCase(AbstractTestCase):
+class LocalSharedMultipleDeviceTestCase(AbstractMultipleDeviceTestCase):
 
     def setup_method(self, method):
         jobs = test_suite_data.current_test.testruns[-1].jobs
@@ -329,6 +473,7 @@ class LocalSharedMultipleDeviceTestCase(AbstractTestCase):
                 self.add_alert_text_to_report(self.drivers[driver])
             except WebDriverException:
                 pass
+        self.save_traces(self.drivers.values())
 
     @classmethod
     def teardown_class(cls):
@@ -339,7 +484,7 @@ class LocalSharedMultipleDeviceTestCase(AbstractTestCase):
                 pass
 
 
-class SauceSharedMultipleDeviceTestCase(AbstractTestCase):
+class SauceSharedMultipleDeviceTestCase(AbstractMultipleDeviceTestCase):
 
     def setup_method(self, method):
         for _, driver in self.drivers.items():
@@ -351,44 +496,43 @@ class SauceSharedMultipleDeviceTestCase(AbstractTestCase):
         self.errors = Errors()
 
     def teardown_method(self, method):
-        geth_names, geth_contents = [], []
+        geth_paths = dict()
         for driver in self.drivers:
             try:
                 self.print_sauce_lab_info(self.drivers[driver])
                 self.add_alert_text_to_report(self.drivers[driver])
-                geth_names.append(
-                    '%s_geth%s.log' % (test_suite_data.current_test.name, str(self.drivers[driver].number)))
-                geth_contents.append(self.pull_geth(self.drivers[driver]))
+                # drivers are shared between tests of the class, so only entries of the current test are saved
+                geth_name = '%s_geth%s.log' % (test_suite_data.current_test.name, str(self.drivers[driver].number))
+                geth_paths[geth_name] = self.pull_geth(self.drivers[driver], geth_name, tail=True)
 
             except (WebDriverException, AttributeError):
                 pass
             finally:
-                geth = {geth_names[i]: geth_contents[i] for i in range(len(geth_names))}
-                test_suite_data.current_test.geth_paths = self.github_report.save_geth(geth)
+                test_suite_data.current_test.geth_paths = geth_paths
+        self.save_traces(self.drivers.values())
 
     @classmethod
     def teardown_class(cls):
-        requests_session = requests.Session()
-        requests_session.auth = (sauce_username, sauce_access_key)
+        session_ids = [driver.session_id for _, driver in cls.drivers.items()]
         for _, driver in cls.drivers.items():
-            session_id = driver.session_id
             try:
-                sauce.jobs.update_job(job_id=session_id, name=cls.__name__)
+                sauce.jobs.update_job(job_id=driver.session_id, name=cls.__name__)
             except (RemoteDisconnected, SauceException):
                 pass
             try:
                 driver.quit()
             except WebDriverException:
                 pass
-            url = sauce.jobs.get_job_asset_url(job_id=session_id, filename="log.json")
-            WebDriverWait(driver, 60, 2).until(lambda _: requests_session.get(url).status_code == 200)
-            commands = requests_session.get(url).json()
-            for command in commands:
+        # logs of all sessions are polled at once, they become available when session is finished
+        cls.github_report.sauce_assets.prefetch(session_ids, assets=False, log=True)
+        for session_id in session_ids:
+            commands = cls.github_report.sauce_assets.log(session_id) or list()
+            for number, command in enumerate(commands, start=1):
                 try:
                     if command['message'].startswith("Started "):
                         for test in test_suite_data.tests:
                             if command['message'] == "Started %s" % test.name:
-                                test.testruns[-1].first_commands[session_id] = commands.index(command) + 1
+                                test.testruns[-1].first_commands[session_id] = number
                 except KeyError:
                     continue
         cls.loop.close()
@@ -404,6 +548,47 @@ else:
     MultipleSharedDeviceTestCase = SauceSharedMultipleDeviceTestCase
 
 
+class FakeDeviceTestCase(AbstractTestCase):
+    """Runs tests against local fake appium server replaying `scenario` (see support/fake_appium.py)"""
+    scenario = None
+    latency = 0.0
+
+    def setup_method(self, method):
+        self.fake_server = FakeAppiumServer(Scenario.load(self.scenario), latency=self.latency).start()
+        self.driver = Driver(self.fake_server.executor, {'platformName': 'Android', 'automationName': 'UiAutomator2'})
+        test_suite_data.current_test.testruns[-1].jobs[self.driver.session_id] = 1
+        self.driver.implicitly_wait(implicit_wait)
+        self.errors = Errors()
+
+    def benchmark(self, flow):
+        """Runs the flow and saves commands, wall time and peak memory (test process and fake server) to report"""
+        commands_before, server_commands_before = self.driver.command_count, self.fake_server.stats['commands']
+        tracemalloc.start()
+        start_time = time.time()
+        try:
+            return flow()
+        finally:
+            stats = {'wall_time': round(time.time() - start_time, 3),
+                     'peak_memory_kb': tracemalloc.get_traced_memory()[1] // 1024,
+                     'driver_commands': self.driver.command_count - commands_before,
+                     'server_commands': self.fake_server.stats['commands'] - server_commands_before,
+                     'server': self.fake_server.stats, 'waits': self.driver.wait_stats}
+            tracemalloc.stop()
+            self.driver.info('Benchmark: %s commands, %ss, peak memory %s KB' % (
+                stats['driver_commands'], stats['wall_time'], stats['peak_memory_kb']), device=False)
+            self.github_report.save_stats('%s_benchmark' % test_suite_data.current_test.name, stats)
+
+    def teardown_method(self, method):
+        self.save_traces([self.driver])
+        try:
+            self.driver.quit()
+        except WebDriverException:
+            pass
+        finally:
+            self.fake_server.stop()
+            self.github_report.save_test(test_suite_data.current_test)
+
+
 class NoDeviceTestCase(AbstractTestCase):
 
     def setup_method(self, method, **kwargs):
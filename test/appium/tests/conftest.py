@@ -1,16 +1,18 @@
-import requests
+import os
 import pytest
 import re
+import sys
+import warnings
 from _pytest.runner import runtestprotocol
 from http.client import RemoteDisconnected
 from support.device_stats_db import DeviceStatsDB
-from support.test_rerun import should_rerun_test
+from support.test_rerun import classify_error, RerunBudget
 from tests import test_suite_data, appium_container
 from datetime import datetime
 from os import environ
-from io import BytesIO
 from sauceclient import SauceClient, SauceException
 from support.api.network_api import NetworkApi
+from support.apk_storage import ApkCache, SauceApkStorage
 from support.github_report import GithubHtmlReport
 from support.testrail_report import TestrailReport
 from tests.users import transaction_senders
@@ -34,6 +36,10 @@ def pytest_addoption(parser):
                      action='store',
                      default=None,
                      help='Url or local path to apk')
+    parser.addoption('--apk_cache',
+                     action='store',
+                     default='~/.cache/status-e2e/apk',
+                     help='Directory to keep downloaded APKs in, by content hash')
     parser.addoption('--env',
                      action='store',
                      default='sauce',
@@ -61,7 +67,16 @@ def pytest_addoption(parser):
     parser.addoption('--rerun_count',
                      action='store',
                      default=0,
-                     help='How many times tests should be re-run if failed')
+                     help='How many times tests should be re-run if failed; without xdist (-n 0) reruns are '
+                          'deferred to the end of the run, xdist workers rerun a test right after its failed attempt')
+    parser.addoption('--rerun_budget',
+                     action='store',
+                     default=3600,
+                     help='Seconds all workers may spend on reruns during the run')
+    parser.addoption('--rerun_limits',
+                     action='store',
+                     default=None,
+                     help='Reruns per error category, e.g. "infra=10,device=5,network=5,app=2"')
     parser.addoption("--run_testrail_ids",
                      action="store",
                      metavar="NAME",
@@ -72,6 +87,34 @@ def pytest_addoption(parser):
                      metavar="NAME",
                      default=None,
                      help='Url or local path to apk for upgrade')
+    parser.addoption('--standby_sessions',
+                     action='store',
+                     default=0,
+                     help='How many Sauce sessions each worker keeps starting in background for the next shared-drivers class')
+    parser.addoption('--account_snapshots',
+                     action='store',
+                     default=None,
+                     help='Path to directory with onboarded account snapshots; create_user() restores them if available')
+    parser.addoption('--account_snapshots_number',
+                     action='store',
+                     default=0,
+                     help='How many account snapshots tests/test_account_snapshots.py should prepare')
+    parser.addoption('--page_source_snapshot',
+                     action='store_true',
+                     default=False,
+                     help='Check presence/visibility/text of elements against a cached page source when possible')
+    parser.addoption('--record_scenario',
+                     action='store',
+                     default=None,
+                     help='Directory to record page sources and taps of sessions to, for support/fake_appium.py')
+    parser.addoption('--test_durations',
+                     action='store',
+                     default=os.path.join(GithubHtmlReport.TEST_REPORT_DIR, '..', '.pytest_cache', 'test_durations.json'),
+                     help='File with durations of previous runs, used to start the longest xdist groups first')
+    parser.addoption('--max_devices',
+                     action='store',
+                     default=0,
+                     help='How many devices (Sauce sessions) running xdist groups may use at once; 0 - no limit')
 
     # chat bot
 
@@ -140,16 +183,10 @@ def is_master(config):
     return not hasattr(config, 'workerinput')
 
 
-def is_uploaded():
-    stored_files = sauce.storage.get_stored_files()
-    for i in range(len(stored_files['files'])):
-        if stored_files['files'][i]['name'] == test_suite_data.apk_name:
-            return True
-
-
 def pytest_configure(config):
     tests.pytest_config_global = vars(config.option)
     config.addinivalue_line("markers", "testrail_id(name): empty")
+    config.addinivalue_line("markers", "account_snapshots: collected only with --account_snapshots_number")
     if config.getoption('log_steps'):
         import logging
         logging.basicConfig(level=logging.INFO)
@@ -172,23 +209,53 @@ def pytest_configure(config):
                 pull.get_commits()[0].create_status(state='pending', context='Mobile e2e tests',
                                                     description='e2e tests are running')
             if config.getoption('env') == 'sauce':
-                if not is_uploaded():
-                    if 'http' in config.getoption('apk'):
-                        response = requests.get(config.getoption('apk'), stream=True)
-                        response.raise_for_status()
-                        file = BytesIO(response.content)
-                        del response
-                        requests.post('http://saucelabs.com/rest/v1/storage/'
-                                      + sauce_username + '/' + test_suite_data.apk_name + '?overwrite=true',
-                                      auth=(sauce_username, sauce_access_key),
-                                      data=file,
-                                      headers={'Content-Type': 'application/octet-stream'})
-                    else:
-                        sauce.storage.upload_file(config.getoption('apk'))
+                storage = SauceApkStorage(sauce, sauce_username, sauce_access_key,
+                                          ApkCache(config.getoption('apk_cache')))
+                storage.ensure_uploaded(config.getoption('apk'), test_suite_data.apk_name)
+
+
+def pytest_collection(session):
+    if is_master(session.config):
+        locators = tests.translation_locators
+        if locators.missing:
+            warnings.warn(pytest.PytestWarning(
+                'Translation ids are not in translations/en.json: %s' % ', '.join(locators.missing)))
+        if locators.changed:
+            warnings.warn(pytest.PytestWarning(
+                'Texts of translation ids are changed since the previous run: %s' % ', '.join(sorted(locators.changed))))
+
+
+def pytest_generate_tests(metafunc):
+    if metafunc.definition.get_closest_marker('account_snapshots'):
+        metafunc.parametrize('number', range(int(metafunc.config.getoption('account_snapshots_number'))))
+
+
+def pytest_collection_modifyitems(config, items):
+    # account snapshots are prepared on demand only, so they are not reported as skipped with empty parameter set
+    if not int(config.getoption('account_snapshots_number')):
+        deselected = [item for item in items if item.get_closest_marker('account_snapshots')]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item not in deselected]
+
+
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption('dist') == 'loadgroup':
+        from support.xdist_scheduler import DurationScheduling, TestDurations
+        return DurationScheduling(config, log, durations=TestDurations(config.getoption('test_durations')).load(),
+                                  max_devices=int(config.getoption('max_devices')),
+                                  standby=int(config.getoption('standby_sessions')))
 
 
 def pytest_unconfigure(config):
+    base_test_case = sys.modules.get('tests.base_test_case')
+    if base_test_case and base_test_case.session_pool:
+        worker = 'master' if is_master(config) else config.workerinput['workerid']
+        github_report.save_stats('session_pool_%s' % worker, base_test_case.session_pool.close(worker))
     if is_master(config):
+        if config.getoption('env') != 'api':
+            from support.xdist_scheduler import TestDurations
+            TestDurations(config.getoption('test_durations')).update(github_report.get_all_tests())
         if config.getoption('testrail_report'):
             testrail_report.add_results()
         if config.getoption('pr_number'):
@@ -216,9 +283,14 @@ def should_save_device_stats(config):
 def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
+    current_test = test_suite_data.current_test
+    if report.when in ('setup', 'call') and current_test and current_test.name == item.name:
+        # setup includes drivers creation and class setup, so the first test of a class bears it
+        current_test.testruns[-1].duration += report.duration
+    if report.when in ('setup', 'call') and report.failed:
+        set_rerun_category(item, report)
     if report.when == 'call':
         is_sauce_env = item.config.getoption('env') == 'sauce'
-        current_test = test_suite_data.current_test
         if report.failed:
             error = report.longreprtext
             exception = re.findall('E.*Message:|E.*Error:|E.*Failed:', error)
@@ -277,16 +349,77 @@ def pytest_runtest_setup(item):
     test_suite_data.current_test.create_new_testrun()
 
 
+deferred_reruns = list()  # (item, attempt number, reports of the failed attempt)
+rerun_attempts = dict()  # node id: number of the running attempt
+rerun_categories = dict()  # node id: why the running attempt is going to be rerun
+rerun_budget = None
+
+
+def get_rerun_budget(config):
+    global rerun_budget
+    if rerun_budget is None:
+        rerun_budget = RerunBudget(os.path.join(github_report.TEST_REPORT_DIR, 'reruns' + github_report.STATS_SUFFIX),
+                                   seconds=float(config.getoption('rerun_budget')),
+                                   limits=RerunBudget.parse_limits(config.getoption('rerun_limits')))
+    return rerun_budget
+
+
+def get_rerun_category(item, report, estimate):
+    attempt = rerun_attempts.get(item.nodeid)
+    if not attempt or attempt >= int(item.config.getoption('rerun_count')) \
+            or any(item.iter_markers(name='xdist_group')):
+        return None
+    category = classify_error(report.longreprtext)
+    if category and get_rerun_budget(item.config).take(category, estimate):
+        return category
+
+
+def set_rerun_category(item, report):
+    """Decided when setup or call fails, so `rerun_reason` is saved with the test by teardown"""
+    if item.nodeid in rerun_categories or item.nodeid not in rerun_attempts:
+        return
+    current_test = test_suite_data.current_test
+    category = get_rerun_category(item, report, current_test.testruns[-1].duration if current_test else report.duration)
+    if category:
+        rerun_categories[item.nodeid] = category
+        if current_test and current_test.name == item.name:
+            current_test.testruns[-1].rerun_reason = category
+
+
+def log_reports(item, reports):
+    for report in reports:
+        item.ihook.pytest_runtest_logreport(report=report)
+
+
+def run_test(item, nextitem, attempt):
+    rerun_attempts[item.nodeid] = attempt
+    reports = runtestprotocol(item, nextitem=nextitem, log=False)
+    if not rerun_categories.pop(item.nodeid, None):
+        log_reports(item, reports)
+    elif is_master(item.config):
+        # failed attempt is not reported, the test is run again after all other tests
+        deferred_reruns.append((item, attempt + 1, reports))
+    else:
+        # xdist worker accepts reports only of the test it runs, so the test is run again right away
+        run_test(item, nextitem, attempt + 1)
+
+
 def pytest_runtest_protocol(item, nextitem):
-    rerun_count = int(item.config.getoption('rerun_count'))
-    for i in range(rerun_count):
-        reports = runtestprotocol(item, nextitem=nextitem)
-        for report in reports:
-            is_in_group = [i for i in item.iter_markers(name='xdist_group')]
-            if report.failed and should_rerun_test(report.longreprtext) and not is_in_group:
-                break  # rerun
-        else:
-            return True  # no need to rerun
+    if int(item.config.getoption('rerun_count')):
+        run_test(item, nextitem, attempt=1)
+        return True
+
+
+@pytest.mark.hookwrapper
+def pytest_runtestloop(session):
+    outcome = yield
+    while deferred_reruns and not (outcome.excinfo or session.shouldfail or session.shouldstop):
+        item, attempt, _ = deferred_reruns.pop(0)
+        run_test(item, None, attempt)
+    # reruns which are dropped because the session is stopped are reported by their last failed attempt
+    while deferred_reruns:
+        item, _, reports = deferred_reruns.pop(0)
+        log_reports(item, reports)
 
 
 @pytest.fixture(scope="session", autouse=False)
@@ -11,3 +11,4 @@ flaky = pytest.mark.flaky
 transaction = pytest.mark.transaction
 upgrade = pytest.mark.upgrade
 skip = pytest.mark.skip
+account_snapshots = pytest.mark.account_snapshots
@@ -0,0 +1,12 @@
+from tests import marks
+from tests.base_test_case import SingleDeviceTestCase
+from views.sign_in_view import SignInView
+
+
+@marks.account_snapshots
+class TestAccountSnapshots(SingleDeviceTestCase):
+
+    def test_prepare_account_snapshot(self, number):
+        sign_in = SignInView(self.driver)
+        sign_in.create_user(from_snapshot=False)
+        sign_in.save_account_snapshot()
@@ -0,0 +1,25 @@
+from tests.base_test_case import FakeDeviceTestCase
+from views.chat_view import ChatView
+from views.sign_in_view import SignInView
+
+
+class TestCreateUserBenchmark(FakeDeviceTestCase):
+    scenario = 'create_user'
+
+    def test_benchmark_create_user(self):
+        sign_in = SignInView(self.driver)
+        self.benchmark(lambda: sign_in.create_user(from_snapshot=False))
+        if not sign_in.profile_button.is_element_displayed():
+            self.errors.append('Home view is not shown after onboarding')
+        self.errors.verify_no_errors()
+
+
+class TestSendMessageBenchmark(FakeDeviceTestCase):
+    scenario = 'send_message'
+
+    def test_benchmark_send_message(self):
+        chat = ChatView(self.driver)
+        self.benchmark(lambda: chat.send_message('benchmark message'))
+        if chat.chat_message_input.text != 'benchmark message':
+            self.errors.append('Message is not typed in chat input')
+        self.errors.verify_no_errors()
@@ -0,0 +1,50 @@
+import os
+import random
+
+import imagehash
+from PIL import Image, ImageChops, ImageStat
+
+from support import image_templates
+from tests.base_test_case import NoDeviceTestCase, Errors
+
+
+def changed_copy(image: Image.Image, seed):
+    """Copy of the image with some random pixels changed, in alpha channel too"""
+    image, generator = image.copy(), random.Random(seed)
+    for _ in range(generator.randint(1, 50)):
+        position = generator.randrange(image.width), generator.randrange(image.height)
+        image.putpixel(position, tuple(generator.randrange(256) for _ in image.getbands()))
+    return image
+
+
+class TestImageTemplates(NoDeviceTestCase):
+    """Template checks on numpy give the same results as PIL comparisons they replaced"""
+
+    def setup_method(self, method, **kwargs):
+        self.errors = Errors()
+
+    @staticmethod
+    def pil_results(image, template_image):
+        difference = ImageChops.difference(image, template_image)
+        stat = ImageStat.Stat(difference)
+        return (not difference.getbbox(), sum(stat.mean) / (len(stat.mean) * 255),
+                not bool(imagehash.average_hash(template_image) - imagehash.average_hash(image)))
+
+    def test_image_templates_match_pil_comparisons(self):
+        names = sorted(os.listdir(image_templates.TEMPLATES_DIR))
+        for number, name in enumerate(names):
+            template = image_templates.templates.get(name)
+            other = image_templates.templates.get(names[number - 1])
+            images = [template.image.copy(), changed_copy(template.image, number)]
+            if other.image.mode == template.image.mode:
+                images.append(other.image.copy())
+            for image in images:
+                equal, ratio, similar = self.pil_results(image, template.image)
+                if image_templates.is_equal(image, template) != equal:
+                    self.errors.append('%s: is_equal is not %s' % (name, equal))
+                if abs(image_templates.difference_ratio(image, template) - ratio) > 1e-9:
+                    self.errors.append('%s: difference_ratio is %s instead of %s' % (
+                        name, image_templates.difference_ratio(image, template), ratio))
+                if image_templates.is_similar(image, template) != similar:
+                    self.errors.append('%s: is_similar is not %s' % (name, similar))
+        self.errors.verify_no_errors()
@@ -0,0 +1,42 @@
+import os
+import re
+import subprocess
+import sys
+
+from tests.base_test_case import NoDeviceTestCase, Errors
+
+APPIUM_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHAIN_PACKAGES = ('web3', 'eth_utils', 'eth_account', 'eth_keys', 'eth_abi')
+
+
+class TestImportTime(NoDeviceTestCase):
+    """Chain layer is imported on collection of every worker, so web3 should be loaded only by the first chain call"""
+    # cumulative import time in seconds, measured with `python -X importtime`
+    budget = {'support.api.web3_api': 0.05, 'support.api.network_api': 1.0}
+
+    def setup_method(self, method, **kwargs):
+        self.errors = Errors()
+
+    @staticmethod
+    def import_times(statement):
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=APPIUM_ROOT,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True,
+                                 check=True)
+        times = dict()
+        for line in process.stderr.splitlines():
+            match = re.match(r'import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)', line)
+            if match:
+                times[match.group(2)] = int(match.group(1)) / 10 ** 6
+        return times
+
+    def test_import_time_of_chain_layer(self):
+        times = self.import_times('from support.api.network_api import NetworkApi; NetworkApi()')
+        chain_modules = [module for module in times if module.split('.')[0] in CHAIN_PACKAGES]
+        if chain_modules:
+            self.errors.append('web3 is imported without chain calls: %s' % ', '.join(chain_modules[:5]))
+        for module, budget in self.budget.items():
+            if module not in times:
+                self.errors.append('%s is not imported' % module)
+            elif times[module] > budget:
+                self.errors.append('Import of %s takes %.3fs, budget is %ss' % (module, times[module], budget))
+        self.errors.verify_no_errors()
@@ -0,0 +1,56 @@
+import time
+
+from support.command_tracer import is_untraced
+from support.logcat import LogcatCollector
+from tests.base_test_case import NoDeviceTestCase, Errors
+
+
+class FakeLogDriver(object):
+
+    def __init__(self, messages):
+        self.entries = [{'timestamp': number, 'message': message} for number, message in enumerate(messages)]
+
+    def get_log(self, log_type):
+        entries, self.entries = self.entries, list()
+        return entries
+
+
+class TestLogcatCollector(NoDeviceTestCase):
+
+    def setup_method(self, method, **kwargs):
+        self.errors = Errors()
+
+    def test_logcat_find_nested_values(self):
+        logcat = LogcatCollector(FakeLogDriver(['I/ReactNativeJS: signing with abc def-123 now',
+                                                'D/Status: password qwerty is hidden',
+                                                'I/ReactNativeJS: abcdef is not a value']))
+        logcat.pull()
+        found = logcat.find_values(['abc def-123', 'def-123', 'abc', 'qwerty', 'abcd'], exclude=('hidden',))
+        if found != {'abc def-123', 'def-123', 'abc'}:
+            self.errors.append('Values found in logcat: %s' % found)
+        self.errors.verify_no_errors()
+
+    def test_logcat_find_event_by_keyword_prefix(self):
+        logcat = LogcatCollector(FakeLogDriver(['I/ReactNativeJS: [:wallet/send-done {:tx 1}]',
+                                                'I/ReactNativeJS: [:wallet/send {:tx 2}]',
+                                                'I/ReactNativeJS: no event wallet/send']))
+        logcat.pull()
+        for event, expected in (':wallet/send', 2), (':wallet/send-done', 1), (':wallet', 2), ('wallet/send', 3):
+            if len(logcat.find(event)) != expected:
+                self.errors.append('%s is found in %s entries instead of %s' % (event, len(logcat.find(event)),
+                                                                                 expected))
+        self.errors.verify_no_errors()
+
+    def test_logcat_background_pulls_are_untraced(self):
+        driver = FakeLogDriver(['I/ReactNativeJS: message'])
+        driver.untraced = list()
+        get_log = driver.get_log
+        driver.get_log = lambda log_type: driver.untraced.append(is_untraced()) or get_log(log_type)
+        logcat = LogcatCollector(driver, interval=0.01)
+        time.sleep(0.2)
+        logcat.stop()
+        if not driver.untraced or not all(driver.untraced) or is_untraced():
+            self.errors.append('Background pulls are traced: %s' % driver.untraced)
+        if len(logcat) != 1:
+            self.errors.append('%s entries are pulled in background instead of 1' % len(logcat))
+        self.errors.verify_no_errors()
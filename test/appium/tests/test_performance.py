@@ -11,11 +11,12 @@ class TestPerformance(SingleDeviceTestCase):
         # earlier event will be overwritten by latest in case of multiple events in a logcat!
 
         timestamps_by_event = dict()
-        logcat = self.driver.get_log('logcat')
+        logcat = self.driver.logcat_collector
+        logcat.pull()
         for event in args:
-            for line in logcat:
-                if event in line['message']:
-                    timestamps_by_event[event] = line['timestamp']
+            entry = logcat.last(event)
+            if entry:
+                timestamps_by_event[event] = entry[0]
         return timestamps_by_event
 
     @marks.testrail_id(6216)
@@ -0,0 +1,55 @@
+import os
+import tempfile
+
+from support.fake_testrail import FakeTestRailServer
+from support.test_data import SingleTestData
+from support.testrail_report import TestrailReport
+from tests.base_test_case import NoDeviceTestCase, Errors
+
+
+class TestTestrailReportUpload(NoDeviceTestCase):
+    """Upload of results to local TestRail stand-in: round-trips shouldn't grow with number of tests"""
+
+    def setup_method(self, method, **kwargs):
+        self.errors = Errors()
+        self.cases = list(range(1, 301))
+        self.server = FakeTestRailServer(self.cases).start()
+        self.report = TestrailReport()
+        self.report.url, self.report.api_url = self.server.url, self.server.url + 'api/v2/'
+        self.geth = tempfile.NamedTemporaryFile(suffix='_geth.log', delete=False)
+        self.geth.write(b'geth log')
+        self.geth.close()
+
+    def teardown_method(self, method):
+        self.server.stop()
+        os.remove(self.geth.name)
+        super().teardown_method(method)
+
+    def get_tests(self):
+        tests = list()
+        for case_id in self.cases:
+            test = SingleTestData('test_%s' % case_id, list(), case_id, {'geth.log': self.geth.name})
+            test.create_new_testrun()
+            test.testruns[-1].steps.append('Device 1: step of case %s' % case_id)
+            test.testruns[-1].error = 'failed' if case_id % 10 == 0 else None
+            tests.append(test)
+        return tests
+
+    def test_testrail_bulk_upload(self):
+        self.report.run_id = self.report.post('add_run/%s' % self.report.project_id, {'case_ids': self.cases})['id']
+        tests = self.get_tests()
+        self.report.add_results(tests)
+        if len(self.server.results) != len(tests):
+            self.errors.append('%s results are uploaded instead of %s' % (len(self.server.results), len(tests)))
+        if self.server.requests['add_results_for_cases'] != 2:
+            self.errors.append('Results are uploaded in %s requests' % self.server.requests['add_results_for_cases'])
+        failed = [result['id'] for result in self.server.results if result['status_id'] != 1]
+        if sorted(result_id for result_id, _ in self.server.attachments) != failed:
+            self.errors.append('Geth logs are not attached to failed results only')
+
+        links = [self.report.get_test_result_link(self.report.run_id, case_id) for case_id in self.cases]
+        if not all(links) or len(set(links)) != len(self.cases):
+            self.errors.append('Links to results are not built for all tests')
+        if self.server.requests['get_tests'] != 2:  # two pages
+            self.errors.append('Tests of run are fetched in %s requests' % self.server.requests['get_tests'])
+        self.errors.verify_no_errors()
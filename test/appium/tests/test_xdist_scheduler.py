@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from support.xdist_scheduler import DurationScheduling
+from tests.base_test_case import NoDeviceTestCase, Errors
+
+APPIUM_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFTEST = '''
+import json
+import sys
+sys.path.insert(0, %r)
+from support.xdist_scheduler import DurationScheduling
+
+
+def pytest_xdist_make_scheduler(config, log):
+    with open('durations.json') as file:
+        durations = json.load(file)
+    return DurationScheduling(config, log, durations=durations, max_devices=%s, standby=%s)
+'''
+
+GROUP = '''
+import time
+import pytest
+
+
+@pytest.mark.xdist_group(name='group_%(group)s')
+class TestGroup%(group)s(object):
+
+    def test_first_%(group)s(self):
+        time.sleep(0.1)
+
+    def test_second_%(group)s(self):
+        time.sleep(0.1)
+'''
+
+
+class TestDurationScheduling(NoDeviceTestCase):
+    """Runs real xdist session with more groups than workers through DurationScheduling"""
+    groups = 5
+    workers = 2
+
+    def setup_method(self, method, **kwargs):
+        self.errors = Errors()
+        self.directory = tempfile.mkdtemp()
+        with open(os.path.join(self.directory, 'pytest.ini'), 'w') as file:
+            file.write('[pytest]\n')
+        # the 3rd group needs both devices, so it can't run together with other groups
+        durations = dict(('test_first_%s' % group, {'duration': 10 + group, 'devices': 2 if group == 3 else 1})
+                         for group in range(self.groups))
+        with open(os.path.join(self.directory, 'durations.json'), 'w') as file:
+            json.dump(durations, file)
+        for group in range(self.groups):
+            with open(os.path.join(self.directory, 'test_group_%s.py' % group), 'w') as file:
+                file.write(GROUP % {'group': group})
+
+    def teardown_method(self, method):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        super().teardown_method(method)
+
+    def run_session(self, max_devices, standby):
+        with open(os.path.join(self.directory, 'conftest.py'), 'w') as file:
+            file.write(CONFTEST % (APPIUM_ROOT, max_devices, standby))
+        env = dict(os.environ, PYTEST_DISABLE_PLUGIN_AUTOLOAD='1')
+        try:
+            return subprocess.run(
+                [sys.executable, '-m', 'pytest', '-p', 'xdist', '-p', 'no:cacheprovider', '-q', '-n', str(self.workers),
+                 '--dist', 'loadgroup', '-c', 'pytest.ini', '--rootdir', '.'],
+                cwd=self.directory, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                universal_newlines=True, timeout=120)
+        except subprocess.TimeoutExpired:
+            return None
+
+    def test_duration_scheduling_runs_all_groups(self):
+        for max_devices, standby in (0, 0), (2, 0), (3, 1):
+            process = self.run_session(max_devices, standby)
+            if process is None:
+                self.errors.append('xdist session with max_devices=%s, standby=%s hangs' % (max_devices, standby))
+            elif '%s passed' % (self.groups * 2) not in process.stdout:
+                self.errors.append('Not all tests passed with max_devices=%s, standby=%s:\n%s' % (
+                    max_devices, standby, process.stdout))
+        self.errors.verify_no_errors()
+
+    def test_last_pending_test_holds_devices(self):
+        # worker keeps the last test of a unit until it gets more work, so the class with its drivers stays open
+        scheduling = DurationScheduling.__new__(DurationScheduling)
+        scheduling.durations, scheduling.unknown_duration = {'test_first_0': {'duration': 10, 'devices': 2}}, 10
+        waiting, running, idle = object(), object(), object()
+        scheduling.assigned_work = {
+            waiting: {'group_0': {'test_group_0.py::TestGroup0::test_first_0': True,
+                                  'test_group_0.py::TestGroup0::test_second_0': False}},
+            running: {'group_1': {'test_group_1.py::TestGroup1::test_first_1': False,
+                                  'test_group_1.py::TestGroup1::test_second_1': False}},
+            idle: dict()}
+        if scheduling.devices_in_use(exclude=idle) != 2 + 1:
+            self.errors.append('Devices in use: %s instead of 3' % scheduling.devices_in_use(exclude=idle))
+        if not scheduling.is_running(exclude=idle) or scheduling.is_running(exclude=running):
+            self.errors.append('Node with one pending test is counted as running')
+        self.errors.verify_no_errors()
@@ -1,15 +1,13 @@
-from views.base_element import EditBox
+from views.base_element import EditBox, ViewElement
 from views.base_view import BaseView
 
 
 class AddCustomTokenView(BaseView):
-    def __init__(self, driver):
-        super().__init__(driver)
-        self.contract_address_input = EditBox(self.driver, translation_id="contract-address",
-                                              suffix="/following-sibling::*[2]/android.widget.EditText")
-        self.name_input = EditBox(self.driver, translation_id="name",
-                                  suffix="/following-sibling::*[1]/android.widget.EditText")
-        self.symbol_input = EditBox(self.driver, translation_id="symbol",
-                                    suffix="/following-sibling::*[2]/android.widget.EditText")
-        self.decimals_input = EditBox(self.driver, translation_id="decimals",
-                                      suffix="/following-sibling::*[2]/android.widget.EditText")
+    contract_address_input = ViewElement(EditBox, translation_id="contract-address",
+                                         suffix="/following-sibling::*[2]/android.widget.EditText")
+    name_input = ViewElement(EditBox, translation_id="name",
+                             suffix="/following-sibling::*[1]/android.widget.EditText")
+    symbol_input = ViewElement(EditBox, translation_id="symbol",
+                               suffix="/following-sibling::*[2]/android.widget.EditText")
+    decimals_input = ViewElement(EditBox, translation_id="decimals",
+                                 suffix="/following-sibling::*[2]/android.widget.EditText")
@@ -5,18 +5,22 @@ import time
 import emoji
 from timeit import timeit
 
-from PIL import Image, ImageChops, ImageStat
+from PIL import Image
 from appium.webdriver.common.mobileby import MobileBy
 from appium.webdriver.common.touch_action import TouchAction
 from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions
-import imagehash
-from tests import transl
+from support import image_templates
+from support.waits import BackoffWait
+from tests import transl, translation_locators
 
 
 class BaseElement(object):
+    # locators by (translation id, uppercase), shared by all elements of all views; the memo is bounded by number
+    # of translations, dynamic parts (prefix, suffix, xpath of message text...) are added to locators per element
+    locators = dict()
+
     def __init__(self, driver, **kwargs):
         self.driver = driver
         self.by = MobileBy.XPATH
@@ -36,32 +40,41 @@ class BaseElement(object):
         self.set_locator()
 
     def set_locator(self):
+        self.by, self.locator = self.build_locator()
+        return self
+
+    @staticmethod
+    def translation_locator(translation_id, uppercase=False):
+        key = (translation_id, uppercase)
+        if key not in BaseElement.locators:
+            BaseElement.locators[key] = translation_locators.locator(translation_id, uppercase)
+        return BaseElement.locators[key]
+
+    def build_locator(self):
+        by, locator = self.by, self.locator
         if self.xpath:
-            self.locator = self.xpath
+            locator = self.xpath
         elif self.accessibility_id:
-            self.by = MobileBy.ACCESSIBILITY_ID
-            self.locator = self.accessibility_id
+            by = MobileBy.ACCESSIBILITY_ID
+            locator = self.accessibility_id
         elif self.translation_id:
-            text = transl[self.translation_id]
-            self.locator = '//*[@text="%s"]' % text
-            if self.uppercase:
-                self.locator = '//*[@text="%s" or @text="%s"]' % (text, text.upper())
+            locator = self.translation_locator(self.translation_id, self.uppercase)
             if self.suffix:
-                self.locator += self.suffix
+                locator += self.suffix
         elif self.id:
-            self.by = MobileBy.ID
-            self.locator = self.id
+            by = MobileBy.ID
+            locator = self.id
         elif self.class_name:
-            self.by = MobileBy.CLASS_NAME
-            self.locator = self.class_name
+            by = MobileBy.CLASS_NAME
+            locator = self.class_name
         elif self.AndroidUIAutomator:
-            self.by = MobileBy.ANDROID_UIAUTOMATOR
-            self.locator = self.AndroidUIAutomator
+            by = MobileBy.ANDROID_UIAUTOMATOR
+            locator = self.AndroidUIAutomator
         elif self.webview:
-            self.locator = '//*[@text="{0}"] | //*[@content-desc="{desc}"]'.format(self.webview, desc=self.webview)
+            locator = '//*[@text="{0}"] | //*[@content-desc="{desc}"]'.format(self.webview, desc=self.webview)
         if self.prefix:
-            self.locator = self.prefix + self.locator
-        return self
+            locator = self.prefix + locator
+        return by, locator
 
     @property
     def name(self):
@@ -109,10 +122,17 @@ class BaseElement(object):
         self.driver.info('Double tap on: %s' % self.name)
         [self.find_element().click() for _ in range(2)]
 
+    def wait_until(self, condition, seconds=10, ignored_exceptions=None):
+        wait = BackoffWait(self.driver, seconds, ignored_exceptions=ignored_exceptions)
+        commands_before = self.driver.command_count
+        try:
+            return wait.until(condition((self.by, self.locator)))
+        finally:
+            self.driver.record_wait(self.name, condition.__name__, seconds, self.driver.command_count - commands_before)
+
     def wait_for_element(self, seconds=10):
         try:
-            return WebDriverWait(self.driver, seconds) \
-                .until(expected_conditions.presence_of_element_located((self.by, self.locator)))
+            return self.wait_until(expected_conditions.presence_of_element_located, seconds)
         except TimeoutException:
             raise TimeoutException(
                 "Device %s: %s by %s: `%s` is not found on the screen" % (
@@ -120,8 +140,7 @@ class BaseElement(object):
 
     def wait_for_elements(self, seconds=10):
         try:
-            return WebDriverWait(self.driver, seconds) \
-                .until(expected_conditions.presence_of_all_elements_located((self.by, self.locator)))
+            return self.wait_until(expected_conditions.presence_of_all_elements_located, seconds)
         except TimeoutException:
             raise TimeoutException(
                 "Device %s:  %s by %s:`%s` is not found on the screen" % (
@@ -129,8 +148,7 @@ class BaseElement(object):
 
     def wait_for_visibility_of_element(self, seconds=10, ignored_exceptions=None):
         try:
-            return WebDriverWait(self.driver, seconds, ignored_exceptions=ignored_exceptions) \
-                .until(expected_conditions.visibility_of_element_located((self.by, self.locator)))
+            return self.wait_until(expected_conditions.visibility_of_element_located, seconds, ignored_exceptions)
         except TimeoutException:
             raise TimeoutException(
                 "Device %s: %s by %s:`%s` is not found on the screen" % (
@@ -138,8 +156,7 @@ class BaseElement(object):
 
     def wait_for_invisibility_of_element(self, seconds=10):
         try:
-            return WebDriverWait(self.driver, seconds) \
-                .until(expected_conditions.invisibility_of_element_located((self.by, self.locator)))
+            return self.wait_until(expected_conditions.invisibility_of_element_located, seconds)
         except TimeoutException:
             raise TimeoutException("Device %s: %s by %s:* `%s`  is still visible on the screen after %s seconds" % (
                 self.driver.number, self.name, self.by, self.locator, seconds)) from None
@@ -179,12 +196,16 @@ class BaseElement(object):
         self.click()
 
     def is_element_present(self, sec=5):
+        if self.driver.page_source_snapshot.is_present(self.by, self.locator):
+            return True
         try:
             return self.wait_for_element(sec)
         except TimeoutException:
             return False
 
     def is_element_displayed(self, sec=5, ignored_exceptions=None):
+        if self.driver.page_source_snapshot.is_displayed(self.by, self.locator):
+            return True
         try:
             return self.wait_for_visibility_of_element(sec, ignored_exceptions=ignored_exceptions)
         except TimeoutException:
@@ -198,22 +219,37 @@ class BaseElement(object):
 
     @property
     def text(self):
-        return self.find_element().text
+        return self.snapshot_text or self.find_element().text
+
+    @property
+    def snapshot_text(self):
+        return self.driver.page_source_snapshot.text(self.by, self.locator)
 
     @property
     def template(self):
-        try:
-            return self.__template
-        except FileNotFoundError:
-            raise FileNotFoundError('Please add %s image as template' % self.name)
+        return self.get_template().image
 
     @template.setter
     def template(self, value):
-        self.__template = Image.open(os.sep.join(__file__.split(os.sep)[:-1]) + '/elements_templates/%s' % value)
+        self.__template = image_templates.templates.get(value)
+
+    def get_template(self, file_name: str = ''):
+        if file_name:
+            self.template = file_name
+        try:
+            return self.__template
+        except AttributeError:
+            raise FileNotFoundError('Please add %s image as template' % self.name)
 
     @property
     def image(self):
-        return Image.open(BytesIO(base64.b64decode(self.find_element().screenshot_as_base64)))
+        """
+        Element screenshot, or element cut from the screenshot cached by the driver inside page source snapshot,
+        so several checks of the same screen take one screenshot
+        """
+        if not self.driver.page_source_snapshot.enabled:
+            return Image.open(BytesIO(base64.b64decode(self.find_element().screenshot_as_base64)))
+        return self.driver.screen_capture.element_image(self.by, self.locator, self.find_element)
 
     def attribute_value(self, value):
         attribute_value = self.find_element().get_attribute(value)
@@ -232,27 +268,15 @@ class BaseElement(object):
         screen.save(full_path_to_file)
 
     def is_element_image_equals_template(self, file_name: str = ''):
-        if file_name:
-            self.template = file_name
-        return not ImageChops.difference(self.image, self.template).getbbox()
+        return image_templates.is_equal(self.image, self.get_template(file_name))
 
     def is_element_differs_from_template(self, file_name: str = '', diff: int = 0):
-        if file_name:
-            self.template = file_name
-        result = False
-        difference = ImageChops.difference(self.image, self.template)
-        stat = ImageStat.Stat(difference)
-        diff_ratio = sum(stat.mean) / (len(stat.mean) * 255)
+        diff_ratio = image_templates.difference_ratio(self.image, self.get_template(file_name))
         self.driver.info('Image differs from template to %s percents' % str(diff_ratio * 100))
-        if diff_ratio * 100 > diff:
-            result = True
-        return result
+        return diff_ratio * 100 > diff
 
     def is_element_image_similar_to_template(self, template_path: str = ''):
-        image_template = os.sep.join(__file__.split(os.sep)[:-1]) + '/elements_templates/%s' % template_path
-        template = imagehash.average_hash(Image.open(image_template))
-        element_image = imagehash.average_hash(self.image)
-        return not bool(template - element_image)
+        return image_templates.is_similar(self.image, self.get_template(template_path))
 
     def swipe_left_on_element(self):
         element = self.find_element()
@@ -302,6 +326,29 @@ class BaseElement(object):
         return 'emoji' if value in emoji.UNICODE_EMOJI else value
 
 
+class ViewElement(object):
+    """
+    Element declared on a view class: it is built on the first access and cached in the view instance,
+    so creating a view doesn't build all its elements
+    """
+
+    def __init__(self, element_class, *args, **kwargs):
+        self.element_class = element_class
+        self.args = args
+        self.kwargs = kwargs
+        self.attribute_name = None
+
+    def __set_name__(self, owner, name):
+        self.attribute_name = name
+
+    def __get__(self, view, owner):
+        if view is None:
+            return self
+        element = self.element_class(view.driver, *self.args, **self.kwargs)
+        view.__dict__[self.attribute_name] = element
+        return element
+
+
 class EditBox(BaseElement):
 
     def __init__(self, driver, **kwargs):
@@ -351,7 +398,7 @@ class Text(BaseElement):
 
     @property
     def text(self):
-        text = self.find_element().text
+        text = self.snapshot_text or self.find_element().text
         self.driver.info("'%s' is '%s'" % (self.name, text))
         return text
 
@@ -398,7 +445,7 @@ class SilentButton(Button):
 
     @property
     def text(self):
-        text = self.find_element().text
+        text = self.snapshot_text or self.find_element().text
         return text
 
 
@@ -1,18 +1,15 @@
 import time
 
-import base64
 import random
-import re
 import string
 from PIL import Image
 from appium.webdriver.common.touch_action import TouchAction
 from datetime import datetime
-from io import BytesIO
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
 from support.device_apps import start_web_browser
 from tests import common_password, pytest_config_global, transl
-from views.base_element import Button, BaseElement, EditBox, Text, CheckBox
+from views.base_element import Button, BaseElement, EditBox, Text, CheckBox, ViewElement
 
 
 class BackButton(Button):
@@ -222,66 +219,67 @@ class SignInPhraseText(Text):
 
 
 class BaseView(object):
+    send_message_button = ViewElement(SendMessageButton)
+
+    # Tabs
+    home_button = ViewElement(HomeButton)
+    wallet_button = ViewElement(WalletButton)
+    profile_button = ViewElement(ProfileButton)
+    dapp_tab_button = ViewElement(DappTabButton)
+    status_button = ViewElement(StatusButton)
+
+    yes_button = ViewElement(Button, xpath="//*[@text='YES' or @text='GOT IT']")
+    no_button = ViewElement(Button, translation_id="no")
+    back_button = ViewElement(BackButton)
+    allow_button = ViewElement(AllowButton)
+    allow_all_the_time = ViewElement(Button, xpath="//*[@text='Allow all the time']")
+    deny_button = ViewElement(Button, translation_id="deny", uppercase=True)
+    continue_button = ViewElement(Button, translation_id="continue", uppercase=True)
+    ok_button = ViewElement(Button, xpath="//*[@text='OK' or @text='Ok']")
+    next_button = ViewElement(Button, translation_id="next")
+    add_button = ViewElement(Button, translation_id="add")
+    save_button = ViewElement(Button, translation_id="save")
+    done_button = ViewElement(Button, translation_id="done")
+    delete_button = ViewElement(Button, translation_id="delete", uppercase=True)
+    ok_continue_button = ViewElement(Button, xpath="//*[@text='OK, CONTINUE' or @text='Okay, continue']")
+    discard_button = ViewElement(Button, xpath="//*[@text='DISCARD']")
+    confirm_button = ViewElement(Button, translation_id='confirm', uppercase=True)
+
+    cross_icon = ViewElement(Button, xpath="(//android.widget.ImageView[@content-desc='icon'])[1]")
+    close_sticker_view_icon = ViewElement(Button, xpath="//androidx.appcompat.widget.LinearLayoutCompat")
+    native_close_button = ViewElement(Button, id="android:id/aerr_close")
+    close_button = ViewElement(Button, accessibility_id="back-button")
+    show_roots_button = ViewElement(Button, accessibility_id="Show roots")
+    get_started_button = ViewElement(Button, translation_id="get-started")
+    ok_got_it_button = ViewElement(Button, translation_id="ok-got-it")
+    cross_icon_inside_welcome_screen_button = ViewElement(Button, accessibility_id='hide-home-button')
+    status_in_background_button = ViewElement(Button, xpath="//*[contains(@content-desc,'Status')]")
+    cancel_button = ViewElement(Button, translation_id="cancel", uppercase=True)
+    search_input = ViewElement(EditBox, accessibility_id="search-input")
+    share_button = ViewElement(Button, accessibility_id="share-my-contact-code-button")
+    qr_code_image = ViewElement(Button, accessibility_id="qr-code-image")
+    sign_in_phrase = ViewElement(SignInPhraseText)
+
+    # checkboxes and toggles
+    checkbox_button = ViewElement(CheckBox, accessibility_id="checkbox-off")
+
+    # external browser
+    open_in_status_button = ViewElement(OpenInStatusButton)
+
+    apps_button = ViewElement(Button, accessibility_id="Apps")
+    status_app_icon = ViewElement(Button, translation_id="status")
+    airplane_mode_button = ViewElement(AirplaneModeButton)
+    enter_qr_edit_box = ViewElement(EnterQRcodeEditBox)
+
+    element_types = {
+        'base': BaseElement,
+        'button': Button,
+        'edit_box': EditBox,
+        'text': Text
+    }
+
     def __init__(self, driver):
         self.driver = driver
-        self.send_message_button = SendMessageButton(self.driver)
-
-        # Tabs
-        self.home_button = HomeButton(self.driver)
-        self.wallet_button = WalletButton(self.driver)
-        self.profile_button = ProfileButton(self.driver)
-        self.dapp_tab_button = DappTabButton(self.driver)
-        self.status_button = StatusButton(self.driver)
-
-        self.yes_button = Button(self.driver, xpath="//*[@text='YES' or @text='GOT IT']")
-        self.no_button = Button(self.driver, translation_id="no")
-        self.back_button = BackButton(self.driver)
-        self.allow_button = AllowButton(self.driver)
-        self.allow_all_the_time = Button(self.driver, xpath="//*[@text='Allow all the time']")
-        self.deny_button = Button(self.driver, translation_id="deny", uppercase=True)
-        self.continue_button = Button(self.driver, translation_id="continue", uppercase=True)
-        self.ok_button = Button(self.driver, xpath="//*[@text='OK' or @text='Ok']")
-        self.next_button = Button(self.driver, translation_id="next")
-        self.add_button = Button(self.driver, translation_id="add")
-        self.save_button = Button(self.driver, translation_id="save")
-        self.done_button = Button(self.driver, translation_id="done")
-        self.delete_button = Button(self.driver, translation_id="delete", uppercase=True)
-        self.ok_continue_button = Button(self.driver, xpath="//*[@text='OK, CONTINUE' or @text='Okay, continue']")
-        self.discard_button = Button(self.driver, xpath="//*[@text='DISCARD']")
-        self.confirm_button = Button(self.driver, translation_id='confirm', uppercase=True)
-
-        self.cross_icon = Button(self.driver, xpath="(//android.widget.ImageView[@content-desc='icon'])[1]")
-        self.close_sticker_view_icon = Button(self.driver, xpath="//androidx.appcompat.widget.LinearLayoutCompat")
-        self.native_close_button = Button(self.driver, id="android:id/aerr_close")
-        self.close_button = Button(self.driver, accessibility_id="back-button")
-        self.show_roots_button = Button(self.driver, accessibility_id="Show roots")
-        self.get_started_button = Button(self.driver, translation_id="get-started")
-        self.ok_got_it_button = Button(self.driver, translation_id="ok-got-it")
-        self.cross_icon_inside_welcome_screen_button = Button(self.driver, accessibility_id='hide-home-button')
-        self.status_in_background_button = Button(self.driver, xpath="//*[contains(@content-desc,'Status')]")
-        self.cancel_button = Button(self.driver, translation_id="cancel", uppercase=True)
-        self.search_input = EditBox(self.driver, accessibility_id="search-input")
-        self.share_button = Button(self.driver, accessibility_id="share-my-contact-code-button")
-        self.qr_code_image = Button(self.driver, accessibility_id="qr-code-image")
-        self.sign_in_phrase = SignInPhraseText(self.driver)
-
-        # checkboxes and toggles
-        self.checkbox_button = CheckBox(self.driver, accessibility_id="checkbox-off")
-
-        # external browser
-        self.open_in_status_button = OpenInStatusButton(self.driver)
-
-        self.apps_button = Button(self.driver, accessibility_id="Apps")
-        self.status_app_icon = Button(self.driver, translation_id="status")
-        self.airplane_mode_button = AirplaneModeButton(self.driver)
-        self.enter_qr_edit_box = EnterQRcodeEditBox(self.driver)
-
-        self.element_types = {
-            'base': BaseElement,
-            'button': Button,
-            'edit_box': EditBox,
-            'text': Text
-        }
 
     @property
     def status_account_name(self):
@@ -318,11 +316,14 @@ class BaseView(object):
             self.driver.info("Closing '%s' alert..." % alert_text_part)
             self.native_close_button.click()
 
+    logcat_excluded_parts = ('appium', ':1.000000.')
+
     @property
     def logcat(self):
-        logcat = self.driver.get_log("logcat")
+        logcat = self.driver.logcat_collector
+        logcat.pull()
         if len(logcat) > 1000:
-            return str([i for i in logcat if not ('appium' in str(i).lower() or ':1.000000.' in str(i).lower())])
+            return logcat
         raise TimeoutError('Logcat is empty')
 
     def confirm(self):
@@ -580,26 +581,21 @@ class BaseView(object):
         return self.get_chat_view()
 
     def find_values_in_logcat(self, **kwargs):
-        logcat = self.logcat
+        self.driver.info("Checking in logcat for: `%s`" % '`, `'.join(kwargs.values()))
+        found_values = self.logcat.find_values(kwargs.values(), exclude=self.logcat_excluded_parts)
         items_in_logcat = list()
         for key, value in kwargs.items():
-            self.driver.info("Checking in logcat for: `%s`" % value)
-            escaped_value = re.escape(value)
-            if re.findall(r'\W%s$|\W%s\W' % (escaped_value, escaped_value), logcat):
+            if value in found_values:
                 items_in_logcat.append('%s in logcat!!!' % key.capitalize())
         return items_in_logcat
 
-    def find_values_in_geth(self, *args):
-        from tests.base_test_case import AbstractTestCase
-        b64_log = self.driver.pull_file(AbstractTestCase().geth_path)
-        file = base64.b64decode(b64_log)
-        result = False
+    def find_values_in_geth(self, *args, tail=False):
+        self.driver.info('Checking in geth for: `%s`' % '`, `'.join(args))
+        found_values = self.driver.geth_log.search(*['%s*' % value for value in args], tail=tail)
         for value in args:
-            self.driver.info('Checking in geth for: `%s`' % value)
-            if re.findall('%s*' % value, file.decode("utf-8")):
+            if '%s*' % value in found_values:
                 self.driver.info('%s was found in geth.log' % value)
-                result = True
-        return result
+        return bool(found_values)
 
     def asset_by_name(self, asset_name):
         return AssetButton(self.driver, asset_name)
@@ -1,13 +1,16 @@
+from bisect import bisect_left
 from datetime import datetime, timedelta
 import dateutil.parser
 import time
 import re
 
+from appium.webdriver.common.touch_action import TouchAction
 from selenium.common.exceptions import NoSuchElementException
 
+from support.page_source import PageSourceSnapshot
 from tests import emojis
 from time import sleep
-from views.base_element import Button, EditBox, Text, BaseElement, SilentButton
+from views.base_element import Button, EditBox, Text, BaseElement, SilentButton, ViewElement
 from views.base_view import BaseView
 from views.profile_view import ProfilePictureElement
 from views.home_view import HomeView
@@ -114,6 +117,49 @@ class ProfileBlockContactButton(Button):
         self.wait_for_element().click()
 
 
+class ChatMessageIndex(object):
+    """
+    Messages of one page source dump: texts and '<type>-message' descriptions of nodes mapped to their chat items,
+    so many messages are looked up with one dump instead of one remote XPath per message.
+    Only the first node in document order is kept for each text, as `find_element` would return.
+    Dump older than `max_age` seconds is taken again, so messages changed by other devices are not missed.
+    """
+    max_age = 2
+
+    def __init__(self, tree):
+        self.texts, self.descriptions = dict(), dict()
+        for node in tree.iter():
+            text, description = node.get('text'), node.get('content-desc')
+            if text and text not in self.texts:
+                self.texts[text] = node
+            if description and description not in self.descriptions:
+                self.descriptions[description] = node
+        self.sorted_texts = sorted(self.texts)
+        self.order = {node: position for position, node in enumerate(tree.iter())}
+
+    def find(self, prefix):
+        """First node which text starts with `prefix`"""
+        matches = list()
+        for text in self.sorted_texts[bisect_left(self.sorted_texts, prefix):]:
+            if not text.startswith(prefix):
+                break
+            matches.append(self.texts[text])
+        return min(matches, key=self.order.get) if matches else None
+
+    @staticmethod
+    def chat_item(node):
+        if node is not None:
+            for ancestor in node.iterancestors():
+                if ancestor.tag == 'android.view.ViewGroup' and ancestor.get('content-desc') == 'chat-item':
+                    return ancestor
+
+    def message(self, text):
+        """Chat item of message which text starts with `text` ('image', 'sticker' and 'audio' for media)"""
+        if text in ["image", "sticker", "audio"]:
+            return self.chat_item(self.descriptions.get('%s-message' % text))
+        return self.chat_item(self.find(text))
+
+
 class ChatElementByText(Text):
     def __init__(self, driver, text):
         self.message_text = text
@@ -131,6 +177,42 @@ class ChatElementByText(Text):
             except NoSuchElementException:
                 self.wait_for_visibility_of_element(20)
 
+    @property
+    def indexed_item(self):
+        """Chat item node from message index of the current screen, None if message is not there or snapshot is off"""
+        snapshot = self.driver.page_source_snapshot
+        if not snapshot.enabled:
+            return None
+        index = snapshot.index(ChatMessageIndex, ChatMessageIndex.max_age)
+        item = index.message(self.message_text)
+        if item is not None and item.get('displayed', 'true') == 'true':
+            return item
+
+    def is_element_present(self, sec=5):
+        return self.indexed_item is not None or super().is_element_present(sec)
+
+    def is_element_displayed(self, sec=5, ignored_exceptions=None):
+        return self.indexed_item is not None or super().is_element_displayed(sec, ignored_exceptions)
+
+    @property
+    def bounds(self):
+        """{'x', 'y', 'width', 'height'} of the message from message index, or from the device if it is not there"""
+        item = self.indexed_item
+        bounds = PageSourceSnapshot.bounds(item) if item is not None else None
+        if not bounds:
+            element = self.find_element()
+            bounds = dict(element.location, **element.size)
+        return bounds
+
+    def long_press_element(self):
+        item = self.indexed_item
+        bounds = PageSourceSnapshot.bounds(item) if item is not None else None
+        if not bounds:
+            return super().long_press_element()
+        self.driver.info("Long press on '%s'" % self.name)
+        x, y = bounds['x'] + bounds['width'] // 2, bounds['y'] + bounds['height'] // 2
+        TouchAction(self.driver).long_press(x=x, y=y).release().perform()
+
     @property
     def image_in_reply(self):
         class ImageInReply(BaseElement):
@@ -286,9 +368,7 @@ class UsernameCheckbox(Button):
 
 
 class GroupChatInfoView(BaseView):
-    def __init__(self, driver):
-        super().__init__(driver)
-        self.add_members = Button(self.driver, translation_id="add-members")
+    add_members = ViewElement(Button, translation_id="add-members")
 
     def get_username_options(self, username: str):
         return UsernameOptions(self.driver, username)
@@ -306,34 +386,35 @@ class GroupChatInfoView(BaseView):
 
 
 class CommunityView(HomeView):
+    community_create_a_channel_button = ViewElement(Button, accessibility_id="community-create-channel")
+    channel_name_edit_box = ViewElement(EditBox, translation_id="name-your-channel-placeholder")
+    community_options_button = ViewElement(Button, accessibility_id="community-menu-button")
+    community_info_button = ViewElement(Button, translation_id="community-info")
+
+    # Community info page
+    community_membership_request_value = ViewElement(Text, translation_id="members-label",
+                                                     suffix='/following-sibling::android.view.ViewGroup/android.widget.TextView')
+    members_button = ViewElement(Button, translation_id="members-label")
+    community_info_picture = ViewElement(Button, accessibility_id="chat-icon")
+    leave_community_button = ViewElement(Button, translation_id="leave-community")
+    edit_community_button = ViewElement(Button, translation_id="edit-community")
+
+    # Members
+    invite_people_button = ViewElement(Button, accessibility_id="community-invite-people")
+    membership_requests_button = ViewElement(Button, translation_id="membership-requests")
+
+    # Requesting access to community / joining community
+    request_access_button = ViewElement(Button, translation_id="request-access")
+    membership_request_pending_text = ViewElement(Text, translation_id="membership-request-pending")
+    join_button = ViewElement(Button, translation_id="join")
+    follow_button = ViewElement(Button, translation_id="follow")
+
     def __init__(self, driver):
         super().__init__(driver)
 
         # Main community page (list with channels)
         self.add_channel_button = HomeView(self.driver).plus_button
-        self.community_create_a_channel_button = Button(self.driver, accessibility_id="community-create-channel")
-        self.channel_name_edit_box = EditBox(self.driver, translation_id="name-your-channel-placeholder")
         self.channel_descripton = ChatView(self.driver).community_description_edit_box
-        self.community_options_button = Button(self.driver, accessibility_id="community-menu-button")
-        self.community_info_button = Button(self.driver, translation_id="community-info")
-
-        # Community info page
-        self.community_membership_request_value = Text(self.driver, translation_id="members-label",
-                                                       suffix='/following-sibling::android.view.ViewGroup/android.widget.TextView')
-        self.members_button = Button(self.driver, translation_id="members-label")
-        self.community_info_picture = Button(self.driver, accessibility_id="chat-icon")
-        self.leave_community_button = Button(self.driver, translation_id="leave-community")
-        self.edit_community_button = Button(self.driver, translation_id="edit-community")
-
-        # Members
-        self.invite_people_button = Button(self.driver, accessibility_id="community-invite-people")
-        self.membership_requests_button = Button(self.driver, translation_id="membership-requests")
-
-        # Requesting access to community / joining community
-        self.request_access_button = Button(self.driver, translation_id="request-access")
-        self.membership_request_pending_text = Text(self.driver, translation_id="membership-request-pending")
-        self.join_button = Button(self.driver, translation_id="join")
-        self.follow_button = Button(self.driver, translation_id="follow")
 
     def add_channel(self, name: str, description="Some new channel"):
         self.driver.info("Adding channel in community")
@@ -565,136 +646,131 @@ class UnpinMessagePopUp(BaseElement):
 
 
 class ChatView(BaseView):
+    # Start new chat
+    public_key_edit_box = ViewElement(EditBox, accessibility_id="enter-contact-code-input")
+    scan_contact_code_button = ViewElement(Button, accessibility_id="scan-contact-code-button")
+
+    # Chat header
+    user_name_text = ViewElement(Text, accessibility_id="chat-name-text")
+    add_to_contacts = ViewElement(Button, accessibility_id="add-to-contacts-button")
+    ## Options
+    chat_options = ViewElement(ChatOptionsButton)
+    delete_chat_button = ViewElement(Button, translation_id="delete-chat")
+    clear_history_button = ViewElement(Button, translation_id="clear-history")
+    reply_message_button = ViewElement(Button, translation_id="message-reply")
+    share_chat_button = ViewElement(Button, accessibility_id="share-chat-button")
+    clear_button = ViewElement(Button, translation_id="clear", uppercase=True)
+    view_profile_button = ViewElement(ViewProfileButton)
+    view_profile_by_avatar_button = ViewElement(Button, accessibility_id="member-photo")
+    user_options = ViewElement(Button, accessibility_id="options")
+    open_in_status_button = ViewElement(OpenInStatusButton)
+    close_modal_view_from_chat_button = ViewElement(Button, xpath="//androidx.appcompat.widget.LinearLayoutCompat")
+
+    # Chat input
+    chat_message_input = ViewElement(EditBox, accessibility_id="chat-message-input")
+    quote_username_in_message_input = ViewElement(EditBox,
+                                                  xpath="//android.view.ViewGroup[@content-desc='cancel-message-reply']/..//android.widget.TextView[1]")
+    cancel_reply_button = ViewElement(Button, accessibility_id="cancel-message-reply")
+    chat_item = ViewElement(Button, accessibility_id="chat-item")
+    chat_name_editbox = ViewElement(EditBox, accessibility_id="chat-name-input")
+    commands_button = ViewElement(CommandsButton)
+    send_command = ViewElement(SendCommand)
+    request_command = ViewElement(RequestCommand)
+
+    # General chat view
+    history_start_icon = ViewElement(Button, accessibility_id="history-chat")
+    unpin_message_popup = ViewElement(UnpinMessagePopUp)
+
+    # Stickers
+    show_stickers_button = ViewElement(Button, accessibility_id="show-stickers-icon")
+    get_stickers = ViewElement(Button, translation_id="get-stickers")
+    sticker_icon = ViewElement(Button, accessibility_id="sticker-icon")
+    sticker_message = ViewElement(Button, accessibility_id="sticker-message")
+
+    # Images
+    show_images_button = ViewElement(Button, accessibility_id="show-photo-icon")
+    take_photo_button = ViewElement(Button, accessibility_id="take-picture")
+    image_from_gallery_button = ViewElement(Button, accessibility_id="open-gallery")
+    first_image_from_gallery = ViewElement(Button,
+                                           xpath="//*[@content-desc='open-gallery']/following-sibling::android.view.ViewGroup[1]")
+    images_area_in_gallery = ViewElement(Button,
+                                         xpath="//*[@content-desc='open-gallery']/following-sibling::android.view.ViewGroup[1]")
+    image_message_in_chat = ViewElement(Button, accessibility_id="image-message")
+    save_image_button = ViewElement(Button, translation_id="save")
+    recent_image_in_gallery = ViewElement(Button, xpath="//*[contains(@resource-id,'thumbnail')]")
+    cancel_send_image_button = ViewElement(Button, accessibility_id="cancel-send-image")
+    view_image_options = ViewElement(Button, xpath="//*[@content-desc='icon']/android.widget.ImageView")
+    share_image_icon_button = ViewElement(Button, accessibility_id="share-button")
+    save_image_icon_button = ViewElement(Button, accessibility_id="save-button")
+    image_in_android_messenger = ViewElement(Button, accessibility_id="Image")
+
+    # Audio
+    audio_message_in_chat = ViewElement(Button, accessibility_id="audio-message")
+    audio_message_button = ViewElement(Button, accessibility_id="show-audio-message-icon")
+    record_audio_button = ViewElement(Button, accessibility_id="start-stop-audio-recording-button")
+    cancel_audio_message_button = ViewElement(Button, accessibility_id="cancel-message-button")
+    send_audio_message_button = ViewElement(Button, accessibility_id="send-message-button")
+    play_pause_audio_message_button = ViewElement(Button, accessibility_id="play-pause-audio-message-button")
+    audio_message_in_chat_timer = ViewElement(Text,
+                                              xpath="//*[@content-desc='play-pause-audio-message-button']/../..//android.widget.TextView[1]")
+    audio_message_recorded_time = ViewElement(Text, accessibility_id="audio-message-recorded-time")
+
+    # Group chats
+    group_info = ViewElement(GroupInfoButton)
+    leave_chat_button = ViewElement(Button, accessibility_id="leave-chat-button")
+    leave_button = ViewElement(Button, translation_id="leave", uppercase=True)
+    join_chat_button = ViewElement(Button, accessibility_id="join-chat-button")
+    decline_invitation_button = ViewElement(Button, translation_id="group-chat-decline-invitation")
+    remove_user_button = ViewElement(Button, accessibility_id="remove-from-chat")
+    make_admin_button = ViewElement(Button, accessibility_id="make-admin")
+    edit_group_chat_name_button = ViewElement(Button, accessibility_id="edit-button")
+    edit_group_chat_name_edit_box = ViewElement(EditBox, accessibility_id="new-chat-name")
+    done_button = ViewElement(Button, accessibility_id="done")
+    create_button = ViewElement(Button, accessibility_id="create-group-chat-button")
+    ## Group invites
+    group_invite_button = ViewElement(Button, accessibility_id="invite-chat-button")
+    group_invite_link_text = ViewElement(Text, xpath="//*[@content-desc='invitation-link']/android.widget.TextView")
+    introduce_yourself_edit_box = ViewElement(EditBox, accessibility_id="introduce-yourself-input")
+    request_membership_button = ViewElement(Button, translation_id="request-membership")
+    group_membership_request_button = ViewElement(Button, accessibility_id="invitation-requests-button")
+    accept_group_invitation_button = ViewElement(Button, accessibility_id="accept-invitation-button")
+    decline_group_invitation_button = ViewElement(Button, accessibility_id="decline-invitation-button")
+    retry_group_invite_button = ViewElement(Button, accessibility_id="retry-button")
+    remove_group_invite_button = ViewElement(Button, accessibility_id="remove-group-button")
+
+    # Contact's profile
+    contact_profile_picture = ViewElement(ProfilePictureElement)
+    profile_send_message = ViewElement(ProfileSendMessageButton)
+    profile_block_contact = ViewElement(ProfileBlockContactButton)
+    confirm_block_contact_button = ViewElement(Button, accessibility_id="block-contact-confirm")
+    unblock_contact_button = ViewElement(UnblockContactButton)
+    profile_add_to_contacts = ViewElement(Button, accessibility_id="Add to contacts-item-button")
+    profile_details = ViewElement(Button, accessibility_id="share-button")
+    profile_nickname = ViewElement(Text, xpath="//*[@content-desc='profile-nickname-item']/android.widget.TextView[2]")
+    profile_nickname_button = ViewElement(Button, accessibility_id="profile-nickname-item")
+    pinned_messages_button = ViewElement(PinnedMessagesOnProfileButton)
+    nickname_input_field = ViewElement(EditBox, accessibility_id="nickname-input")
+    remove_from_contacts = ViewElement(Button, accessibility_id="Remove from contacts-item-button")
+
+    # Timeline (My Status tab)
+    timeline_add_new_status_button = ViewElement(Button, accessibility_id="plus-button")
+    timeline_my_status_editbox = ViewElement(EditBox, accessibility_id="my-status-input")
+    timeline_open_images_panel_button = ViewElement(Button, accessibility_id="open-images-panel-button")
+    timeline_send_my_status_button = ViewElement(Button, accessibility_id="send-my-status-button")
+    timeline_own_account_photo = ViewElement(Button, accessibility_id="own-account-photo")
+
+    # Communities
+    create_community_button = ViewElement(Button, translation_id="create-community")
+    community_name_edit_box = ViewElement(EditBox, translation_id="name-your-community-placeholder")
+    set_community_image_button = ViewElement(Button, translation_id='community-thumbnail-image',
+                                             suffix='/following-sibling::android.view.ViewGroup')
+    confirm_create_in_community_button = ViewElement(Button, translation_id="create")
+
     def __init__(self, driver):
         super().__init__(driver)
-
-        # Start new chat
-        self.public_key_edit_box = EditBox(self.driver, accessibility_id="enter-contact-code-input")
-        self.scan_contact_code_button = Button(self.driver, accessibility_id="scan-contact-code-button")
-
-        # Chat header
-        self.user_name_text = Text(self.driver, accessibility_id="chat-name-text")
-        self.add_to_contacts = Button(self.driver, accessibility_id="add-to-contacts-button")
-        ## Options
-        self.chat_options = ChatOptionsButton(self.driver)
-        self.delete_chat_button = Button(self.driver, translation_id="delete-chat")
-        self.clear_history_button = Button(self.driver, translation_id="clear-history")
-        self.reply_message_button = Button(self.driver, translation_id="message-reply")
-        self.share_chat_button = Button(self.driver, accessibility_id="share-chat-button")
-        self.clear_button = Button(self.driver, translation_id="clear", uppercase=True)
-        self.view_profile_button = ViewProfileButton(self.driver)
-        self.view_profile_by_avatar_button = Button(self.driver, accessibility_id="member-photo")
-        self.user_options = Button(self.driver, accessibility_id="options")
-        self.open_in_status_button = OpenInStatusButton(self.driver)
-        self.close_modal_view_from_chat_button = Button(self.driver,
-                                                        xpath="//androidx.appcompat.widget.LinearLayoutCompat")
-
-        # Chat input
-        self.chat_message_input = EditBox(self.driver, accessibility_id="chat-message-input")
-        self.quote_username_in_message_input = EditBox(self.driver,
-                                                       xpath="//android.view.ViewGroup[@content-desc='cancel-message-reply']/..//android.widget.TextView[1]")
-        self.cancel_reply_button = Button(self.driver, accessibility_id="cancel-message-reply")
-        self.chat_item = Button(self.driver, accessibility_id="chat-item")
-        self.chat_name_editbox = EditBox(self.driver, accessibility_id="chat-name-input")
-        self.commands_button = CommandsButton(self.driver)
-        self.send_command = SendCommand(self.driver)
-        self.request_command = RequestCommand(self.driver)
-
-        # General chat view
-        self.history_start_icon = Button(self.driver, accessibility_id="history-chat")
-        self.unpin_message_popup = UnpinMessagePopUp(self.driver)
-
-        # Stickers
-        self.show_stickers_button = Button(self.driver, accessibility_id="show-stickers-icon")
-        self.get_stickers = Button(self.driver, translation_id="get-stickers")
-        self.sticker_icon = Button(self.driver, accessibility_id="sticker-icon")
-        self.sticker_message = Button(self.driver, accessibility_id="sticker-message")
-
-        # Images
-        self.show_images_button = Button(self.driver, accessibility_id="show-photo-icon")
-        self.take_photo_button = Button(self.driver, accessibility_id="take-picture")
-        self.image_from_gallery_button = Button(self.driver, accessibility_id="open-gallery")
-        self.first_image_from_gallery = Button(self.driver,
-                                               xpath="//*[@content-desc='open-gallery']/following-sibling::android.view.ViewGroup[1]")
-        self.images_area_in_gallery = Button(self.driver,
-                                             xpath="//*[@content-desc='open-gallery']/following-sibling::android.view.ViewGroup[1]")
-        self.image_message_in_chat = Button(self.driver, accessibility_id="image-message")
-        self.save_image_button = Button(self.driver, translation_id="save")
-        self.recent_image_in_gallery = Button(self.driver,
-                                              xpath="//*[contains(@resource-id,'thumbnail')]")
-        self.cancel_send_image_button = Button(self.driver, accessibility_id="cancel-send-image")
-        self.view_image_options = Button(self.driver,
-                                         xpath="//*[@content-desc='icon']/android.widget.ImageView")
-        self.share_image_icon_button = Button(self.driver, accessibility_id="share-button")
-        self.save_image_icon_button = Button(self.driver, accessibility_id="save-button")
-        self.image_in_android_messenger = Button(self.driver, accessibility_id="Image")
-
-        # Audio
-        self.audio_message_in_chat = Button(self.driver, accessibility_id="audio-message")
-        self.audio_message_button = Button(self.driver, accessibility_id="show-audio-message-icon")
-        self.record_audio_button = Button(self.driver, accessibility_id="start-stop-audio-recording-button")
-        self.cancel_audio_message_button = Button(self.driver, accessibility_id="cancel-message-button")
-        self.send_audio_message_button = Button(self.driver, accessibility_id="send-message-button")
-        self.play_pause_audio_message_button = Button(self.driver, accessibility_id="play-pause-audio-message-button")
-        self.audio_message_in_chat_timer = Text(self.driver,
-                                                xpath="//*[@content-desc='play-pause-audio-message-button']/../..//android.widget.TextView[1]")
-        self.audio_message_recorded_time = Text(self.driver, accessibility_id="audio-message-recorded-time")
-
-        # Group chats
-        self.group_info = GroupInfoButton(self.driver)
-        self.leave_chat_button = Button(self.driver, accessibility_id="leave-chat-button")
-        self.leave_button = Button(self.driver, translation_id="leave", uppercase=True)
-        self.join_chat_button = Button(self.driver, accessibility_id="join-chat-button")
-        self.decline_invitation_button = Button(self.driver, translation_id="group-chat-decline-invitation")
-        self.remove_user_button = Button(self.driver, accessibility_id="remove-from-chat")
-        self.make_admin_button = Button(self.driver, accessibility_id="make-admin")
-        self.edit_group_chat_name_button = Button(self.driver, accessibility_id="edit-button")
-        self.edit_group_chat_name_edit_box = EditBox(self.driver, accessibility_id="new-chat-name")
-        self.done_button = Button(self.driver, accessibility_id="done")
-        self.create_button = Button(self.driver, accessibility_id="create-group-chat-button")
-        ## Group invites
-        self.group_invite_button = Button(self.driver, accessibility_id="invite-chat-button")
-        self.group_invite_link_text = Text(self.driver,
-                                           xpath="//*[@content-desc='invitation-link']/android.widget.TextView")
-        self.introduce_yourself_edit_box = EditBox(self.driver, accessibility_id="introduce-yourself-input")
-        self.request_membership_button = Button(self.driver, translation_id="request-membership")
-        self.group_membership_request_button = Button(self.driver, accessibility_id="invitation-requests-button")
-        self.accept_group_invitation_button = Button(self.driver, accessibility_id="accept-invitation-button")
-        self.decline_group_invitation_button = Button(self.driver, accessibility_id="decline-invitation-button")
-        self.retry_group_invite_button = Button(self.driver, accessibility_id="retry-button")
-        self.remove_group_invite_button = Button(self.driver, accessibility_id="remove-group-button")
-
-        # Contact's profile
-        self.contact_profile_picture = ProfilePictureElement(self.driver)
-        self.profile_send_message = ProfileSendMessageButton(self.driver)
-        self.profile_block_contact = ProfileBlockContactButton(self.driver)
-        self.confirm_block_contact_button = Button(self.driver, accessibility_id="block-contact-confirm")
-        self.unblock_contact_button = UnblockContactButton(self.driver)
-        self.profile_add_to_contacts = Button(self.driver, accessibility_id="Add to contacts-item-button")
-        self.profile_details = Button(self.driver, accessibility_id="share-button")
-        self.profile_nickname = Text(self.driver,
-                                     xpath="//*[@content-desc='profile-nickname-item']/android.widget.TextView[2]")
-        self.profile_nickname_button = Button(self.driver, accessibility_id="profile-nickname-item")
-        self.pinned_messages_button = PinnedMessagesOnProfileButton(self.driver)
-        self.nickname_input_field = EditBox(self.driver, accessibility_id="nickname-input")
-        self.remove_from_contacts = Button(self.driver, accessibility_id="Remove from contacts-item-button")
-
-        # Timeline (My Status tab)
-        self.timeline_add_new_status_button = Button(self.driver, accessibility_id="plus-button")
-        self.timeline_my_status_editbox = EditBox(self.driver, accessibility_id="my-status-input")
-        self.timeline_open_images_panel_button = Button(self.driver, accessibility_id="open-images-panel-button")
-        self.timeline_send_my_status_button = Button(self.driver, accessibility_id="send-my-status-button")
-        self.timeline_own_account_photo = Button(self.driver, accessibility_id="own-account-photo")
-
-        # Communities
-        self.create_community_button = Button(self.driver, translation_id="create-community")
-        self.community_name_edit_box = EditBox(self.driver, translation_id="name-your-community-placeholder")
         self.community_description_edit_box = EditBox(self.driver, xpath='//android.widget.EditText[@text="%s"]' %
                                                                          self.get_translation_by_key(
                                                                              "give-a-short-description-community"))
-        self.set_community_image_button = Button(self.driver, translation_id='community-thumbnail-image',
-                                                 suffix='/following-sibling::android.view.ViewGroup')
-        self.confirm_create_in_community_button = Button(self.driver, translation_id="create")
 
     def get_outgoing_transaction(self, account=None, transaction_value=None) -> object:
         if account is None:
@@ -797,11 +873,15 @@ class ChatView(BaseView):
         self.driver.info("Verifying that '%s' is under today" % text)
         message_element = self.chat_element_by_text(text)
         message_element.wait_for_visibility_of_element()
-        message_location = message_element.find_element().location['y']
-        today_text_element = self.element_by_text('Today').find_element()
-        today_location = today_text_element.location['y']
-        today_height = today_text_element.size['height']
-        if message_location < today_location + today_height:
+        message_location = message_element.bounds['y']
+        snapshot, today_bounds = self.driver.page_source_snapshot, None
+        if snapshot.enabled:
+            today_node = snapshot.index(ChatMessageIndex, ChatMessageIndex.max_age).texts.get('Today')
+            today_bounds = PageSourceSnapshot.bounds(today_node) if today_node is not None else None
+        if not today_bounds:
+            today_text_element = self.element_by_text('Today').find_element()
+            today_bounds = dict(today_text_element.location, **today_text_element.size)
+        if message_location < today_bounds['y'] + today_bounds['height']:
             errors.append("Message '%s' is not under 'Today' text" % text)
 
     def send_message(self, message: str = 'test message'):
@@ -1,4 +1,4 @@
-from views.base_element import Button, EditBox, BaseElement
+from views.base_element import Button, EditBox, BaseElement, ViewElement
 from views.base_view import BaseView
 from views.home_view import ChatElement
 
@@ -33,25 +33,22 @@ class BrowserEntry(ChatElement):
 
 
 class DappsView(BaseView):
-    def __init__(self, driver):
-        super(DappsView, self).__init__(driver)
-
-        self.enter_url_editbox = EditBox(self.driver, accessibility_id="dapp-url-input")
-        self.edit_url_editbox = EditUrlEditbox(self.driver)
-        self.discover_dapps_button = DiscoverDappsButton(self.driver)
-        self.web_page = BaseElement(self.driver, xpath="(//android.webkit.WebView)[1]")
-
-        # Ens dapp
-        self.ens_name_input = EditBox(self.driver, xpath="//android.widget.EditText")
-        self.check_ens_name = Button(self.driver, xpath="(//android.widget.ImageView[@content-desc='icon'])[2]/../..")
-
-        # Options on long press
-        self.delete_bookmark_button = Button(self.driver, accessibility_id="delete-bookmark")
-        self.open_in_new_tab_button = Button(self.driver, accessibility_id="open-in-new-tab")
-        self.edit_bookmark_button = Button(self.driver, accessibility_id="edit-bookmark")
-
-        # Select account
-        self.select_account_button = Button(self.driver, accessibility_id="select-account")
+    enter_url_editbox = ViewElement(EditBox, accessibility_id="dapp-url-input")
+    edit_url_editbox = ViewElement(EditUrlEditbox)
+    discover_dapps_button = ViewElement(DiscoverDappsButton)
+    web_page = ViewElement(BaseElement, xpath="(//android.webkit.WebView)[1]")
+
+    # Ens dapp
+    ens_name_input = ViewElement(EditBox, xpath="//android.widget.EditText")
+    check_ens_name = ViewElement(Button, xpath="(//android.widget.ImageView[@content-desc='icon'])[2]/../..")
+
+    # Options on long press
+    delete_bookmark_button = ViewElement(Button, accessibility_id="delete-bookmark")
+    open_in_new_tab_button = ViewElement(Button, accessibility_id="open-in-new-tab")
+    edit_bookmark_button = ViewElement(Button, accessibility_id="edit-bookmark")
+
+    # Select account
+    select_account_button = ViewElement(Button, accessibility_id="select-account")
 
     def open_url(self, url):
         self.driver.info("Open url '%s'" % url)
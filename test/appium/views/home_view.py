@@ -1,6 +1,6 @@
 import time
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from views.base_element import Button, Text, BaseElement, SilentButton, CheckBox
+from views.base_element import Button, Text, BaseElement, SilentButton, CheckBox, ViewElement
 from views.base_view import BaseView
 from tests import test_dapp_url
 
@@ -171,56 +171,51 @@ class PushNotificationElement(SilentButton):
 
 
 class HomeView(BaseView):
-    def __init__(self, driver):
-        super().__init__(driver)
-
-        self.plus_button = Button(self.driver, accessibility_id="new-chat-button")
-        self.chat_name_text = Text(self.driver, accessibility_id="chat-name-text")
-        self.start_new_chat_button = ChatButton(self.driver, accessibility_id="start-1-1-chat-button")
-        self.new_group_chat_button = ChatButton(self.driver, accessibility_id="start-group-chat-button")
-        self.join_public_chat_button = ChatButton(self.driver, accessibility_id="join-public-chat-button")
-        self.universal_qr_scanner_button = Button(self.driver, accessibility_id="universal-qr-scanner")
-        self.invite_friends_button = Button(self.driver, accessibility_id="invite-friends-button")
-        self.stop_status_service_button = Button(self.driver, accessibility_id="STOP")
-        self.my_profile_on_start_new_chat_button = Button(self.driver,
-                                                          xpath="//*[@content-desc='current-account-photo']")
-        self.communities_button = ChatButton(self.driver, accessibility_id="communities-button")
-
-        # Notification centre
-        self.notifications_button = Button(self.driver, accessibility_id="notifications-button")
-        self.notifications_unread_badge = Button(self.driver, accessibility_id="notifications-unread-badge")
-        self.notifications_select_button = Button(self.driver, translation_id="select")
-        self.notifications_reject_and_delete_button = Button(self.driver, accessibility_id="reject-and-delete"
-                                                                                           "-activity-center")
-        self.notifications_accept_and_add_button = Button(self.driver,
-                                                          accessibility_id="accept-and-add-activity-center")
-        self.notifications_select_all = Button(self.driver, xpath="(//android.widget.CheckBox["
-                                                                  "@content-desc='checkbox-off'])[1]")
-
-        # Options on long tap
-        self.chats_menu_invite_friends_button = Button(self.driver, accessibility_id="chats-menu-invite-friends-button")
-        self.delete_chat_button = Button(self.driver, accessibility_id="delete-chat-button")
-        self.clear_history_button = Button(self.driver, accessibility_id="clear-history-button")
-        self.mark_all_messages_as_read_button = Button(self.driver, accessibility_id="mark-all-read-button")
-
-        # Connection icons
-        self.mobile_connection_off_icon = Button(self.driver, accessibility_id="conn-button-mobile-sync-off")
-        self.mobile_connection_on_icon = Button(self.driver, accessibility_id="conn-button-mobile-sync")
-        self.connection_offline_icon = Button(self.driver, accessibility_id="conn-button-offline")
-
-        # Sync using mobile data bottom sheet
-        self.continue_syncing_button = Button(self.driver, accessibility_id="mobile-network-continue-syncing")
-        self.stop_syncing_button = Button(self.driver, accessibility_id="mobile-network-stop-syncing")
-        self.remember_my_choice_checkbox = CheckBox(self.driver, accessibility_id=":checkbox-on")
-
-        # Connection status bottom sheet
-        self.connected_to_n_peers_text = Text(self.driver, accessibility_id="connected-to-n-peers")
-        self.connected_to_node_text = Text(self.driver, accessibility_id="connected-to-mailserver")
-        self.waiting_for_wi_fi = Text(self.driver, accessibility_id="waiting-wi-fi")
-        self.use_mobile_data_switch = Button(self.driver, accessibility_id="mobile-network-use-mobile")
-        self.connection_settings_button = Button(self.driver, accessibility_id="settings")
-        self.not_connected_to_node_text = Text(self.driver, accessibility_id="not-connected-nodes")
-        self.not_connected_to_peers_text = Text(self.driver, accessibility_id="not-connected-to-peers")
+    plus_button = ViewElement(Button, accessibility_id="new-chat-button")
+    chat_name_text = ViewElement(Text, accessibility_id="chat-name-text")
+    start_new_chat_button = ViewElement(ChatButton, accessibility_id="start-1-1-chat-button")
+    new_group_chat_button = ViewElement(ChatButton, accessibility_id="start-group-chat-button")
+    join_public_chat_button = ViewElement(ChatButton, accessibility_id="join-public-chat-button")
+    universal_qr_scanner_button = ViewElement(Button, accessibility_id="universal-qr-scanner")
+    invite_friends_button = ViewElement(Button, accessibility_id="invite-friends-button")
+    stop_status_service_button = ViewElement(Button, accessibility_id="STOP")
+    my_profile_on_start_new_chat_button = ViewElement(Button, xpath="//*[@content-desc='current-account-photo']")
+    communities_button = ViewElement(ChatButton, accessibility_id="communities-button")
+
+    # Notification centre
+    notifications_button = ViewElement(Button, accessibility_id="notifications-button")
+    notifications_unread_badge = ViewElement(Button, accessibility_id="notifications-unread-badge")
+    notifications_select_button = ViewElement(Button, translation_id="select")
+    notifications_reject_and_delete_button = ViewElement(Button, accessibility_id="reject-and-delete"
+                                                                                       "-activity-center")
+    notifications_accept_and_add_button = ViewElement(Button, accessibility_id="accept-and-add-activity-center")
+    notifications_select_all = ViewElement(Button, xpath="(//android.widget.CheckBox["
+                                                              "@content-desc='checkbox-off'])[1]")
+
+    # Options on long tap
+    chats_menu_invite_friends_button = ViewElement(Button, accessibility_id="chats-menu-invite-friends-button")
+    delete_chat_button = ViewElement(Button, accessibility_id="delete-chat-button")
+    clear_history_button = ViewElement(Button, accessibility_id="clear-history-button")
+    mark_all_messages_as_read_button = ViewElement(Button, accessibility_id="mark-all-read-button")
+
+    # Connection icons
+    mobile_connection_off_icon = ViewElement(Button, accessibility_id="conn-button-mobile-sync-off")
+    mobile_connection_on_icon = ViewElement(Button, accessibility_id="conn-button-mobile-sync")
+    connection_offline_icon = ViewElement(Button, accessibility_id="conn-button-offline")
+
+    # Sync using mobile data bottom sheet
+    continue_syncing_button = ViewElement(Button, accessibility_id="mobile-network-continue-syncing")
+    stop_syncing_button = ViewElement(Button, accessibility_id="mobile-network-stop-syncing")
+    remember_my_choice_checkbox = ViewElement(CheckBox, accessibility_id=":checkbox-on")
+
+    # Connection status bottom sheet
+    connected_to_n_peers_text = ViewElement(Text, accessibility_id="connected-to-n-peers")
+    connected_to_node_text = ViewElement(Text, accessibility_id="connected-to-mailserver")
+    waiting_for_wi_fi = ViewElement(Text, accessibility_id="waiting-wi-fi")
+    use_mobile_data_switch = ViewElement(Button, accessibility_id="mobile-network-use-mobile")
+    connection_settings_button = ViewElement(Button, accessibility_id="settings")
+    not_connected_to_node_text = ViewElement(Text, accessibility_id="not-connected-nodes")
+    not_connected_to_peers_text = ViewElement(Text, accessibility_id="not-connected-to-peers")
 
     def wait_for_syncing_complete(self):
         self.driver.info('Waiting for syncing to complete')
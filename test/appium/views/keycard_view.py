@@ -1,28 +1,26 @@
-from views.base_element import Button, Text, EditBox, SilentButton, CheckBox
+from views.base_element import Button, Text, EditBox, SilentButton, CheckBox, ViewElement
 from views.base_view import BaseView
 
 
 class KeycardView(BaseView):
-    def __init__(self, driver):
-        super().__init__(driver)
-        self.begin_setup_button = Button(self.driver, translation_id="begin-set-up")
-        self.connect_card_button = Button(self.driver, accessibility_id="connect-card")
-        self.disconnect_card_button = Button(self.driver, accessibility_id="disconnect-card")
-        self.reset_card_state_button = Button(self.driver, accessibility_id="keycard-reset-state")
-        self.connect_selected_card_button = Button(self.driver, accessibility_id="connect-selected-card")
-        self.pair_code_text = Text(self.driver, accessibility_id="pair-code")
-        self.pair_code_input = EditBox(self.driver, xpath="//android.widget.EditText")
-        self.pair_to_this_device_button = Button(self.driver, translation_id="pair-card")
-        self.connect_pairing_card_button = Button(self.driver, accessibility_id="connect-pairing-card")
-        self.return_card_to_factory_settings_checkbox = CheckBox(self.driver, accessibility_id=":checkbox-off")
+    begin_setup_button = ViewElement(Button, translation_id="begin-set-up")
+    connect_card_button = ViewElement(Button, accessibility_id="connect-card")
+    disconnect_card_button = ViewElement(Button, accessibility_id="disconnect-card")
+    reset_card_state_button = ViewElement(Button, accessibility_id="keycard-reset-state")
+    connect_selected_card_button = ViewElement(Button, accessibility_id="connect-selected-card")
+    pair_code_text = ViewElement(Text, accessibility_id="pair-code")
+    pair_code_input = ViewElement(EditBox, xpath="//android.widget.EditText")
+    pair_to_this_device_button = ViewElement(Button, translation_id="pair-card")
+    connect_pairing_card_button = ViewElement(Button, accessibility_id="connect-pairing-card")
+    return_card_to_factory_settings_checkbox = ViewElement(CheckBox, accessibility_id=":checkbox-off")
 
-        # Keyboard
-        self.zero_button = SilentButton(self.driver, accessibility_id="numpad-button-0")
-        self.one_button = SilentButton(self.driver, accessibility_id="numpad-button-1")
-        self.two_button = SilentButton(self.driver, accessibility_id="numpad-button-2")
+    # Keyboard
+    zero_button = ViewElement(SilentButton, accessibility_id="numpad-button-0")
+    one_button = ViewElement(SilentButton, accessibility_id="numpad-button-1")
+    two_button = ViewElement(SilentButton, accessibility_id="numpad-button-2")
 
-        # Backup seed phrase
-        self.confirm_seed_phrase_edit_box = EditBox(self.driver, accessibility_id="enter-word")
+    # Backup seed phrase
+    confirm_seed_phrase_edit_box = ViewElement(EditBox, accessibility_id="enter-word")
 
     def enter_default_pin(self):
         self.driver.info("Enter default pin 111111")
@@ -1,6 +1,6 @@
 import time
 from tests.base_test_case import AbstractTestCase
-from views.base_element import Text, Button, EditBox, SilentButton
+from views.base_element import Text, Button, EditBox, SilentButton, ViewElement
 from views.base_view import BaseView
 
 
@@ -182,162 +182,160 @@ class KeycardButton(Button):
 
 class ProfileView(BaseView):
 
+    options_button = ViewElement(OptionsButton)
+
+    # Header
+    public_key_text = ViewElement(Text, accessibility_id="chat-key")
+    default_username_text = ViewElement(Text, accessibility_id="default-username")
+    share_my_profile_button = ViewElement(Button, accessibility_id="share-header-button")
+    profile_picture = ViewElement(ProfilePictureElement)
+    edit_picture_button = ViewElement(Button, accessibility_id="edit-profile-photo-button")
+    confirm_edit_button = ViewElement(Button, accessibility_id="done-button")
+    select_from_gallery_button = ViewElement(Button, translation_id="profile-pic-pick")
+    capture_button = ViewElement(Button, translation_id="image-source-make-photo")
+    take_photo_button = ViewElement(Button, accessibility_id="take-photo")
+    crop_photo_button = ViewElement(Button, accessibility_id="Crop")
+    decline_photo_crop = ViewElement(Button, accessibility_id="Navigate up")
+    shutter_button = ViewElement(Button, accessibility_id="Shutter")
+    accept_photo_button = ViewElement(Button, accessibility_id="Done")
+
+    # ENS
+    username_in_ens_chat_settings_text = ViewElement(EditBox,
+                                                     xpath="//*[@content-desc='chat-icon']/../../android.widget.TextView[2]")
+    ens_usernames_button = ViewElement(ENSusernames)
+    ens_name_in_share_chat_key_text = ViewElement(Text, accessibility_id="ens-username")
+
+    # Contacts
+    contacts_button = ViewElement(Button, accessibility_id="contacts-button")
+    blocked_users_button = ViewElement(Button, accessibility_id="blocked-users-list-button")
+    add_new_contact_button = ViewElement(AddNewContactButton)
+    invite_friends_in_contact_button = ViewElement(Button, accessibility_id="invite-friends-button")
+
+    # Privacy and security
+    privacy_and_security_button = ViewElement(Button, accessibility_id="privacy-and-security-settings-button")
+    accept_new_chats_from = ViewElement(Button, accessibility_id="accept-new-chats-from")
+    accept_new_chats_from_contacts_only = ViewElement(Button, translation_id="contacts")
+    reset_password_button = ViewElement(Button, accessibility_id="reset-password")
+    current_password_edit_box = ViewElement(EditBox, accessibility_id="current-password")
+    new_password_edit_box = ViewElement(EditBox, accessibility_id="new-password")
+    confirm_new_password_edit_box = ViewElement(EditBox, accessibility_id="confirm-new-password")
+    current_password_wrong_text = ViewElement(Text, accessibility_id="current-password-error")
+
+    # Appearance
+    appearance_button = ViewElement(Button, accessibility_id="appearance-settings-button")
+    show_profile_pictures_of = ViewElement(Button, accessibility_id="show-profile-pictures")
+    ## Backup recovery phrase
+    backup_recovery_phrase_button = ViewElement(BackupRecoveryPhraseButton)
+    recovery_phrase_table = ViewElement(RecoveryPhraseTable)
+    recovery_phrase_word_number = ViewElement(RecoveryPhraseWordNumberText)
+    recovery_phrase_word_input = ViewElement(RecoveryPhraseWordInput)
+    ## Dapps permissions
+    dapp_permissions_button = ViewElement(DappPermissionsButton)
+    revoke_access_button = ViewElement(Button, translation_id="revoke-access")
+    ## Delete my profile
+    delete_my_profile_button = ViewElement(Button, translation_id="delete-my-profile")
+    delete_my_profile_password_input = ViewElement(EditBox, xpath="//android.widget.EditText")
+    delete_profile_button = ViewElement(Button, accessibility_id="delete-profile-confirm")
+
+    # Notifications
+    profile_notifications_button = ViewElement(Button, accessibility_id="notifications-settings-button")
+    profile_notifications_toggle_button = ViewElement(Button, accessibility_id="local-notifications-settings-button")
+    push_notification_toggle = ViewElement(Button,
+                                           xpath="//*[@content-desc='notifications-button']//*[@content-desc='switch']")
+    wallet_push_notifications = ViewElement(Button, accessibility_id="notifications-button")
+
+    # Sync settings
+    sync_settings_button = ViewElement(SyncSettingsButton)
+    ## Mobile Data
+    use_mobile_data = ViewElement(Button, translation_id="mobile-network-use-mobile",
+                                  suffix="/following-sibling::android.widget.Switch[1]")
+    ask_me_when_on_mobile_network = ViewElement(Button, translation_id="mobile-network-ask-me",
+                                                suffix="/following-sibling::android.widget.Switch[1]")
+    ## Backup settings
+    backup_settings_button = ViewElement(Button, accessibility_id="backup-settings-button")
+    ## Perform backup
+    perform_backup_button = ViewElement(Button, translation_id="perform-backup")
+
+    ## Sync history data
+    sync_history_for_button = ViewElement(Button, accessibility_id="default-sync-period-button")
+    ## History nodes
+    mail_server_button = ViewElement(Button, accessibility_id="offline-messages-settings-button")
+    mail_server_address_input = ViewElement(EditBox, translation_id="mailserver-address",
+                                            suffix="/following-sibling::*[1]/android.widget.EditText")
+    mail_server_connect_button = ViewElement(Button, accessibility_id="mailserver-connect-button")
+    mail_server_auto_selection_button = ViewElement(Button, translation_id="mailserver-automatic",
+                                                    suffix="/following-sibling::*[1]")
+    use_history_node_button = ViewElement(Button, translation_id="offline-messaging-use-history-nodes",
+                                          suffix="/following-sibling::*[1]")
+    mail_server_delete_button = ViewElement(Button, accessibility_id="mailserver-delete-button")
+    ## Device syncing
+    devices_button = ViewElement(Button, accessibility_id="pairing-settings-button")
+    device_name_input = ViewElement(EditBox, accessibility_id="device-name")
+    go_to_pairing_settings_button = ViewElement(Button, translation_id="pairing-go-to-installation",
+                                                uppercase=True)
+    advertise_device_button = ViewElement(Button, accessibility_id="advertise-device")
+    sync_all_button = ViewElement(Button, translation_id="sync-all-devices")
+
+    # Keycard
+    keycard_button = ViewElement(Button, accessibility_id="keycard-button")
+    change_pin_button = ViewElement(KeycardButton, translation_id="change-pin")
+    change_puk_button = ViewElement(KeycardButton, translation_id="change-puk")
+    change_pairing_code_button = ViewElement(KeycardButton, translation_id="change-pairing")
+    create_keycard_backup_button = ViewElement(KeycardButton, translation_id="keycard-backup")
+
+    # Advanced
+    advanced_button = ViewElement(AdvancedButton)
+    ## Network
+    network_settings_button = ViewElement(Button, accessibility_id="network-button")
+    active_network_name = ViewElement(Text, xpath="//android.widget.TextView[contains(@text,'with upstream RPC')]")
+    plus_button = ViewElement(Button, xpath="(//android.widget.ImageView[@content-desc='icon'])[2]")
+    ropsten_chain_button = ViewElement(Button, translation_id="ropsten-network")
+    custom_network_url_input = ViewElement(EditBox, translation_id="rpc-url",
+                                           suffix="/following-sibling::*[1]/android.widget.EditText")
+    custom_network_symbol_input = ViewElement(EditBox, translation_id="specify-symbol")
+    specify_name_input = ViewElement(EditBox, translation_id="name",
+                                     suffix="/following-sibling::*[1]/android.widget.EditText")
+    connect_button = ViewElement(Button, accessibility_id="network-connect-button")
+    ## Toggles
+    transaction_management_enabled_toggle = ViewElement(Button, accessibility_id="transactions-management-enabled")
+    webview_debug_toggle = ViewElement(Button, accessibility_id="webview-debug-switch")
+    waku_bloom_toggle = ViewElement(Button, accessibility_id="waku-bloom-filter-mode-settings-switch")
+    ## Log level
+    log_level_setting_button = ViewElement(Button, accessibility_id="log-level-settings-button")
+    ## Fleet
+    fleet_setting_button = ViewElement(Button, accessibility_id="fleet-settings-button")
+    ## Bootnodes
+    bootnodes_button = ViewElement(Button, accessibility_id="bootnodes-settings-button")
+    bootnode_address_input = ViewElement(EditBox, accessibility_id="bootnode-address")
+    enable_bootnodes = ViewElement(Button, xpath="//android.widget.Switch")
+    add_bootnode_button = ViewElement(Button, accessibility_id="add-bootnode")
+
+    # Need help
+    help_button = ViewElement(HelpButton)
+    submit_bug_button = ViewElement(Button, accessibility_id="submit-bug-button")
+    bug_description_edit_box = ViewElement(EditBox, accessibility_id="bug-report-description")
+    bug_steps_edit_box = ViewElement(EditBox, accessibility_id="bug-report-steps")
+    bug_submit_button = ViewElement(Button, accessibility_id="bug-report-submit")
+    request_a_feature_button = ViewElement(Button, accessibility_id="request-a-feature-button")
+    faq_button = ViewElement(FaqButton)
+
+    # About
+    about_button = ViewElement(AboutButton)
+    privacy_policy_button = ViewElement(PrivacyPolicyButton)
+    terms_of_use_button = ViewElement(TermsOfUseButton)
+    app_version_text = ViewElement(Text, xpath="//*[@content-desc='app-version']//android.widget.TextView[2]")
+    node_version_text = ViewElement(Text, xpath="//*[@content-desc='node-version']//android.widget.TextView[2]")
+
+    # Logout
+    logout_button = ViewElement(LogoutButton)
+    logout_dialog = ViewElement(LogoutDialog)
+    confirm_logout_button = ViewElement(Button, translation_id="logout", uppercase=True)
+
     def __init__(self, driver):
         super().__init__(driver)
-        self.options_button = OptionsButton(self.driver)
-
-        # Header
-        self.public_key_text = Text(self.driver, accessibility_id="chat-key")
-        self.default_username_text = Text(self.driver, accessibility_id="default-username")
-        self.share_my_profile_button = Button(self.driver, accessibility_id="share-header-button")
-        self.profile_picture = ProfilePictureElement(self.driver)
-        self.edit_picture_button = Button(self.driver, accessibility_id="edit-profile-photo-button")
-        self.confirm_edit_button = Button(self.driver, accessibility_id="done-button")
-        self.select_from_gallery_button = Button(self.driver, translation_id="profile-pic-pick")
-        self.capture_button = Button(self.driver, translation_id="image-source-make-photo")
-        self.take_photo_button = Button(self.driver, accessibility_id="take-photo")
-        self.crop_photo_button = Button(self.driver, accessibility_id="Crop")
-        self.decline_photo_crop = Button(self.driver, accessibility_id="Navigate up")
-        self.shutter_button = Button(self.driver, accessibility_id="Shutter")
-        self.accept_photo_button = Button(self.driver, accessibility_id="Done")
-
-        # ENS
-        self.username_in_ens_chat_settings_text = EditBox(self.driver,
-                                                          xpath="//*[@content-desc='chat-icon']/../../android.widget.TextView[2]")
-        self.ens_usernames_button = ENSusernames(self.driver)
-        self.ens_name_in_share_chat_key_text = Text(self.driver, accessibility_id="ens-username")
-
-        # Contacts
-        self.contacts_button = Button(self.driver, accessibility_id="contacts-button")
-        self.blocked_users_button = Button(self.driver, accessibility_id="blocked-users-list-button")
-        self.add_new_contact_button = AddNewContactButton(self.driver)
-        self.invite_friends_in_contact_button = Button(self.driver, accessibility_id="invite-friends-button")
-
-        # Privacy and security
-        self.privacy_and_security_button = Button(self.driver, accessibility_id="privacy-and-security-settings-button")
-        self.accept_new_chats_from = Button(self.driver, accessibility_id="accept-new-chats-from")
-        self.accept_new_chats_from_contacts_only = Button(self.driver, translation_id="contacts")
-        self.reset_password_button = Button(self.driver, accessibility_id="reset-password")
-        self.current_password_edit_box = EditBox(self.driver, accessibility_id="current-password")
-        self.new_password_edit_box = EditBox(self.driver, accessibility_id="new-password")
-        self.confirm_new_password_edit_box = EditBox(self.driver, accessibility_id="confirm-new-password")
-        self.current_password_wrong_text = Text(self.driver, accessibility_id="current-password-error")
-
-        # Appearance
-        self.appearance_button = Button(self.driver, accessibility_id="appearance-settings-button")
-        self.show_profile_pictures_of = Button(self.driver, accessibility_id="show-profile-pictures")
-        ## Backup recovery phrase
-        self.backup_recovery_phrase_button = BackupRecoveryPhraseButton(self.driver)
-        self.recovery_phrase_table = RecoveryPhraseTable(self.driver)
-        self.recovery_phrase_word_number = RecoveryPhraseWordNumberText(self.driver)
-        self.recovery_phrase_word_input = RecoveryPhraseWordInput(self.driver)
-        ## Dapps permissions
-        self.dapp_permissions_button = DappPermissionsButton(self.driver)
-        self.revoke_access_button = Button(self.driver, translation_id="revoke-access")
-        ## Delete my profile
-        self.delete_my_profile_button = Button(self.driver, translation_id="delete-my-profile")
-        self.delete_my_profile_password_input = EditBox(self.driver, xpath="//android.widget.EditText")
-        self.delete_profile_button = Button(self.driver, accessibility_id="delete-profile-confirm")
-
-        # Notifications
-        self.profile_notifications_button = Button(self.driver, accessibility_id="notifications-settings-button")
-        self.profile_notifications_toggle_button = Button(self.driver, accessibility_id="local-notifications-settings-button")
-        self.push_notification_toggle = Button(self.driver,
-                                               xpath="//*[@content-desc='notifications-button']//*[@content-desc='switch']")
-        self.wallet_push_notifications = Button(self.driver, accessibility_id="notifications-button")
-
-        # Sync settings
-        self.sync_settings_button = SyncSettingsButton(self.driver)
-        ## Mobile Data
-        self.use_mobile_data = Button(self.driver, translation_id="mobile-network-use-mobile",
-                                      suffix="/following-sibling::android.widget.Switch[1]")
-        self.ask_me_when_on_mobile_network = Button(self.driver, translation_id="mobile-network-ask-me",
-                                                    suffix="/following-sibling::android.widget.Switch[1]")
-        ## Backup settings
-        self.backup_settings_button = Button(self.driver, accessibility_id="backup-settings-button")
-        ## Perform backup
-        self.perform_backup_button = Button(self.driver, translation_id="perform-backup")
-
-        ## Sync history data
-        self.sync_history_for_button = Button(self.driver, accessibility_id="default-sync-period-button")
-        ## History nodes
-        self.mail_server_button = Button(self.driver, accessibility_id="offline-messages-settings-button")
-        self.mail_server_address_input = EditBox(self.driver, translation_id="mailserver-address",
-                                                 suffix="/following-sibling::*[1]/android.widget.EditText")
-        self.mail_server_connect_button = Button(self.driver, accessibility_id="mailserver-connect-button")
-        self.mail_server_auto_selection_button = Button(self.driver, translation_id="mailserver-automatic",
-                                                        suffix="/following-sibling::*[1]")
-        self.use_history_node_button = Button(self.driver, translation_id="offline-messaging-use-history-nodes",
-                                              suffix="/following-sibling::*[1]")
-        self.mail_server_delete_button = Button(self.driver, accessibility_id="mailserver-delete-button")
         self.mail_server_confirm_delete_button = Button(self.driver,
                                                         xpath='//*[@text="%s"]' % self.get_translation_by_key(
                                                             "delete-mailserver").upper())
-        ## Device syncing
-        self.devices_button = Button(self.driver, accessibility_id="pairing-settings-button")
-        self.device_name_input = EditBox(self.driver, accessibility_id="device-name")
-        self.go_to_pairing_settings_button = Button(self.driver, translation_id="pairing-go-to-installation",
-                                                    uppercase=True)
-        self.advertise_device_button = Button(self.driver, accessibility_id="advertise-device")
-        self.sync_all_button = Button(self.driver, translation_id="sync-all-devices")
-
-        # Keycard
-        self.keycard_button = Button(self.driver, accessibility_id="keycard-button")
-        self.change_pin_button = KeycardButton(self.driver, translation_id="change-pin")
-        self.change_puk_button = KeycardButton(self.driver, translation_id="change-puk")
-        self.change_pairing_code_button = KeycardButton(self.driver, translation_id="change-pairing")
-        self.create_keycard_backup_button = KeycardButton(self.driver, translation_id="keycard-backup")
-
-        # Advanced
-        self.advanced_button = AdvancedButton(self.driver)
-        ## Network
-        self.network_settings_button = Button(self.driver, accessibility_id="network-button")
-        self.active_network_name = Text(self.driver,
-                                        xpath="//android.widget.TextView[contains(@text,'with upstream RPC')]")
-        self.plus_button = Button(self.driver, xpath="(//android.widget.ImageView[@content-desc='icon'])[2]")
-        self.ropsten_chain_button = Button(self.driver, translation_id="ropsten-network")
-        self.custom_network_url_input = EditBox(self.driver, translation_id="rpc-url",
-                                                suffix="/following-sibling::*[1]/android.widget.EditText")
-        self.custom_network_symbol_input = EditBox(self.driver, translation_id="specify-symbol")
-        self.specify_name_input = EditBox(self.driver, translation_id="name",
-                                          suffix="/following-sibling::*[1]/android.widget.EditText")
-        self.connect_button = Button(self.driver, accessibility_id="network-connect-button")
-        ## Toggles
-        self.transaction_management_enabled_toggle = Button(self.driver,
-                                                            accessibility_id="transactions-management-enabled")
-        self.webview_debug_toggle = Button(self.driver, accessibility_id="webview-debug-switch")
-        self.waku_bloom_toggle = Button(self.driver, accessibility_id="waku-bloom-filter-mode-settings-switch")
-        ## Log level
-        self.log_level_setting_button = Button(self.driver, accessibility_id="log-level-settings-button")
-        ## Fleet
-        self.fleet_setting_button = Button(self.driver, accessibility_id="fleet-settings-button")
-        ## Bootnodes
-        self.bootnodes_button = Button(self.driver, accessibility_id="bootnodes-settings-button")
-        self.bootnode_address_input = EditBox(self.driver, accessibility_id="bootnode-address")
-        self.enable_bootnodes = Button(self.driver, xpath="//android.widget.Switch")
-        self.add_bootnode_button = Button(self.driver, accessibility_id="add-bootnode")
-
-        # Need help
-        self.help_button = HelpButton(self.driver)
-        self.submit_bug_button = Button(self.driver, accessibility_id="submit-bug-button")
-        self.bug_description_edit_box = EditBox(self.driver, accessibility_id="bug-report-description")
-        self.bug_steps_edit_box = EditBox(self.driver, accessibility_id="bug-report-steps")
-        self.bug_submit_button = Button(self.driver, accessibility_id="bug-report-submit")
-        self.request_a_feature_button = Button(self.driver, accessibility_id="request-a-feature-button")
-        self.faq_button = FaqButton(self.driver)
-
-        # About
-        self.about_button = AboutButton(self.driver)
-        self.privacy_policy_button = PrivacyPolicyButton(self.driver)
-        self.terms_of_use_button = TermsOfUseButton(self.driver)
-        self.app_version_text = Text(self.driver, xpath="//*[@content-desc='app-version']//android.widget.TextView[2]")
-        self.node_version_text = Text(self.driver,
-                                      xpath="//*[@content-desc='node-version']//android.widget.TextView[2]")
-
-        # Logout
-        self.logout_button = LogoutButton(self.driver)
-        self.logout_dialog = LogoutDialog(self.driver)
-        self.confirm_logout_button = Button(self.driver, translation_id="logout", uppercase=True)
 
     def switch_network(self, network='Mainnet with upstream RPC'):
         self.driver.info("## Switch network to '%s'" % network, device=False)
@@ -1,5 +1,5 @@
 from tests import common_password
-from views.base_element import Text, SilentButton
+from views.base_element import Text, SilentButton, ViewElement
 from views.base_element import Button, EditBox
 from views.base_view import BaseView
 
@@ -66,66 +66,61 @@ class SignWithKeycardButton(Button):
 
 
 class SendTransactionView(BaseView):
-    def __init__(self, driver):
-        super(SendTransactionView, self).__init__(driver)
-
-        self.chose_recipient_button = ChooseRecipientButton(self.driver)
-        self.accounts_button = Button(self.driver, translation_id="my-accounts")
-        self.enter_recipient_address_button = Button(self.driver, accessibility_id="choose-recipient-recipient-code")
-        self.scan_qr_code_button = Button(self.driver, accessibility_id="scan-contact-code-button")
-        self.enter_recipient_address_input = EditBox(self.driver, accessibility_id="recipient-address-input")
-        self.first_recipient_button = Button(self.driver, accessibility_id="chat-icon")
-        self.enter_recipient_address_text = Text(self.driver,
-                                                 xpath="//*[@content-desc='choose-recipient-button']//android.widget.TextView")
-
-        self.recent_recipients_button = Button(self.driver, translation_id="recent-recipients")
-        self.amount_edit_box = AmountEditBox(self.driver)
-        self.set_max_button = Button(self.driver, translation_id="set-max")
-        self.validation_error_element = Text(self.driver,
-                                             xpath="//*[@text='Network fee']/following-sibling::*[@content-desc='icon']")
-
-        # Network fee elements
-        self.network_fee_button = Button(self.driver, accessibility_id="custom-gas-fee")
-        self.gas_limit_input = EditBox(self.driver, accessibility_id="gas-amount-limit")
-        self.per_gas_tip_limit_input = EditBox(self.driver, accessibility_id="per-gas-tip-limit")
-        self.per_gas_price_limit_input = EditBox(self.driver, accessibility_id="per-gas-price-limit")
-        self.max_fee_text = Text(self.driver,
-                                 xpath='//*[@text="Maximum fee:"]/following-sibling::android.widget.TextView[1]')
-        self.save_fee_button = Button(self.driver, accessibility_id="save-fees")
-
-        self.sign_transaction_button = Button(self.driver, accessibility_id="send-transaction-bottom-sheet")
-        self.sign_with_keycard_button = SignWithKeycardButton(self.driver)
-        self.sign_with_password = Button(self.driver, translation_id="sign-with-password")
-        self.sign_button = Button(self.driver, translation_id="transactions-sign")
-        self.sign_in_phrase_text = Text(self.driver, accessibility_id="signing-phrase-text")
-        self.enter_password_input = EditBox(self.driver, accessibility_id="enter-password-input")
-        self.got_it_button = Button(self.driver, accessibility_id="got-it-button")
-
-        self.select_asset_button = Button(self.driver, accessibility_id="choose-asset-button")
-        self.asset_text = Text(self.driver, xpath="//*[@content-desc='choose-asset-button']//android.widget.TextView")
-        self.recipient_text = Text(self.driver,
-                                   xpath="//*[@content-desc='choose-recipient-button']//android.widget.TextView")
-
-        self.share_button = Button(self.driver, accessibility_id="share-address-button")
-
-        self.onboarding_message = Text(self.driver, translation_id="this-is-you-signing")
-        self.validation_warnings = ValidationWarnings(self.driver)
-        self.eth_asset_in_select_asset_bottom_sheet_button = Button(self.driver, accessibility_id=":ETH-asset-value")
-
-        # Elements for commands in 1-1 chat
-        self.select_button = Button(self.driver, accessibility_id="select-account-bottom-sheet")
-        self.request_transaction_button = Button(self.driver, accessibility_id="request-transaction-bottom-sheet")
-
-        # Elements on set recipient screen
-        self.recipient_add_to_favorites = Button(self.driver, accessibility_id="participant-add-to-favs")
-        self.recipient_done = Button(self.driver, accessibility_id="participant-done")
-        self.new_favorite_name_input = EditBox(self.driver, accessibility_id="fav-name")
-        self.new_favorite_add_favorite = Button(self.driver, accessibility_id="add-fav")
-
-        # Transaction management
-        self.advanced_button = Button(self.driver, translation_id="advanced")
-        self.nonce_input = EditBox(self.driver, accessibility_id="nonce")
-        self.nonce_save_button = Button(self.driver, accessibility_id="save-nonce")
+    chose_recipient_button = ViewElement(ChooseRecipientButton)
+    accounts_button = ViewElement(Button, translation_id="my-accounts")
+    enter_recipient_address_button = ViewElement(Button, accessibility_id="choose-recipient-recipient-code")
+    scan_qr_code_button = ViewElement(Button, accessibility_id="scan-contact-code-button")
+    enter_recipient_address_input = ViewElement(EditBox, accessibility_id="recipient-address-input")
+    first_recipient_button = ViewElement(Button, accessibility_id="chat-icon")
+    enter_recipient_address_text = ViewElement(Text,
+                                               xpath="//*[@content-desc='choose-recipient-button']//android.widget.TextView")
+
+    recent_recipients_button = ViewElement(Button, translation_id="recent-recipients")
+    amount_edit_box = ViewElement(AmountEditBox)
+    set_max_button = ViewElement(Button, translation_id="set-max")
+    validation_error_element = ViewElement(Text,
+                                           xpath="//*[@text='Network fee']/following-sibling::*[@content-desc='icon']")
+
+    # Network fee elements
+    network_fee_button = ViewElement(Button, accessibility_id="custom-gas-fee")
+    gas_limit_input = ViewElement(EditBox, accessibility_id="gas-amount-limit")
+    per_gas_tip_limit_input = ViewElement(EditBox, accessibility_id="per-gas-tip-limit")
+    per_gas_price_limit_input = ViewElement(EditBox, accessibility_id="per-gas-price-limit")
+    max_fee_text = ViewElement(Text, xpath='//*[@text="Maximum fee:"]/following-sibling::android.widget.TextView[1]')
+    save_fee_button = ViewElement(Button, accessibility_id="save-fees")
+
+    sign_transaction_button = ViewElement(Button, accessibility_id="send-transaction-bottom-sheet")
+    sign_with_keycard_button = ViewElement(SignWithKeycardButton)
+    sign_with_password = ViewElement(Button, translation_id="sign-with-password")
+    sign_button = ViewElement(Button, translation_id="transactions-sign")
+    sign_in_phrase_text = ViewElement(Text, accessibility_id="signing-phrase-text")
+    enter_password_input = ViewElement(EditBox, accessibility_id="enter-password-input")
+    got_it_button = ViewElement(Button, accessibility_id="got-it-button")
+
+    select_asset_button = ViewElement(Button, accessibility_id="choose-asset-button")
+    asset_text = ViewElement(Text, xpath="//*[@content-desc='choose-asset-button']//android.widget.TextView")
+    recipient_text = ViewElement(Text, xpath="//*[@content-desc='choose-recipient-button']//android.widget.TextView")
+
+    share_button = ViewElement(Button, accessibility_id="share-address-button")
+
+    onboarding_message = ViewElement(Text, translation_id="this-is-you-signing")
+    validation_warnings = ViewElement(ValidationWarnings)
+    eth_asset_in_select_asset_bottom_sheet_button = ViewElement(Button, accessibility_id=":ETH-asset-value")
+
+    # Elements for commands in 1-1 chat
+    select_button = ViewElement(Button, accessibility_id="select-account-bottom-sheet")
+    request_transaction_button = ViewElement(Button, accessibility_id="request-transaction-bottom-sheet")
+
+    # Elements on set recipient screen
+    recipient_add_to_favorites = ViewElement(Button, accessibility_id="participant-add-to-favs")
+    recipient_done = ViewElement(Button, accessibility_id="participant-done")
+    new_favorite_name_input = ViewElement(EditBox, accessibility_id="fav-name")
+    new_favorite_add_favorite = ViewElement(Button, accessibility_id="add-fav")
+
+    # Transaction management
+    advanced_button = ViewElement(Button, translation_id="advanced")
+    nonce_input = ViewElement(EditBox, accessibility_id="nonce")
+    nonce_save_button = ViewElement(Button, accessibility_id="save-nonce")
 
     def set_recipient_address(self, address):
         self.driver.info("Setting recipient address to '%s'" % address)
@@ -1,7 +1,10 @@
 from selenium.common.exceptions import NoSuchElementException
+import base64
 import os
-from tests import common_password, appium_root_project_path
-from views.base_element import Button, EditBox, Text
+from support.account_snapshots import AccountSnapshot, AccountSnapshotPool
+from tests import common_password, appium_root_project_path, pytest_config_global, test_suite_data, \
+    get_app_package
+from views.base_element import Button, EditBox, Text, ViewElement
 from views.base_view import BaseView
 
 
@@ -120,59 +123,69 @@ class TermsOfUseLink(Button):
 
 class SignInView(BaseView):
 
+    password_input = ViewElement(EditBox, accessibility_id="password-input")
+    migration_password_input = ViewElement(EditBox, accessibility_id="enter-password-input")
+    sign_in_button = ViewElement(SignInButton)
+    access_key_button = ViewElement(AccessKeyButton)
+    generate_key_button = ViewElement(Button, translation_id="generate-new-key")
+    your_keys_more_icon = ViewElement(Button, xpath="//androidx.appcompat.widget.LinearLayoutCompat")
+    generate_new_key_button = ViewElement(Button, accessibility_id="generate-a-new-key")
+    create_password_input = ViewElement(EditBox, xpath="(//android.widget.EditText[@content-desc='password-input'])[1]")
+    confirm_your_password_input = ViewElement(EditBox,
+                                              xpath="(//android.widget.EditText[@content-desc='password-input'])[2]")
+    enable_notifications_button = ViewElement(Button, accessibility_id="enable-notifications")
+    maybe_later_button = ViewElement(Button, accessibility_id="maybe-later")
+    privacy_policy_link = ViewElement(PrivacyPolicyLink)
+    terms_of_use_link = ViewElement(TermsOfUseLink)
+    lets_go_button = ViewElement(Button, accessibility_id="lets-go-button")
+    keycard_storage_button = ViewElement(KeycardKeyStorageButton)
+    first_username_on_choose_chat_name = ViewElement(Text,
+                                                     xpath="//*[@content-desc='select-account-button-0']//android.widget.TextView[1]")
+    get_keycard_banner = ViewElement(Button, translation_id="get-a-keycard")
+
+    # keycard recovery
+    recover_with_keycard_button = ViewElement(Button, accessibility_id="recover-with-keycard-button")
+    begin_recovery_button = ViewElement(BeginRecoveryButton)
+    pair_to_this_device_button = ViewElement(Button, translation_id="pair-card")
+
+    # restore from seed phrase
+    seedphrase_input = ViewElement(EditBox, xpath="//android.widget.EditText")
+    enter_seed_phrase_button = ViewElement(Button, accessibility_id="enter-seed-phrase-button")
+    reencrypt_your_key_button = ViewElement(Button, accessibility_id="onboarding-next-button")
+
+    # migrate multiaccount
+    options_button = ViewElement(Button, xpath="//androidx.appcompat.widget.LinearLayoutCompat")
+    manage_keys_and_storage_button = ViewElement(Button, accessibility_id="manage-keys-and-storage-button")
+    multi_account_on_login_button = ViewElement(MultiAccountOnLoginButton)
+    move_keystore_file_option = ViewElement(Button, accessibility_id="move-keystore-file")
+    reset_database_checkbox = ViewElement(Button, translation_id="reset-database")
+    move_and_reset_button = ViewElement(MoveAndResetButton)
+    choose_storage_button = ViewElement(Button, translation_id="choose-storage")
+    enter_seed_phrase_next_button = ViewElement(Button, translation_id="enter-seed-phrase")
+    keycard_required_option = ViewElement(Button, translation_id="empty-keycard-required")
+
+    # errors
+    custom_seed_phrase_label = ViewElement(Text, translation_id="custom-seed-phrase")
+    continue_custom_seed_phrase_button = ViewElement(Button, accessibility_id="continue-custom-seed-phrase")
+    cancel_custom_seed_phrase_button = ViewElement(Button, accessibility_id="cancel-custom-seed-phrase")
+
     def __init__(self, driver):
         super().__init__(driver)
-        self.driver = driver
-
-        self.password_input = EditBox(self.driver, accessibility_id="password-input")
-        self.migration_password_input = EditBox(self.driver, accessibility_id="enter-password-input")
-        self.sign_in_button = SignInButton(self.driver)
-        self.access_key_button = AccessKeyButton(self.driver)
-        self.generate_key_button = Button(self.driver, translation_id="generate-new-key")
-        self.your_keys_more_icon = Button(self.driver, xpath="//androidx.appcompat.widget.LinearLayoutCompat")
-        self.generate_new_key_button = Button(self.driver, accessibility_id="generate-a-new-key")
-        self.create_password_input = EditBox(self.driver,
-                                             xpath="(//android.widget.EditText[@content-desc='password-input'])[1]")
-        self.confirm_your_password_input = EditBox(self.driver,
-                                                   xpath="(//android.widget.EditText[@content-desc='password-input'])[2]")
-        self.enable_notifications_button = Button(self.driver, accessibility_id="enable-notifications")
-        self.maybe_later_button = Button(self.driver, accessibility_id="maybe-later")
-        self.privacy_policy_link = PrivacyPolicyLink(self.driver)
-        self.terms_of_use_link = TermsOfUseLink(self.driver)
-        self.lets_go_button = Button(self.driver, accessibility_id="lets-go-button")
-        self.keycard_storage_button = KeycardKeyStorageButton(self.driver)
-        self.first_username_on_choose_chat_name = Text(self.driver,
-                                                       xpath="//*[@content-desc='select-account-button-0']//android.widget.TextView[1]")
-        self.get_keycard_banner = Button(self.driver, translation_id="get-a-keycard")
         self.accept_tos_checkbox = self.checkbox_button
 
-        # keycard recovery
-        self.recover_with_keycard_button = Button(self.driver, accessibility_id="recover-with-keycard-button")
-        self.begin_recovery_button = BeginRecoveryButton(self.driver)
-        self.pair_to_this_device_button = Button(self.driver, translation_id="pair-card")
-
-        # restore from seed phrase
-        self.seedphrase_input = EditBox(self.driver, xpath="//android.widget.EditText")
-        self.enter_seed_phrase_button = Button(self.driver, accessibility_id="enter-seed-phrase-button")
-        self.reencrypt_your_key_button = Button(self.driver, accessibility_id="onboarding-next-button")
-
-        # migrate multiaccount
-        self.options_button = Button(self.driver, xpath="//androidx.appcompat.widget.LinearLayoutCompat")
-        self.manage_keys_and_storage_button = Button(self.driver, accessibility_id="manage-keys-and-storage-button")
-        self.multi_account_on_login_button = MultiAccountOnLoginButton(self.driver)
-        self.move_keystore_file_option = Button(self.driver, accessibility_id="move-keystore-file")
-        self.reset_database_checkbox = Button(self.driver, translation_id="reset-database")
-        self.move_and_reset_button = MoveAndResetButton(self.driver)
-        self.choose_storage_button = Button(self.driver, translation_id="choose-storage")
-        self.enter_seed_phrase_next_button = Button(self.driver, translation_id="enter-seed-phrase")
-        self.keycard_required_option = Button(self.driver, translation_id="empty-keycard-required")
-
-        # errors
-        self.custom_seed_phrase_label = Text(self.driver, translation_id="custom-seed-phrase")
-        self.continue_custom_seed_phrase_button = Button(self.driver, accessibility_id="continue-custom-seed-phrase")
-        self.cancel_custom_seed_phrase_button = Button(self.driver, accessibility_id="cancel-custom-seed-phrase")
-
-    def create_user(self, password=common_password, keycard=False, enable_notifications=False, second_user=False):
+    def create_user(self, password=common_password, keycard=False, enable_notifications=False, second_user=False,
+                    from_snapshot=True):
+        pool = self.account_snapshot_pool
+        if from_snapshot and pool and password == common_password and not (keycard or enable_notifications or second_user):
+            snapshot = pool.claim()
+            if snapshot:
+                try:
+                    home = self.restore_account_snapshot(snapshot)
+                except Exception:
+                    pool.release(snapshot)
+                    raise
+                pool.remove(snapshot)
+                return home
         self.driver.info("## Creating new multiaccount (password:'%s', keycard:'%s')" % (password, str(keycard)),
                          device=False)
         if not second_user:
@@ -200,6 +213,39 @@ class SignInView(BaseView):
         self.driver.info("## New multiaccount is created successfully!", device=False)
         return self.get_home_view()
 
+    @property
+    def account_snapshot_pool(self):
+        if pytest_config_global.get('account_snapshots'):
+            return AccountSnapshotPool(pytest_config_global['account_snapshots'], test_suite_data.apk_name)
+
+    def save_account_snapshot(self, password=common_password):
+        self.driver.info('## Saving multiaccount snapshot', device=False)
+        package = get_app_package()
+        self.driver.terminate_app(package)
+        # listing app data dir needs appium server started with --relaxed-security
+        paths = self.driver.execute_script('mobile: shell', {'command': 'run-as',
+                                                            'args': [package, 'find', '.', '-type', 'f']})
+        files = dict()
+        for path in paths.splitlines():
+            path = path.strip()[2:]
+            if path and path.split('/')[0] not in ('cache', 'code_cache', 'lib'):
+                files[path] = base64.b64decode(self.driver.pull_file('@%s/%s' % (package, path)))
+        self.driver.activate_app(package)
+        self.account_snapshot_pool.add(AccountSnapshot(files, password))
+        self.driver.info('## Multiaccount snapshot is saved (%s files)' % len(files), device=False)
+
+    def restore_account_snapshot(self, snapshot: AccountSnapshot):
+        self.driver.info('## Restoring multiaccount from snapshot', device=False)
+        package = get_app_package()
+        self.driver.terminate_app(package)
+        for path, content in snapshot.files.items():
+            self.driver.push_file('@%s/%s' % (package, path), base64.b64encode(content).decode())
+        self.driver.activate_app(package)
+        home = self.sign_in(snapshot.password)
+        self.profile_button.wait_for_visibility_of_element(30)
+        self.driver.info('## Multiaccount is restored successfully!', device=False)
+        return home
+
     def recover_access(self, passphrase: str, password: str = common_password, keycard=False,
                        enable_notifications=False, second_user=False):
         self.driver.info("## Recover access(password:%s, keycard:%s)" % (password, str(keycard)), device=False)
@@ -1,5 +1,5 @@
 from selenium.common.exceptions import NoSuchElementException
-from views.base_element import BaseElement, Button, Text
+from views.base_element import BaseElement, Button, Text, ViewElement
 from views.base_view import BaseView
 
 
@@ -103,6 +103,4 @@ class TransactionTable(BaseElement):
 
 
 class TransactionsView(BaseView):
-    def __init__(self, driver):
-        super().__init__(driver)
-        self.transactions_table = TransactionTable(self.driver)
+    transactions_table = ViewElement(TransactionTable)
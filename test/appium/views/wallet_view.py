@@ -1,7 +1,8 @@
 import time
 
+from support.api.web3_api import BalanceWatch
 from tests import common_password
-from views.base_element import Button, Text, EditBox, SilentButton, CheckBox
+from views.base_element import Button, Text, EditBox, SilentButton, CheckBox, ViewElement
 from views.base_view import BaseView
 
 
@@ -89,118 +90,120 @@ class AccountColorButton(Button):
 
 
 class WalletView(BaseView):
+    send_transaction_button = ViewElement(SendTransactionButton)
+    send_transaction_from_main_screen = ViewElement(SendTransactionFromMainButton)
+    transaction_history_button = ViewElement(TransactionHistoryButton)
+    usd_total_value = ViewElement(Text, accessibility_id="total-amount-value-text")
+
+    receive_transaction_button = ViewElement(ReceiveTransactionButton)
+    options_button = ViewElement(Button, accessibility_id="options-menu-button")
+    manage_assets_button = ViewElement(Button, accessibility_id="wallet-manage-assets")
+    manage_accounts_button = ViewElement(Button, accessibility_id="wallet-manage-accounts")
+    scan_tokens_button = ViewElement(Button, accessibility_id="wallet-scan-token")
+    all_assets_full_names = ViewElement(Text, xpath="//*[@content-desc='checkbox-off']/../android.widget.TextView[1]")
+    all_assets_symbols = ViewElement(Button, xpath="//*[@content-desc='checkbox-off']/../android.widget.TextView[2]")
+    currency_item_text = ViewElement(Text, xpath="//*[@content-desc='currency-item']//android.widget.TextView")
+
+    address_text = ViewElement(Text, accessibility_id="address-text")
+
+    remind_me_later_button = ViewElement(Button, translation_id="remind-me-later")
+
+    total_amount_text = ViewElement(Text, accessibility_id="total-amount-value-text")
+    currency_text = ViewElement(Text, accessibility_id="total-amount-currency-text")
+    backup_recovery_phrase = ViewElement(BackupRecoveryPhrase)
+    backup_recovery_phrase_warning_text = ViewElement(Text, accessibility_id="back-up-your-seed-phrase-warning")
+
+    add_custom_token_button = ViewElement(AddCustomTokenButton)
+
+    # elements for multiaccount
+    multiaccount_more_options = ViewElement(Button, accessibility_id="accounts-more-options")
+    set_currency_button = ViewElement(Button, translation_id="set-currency")
+    add_account_button = ViewElement(Button, accessibility_id="add-new-account")
+    generate_an_account_button = ViewElement(Button, accessibility_id="add-account-sheet-generate")
+    add_watch_only_address_button = ViewElement(Button, accessibility_id="add-account-sheet-watch")
+    enter_a_seed_phrase_button = ViewElement(Button, accessibility_id="add-account-sheet-seed")
+    enter_a_private_key_button = ViewElement(Button, accessibility_id="add-account-sheet-private-key")
+    enter_address_input = ViewElement(EditBox, accessibility_id="add-account-enter-watch-address")
+    enter_seed_phrase_input = ViewElement(EditBox, accessibility_id="add-account-enter-seed")
+    enter_a_private_key_input = ViewElement(EditBox, accessibility_id="add-account-enter-private-key")
+    delete_account_button = ViewElement(Button, translation_id="delete-account")
+    enter_your_password_input = ViewElement(EditBox, accessibility_id="add-account-enter-password")
+    account_name_input = ViewElement(EditBox, accessibility_id="enter-account-name")
+    account_color_button = ViewElement(AccountColorButton)
+    add_account_generate_account_button = ViewElement(Button, accessibility_id="add-account-add-account-button")
+    status_account_total_usd_value = ViewElement(Text, accessibility_id="account-total-value")
+    scan_qr_button = ViewElement(Button, accessibility_id="accounts-qr-code")
+    close_send_transaction_view_button = ViewElement(Button, xpath="//androidx.appcompat.widget.LinearLayoutCompat")
+    hide_account_button = ViewElement(Button, accessibility_id="hide-account-button")
+
+    # collectibles
+    collectibles_button = ViewElement(Button, translation_id="wallet-collectibles")
+    nft_asset_button = ViewElement(Button, accessibility_id="nft-asset")
+    set_collectible_as_profile_photo_button = ViewElement(Button, accessibility_id="set-nft-as-pfp")
+    view_collectible_on_opensea_button = ViewElement(Button, translation_id="view-on-opensea")
+
+    # individual account settings
+    account_settings_button = ViewElement(Button, translation_id="account-settings")
+    apply_settings_button = ViewElement(Button, translation_id="apply")
+    password_delete_account_input = ViewElement(EditBox,
+                                                xpath='//*[@text="Password"]/following-sibling::*/android.widget.EditText')
+    delete_account_confirm_button = ViewElement(Button, accessibility_id="delete-account-confirm")
+
     def __init__(self, driver):
         super().__init__(driver)
-
-        self.send_transaction_button = SendTransactionButton(self.driver)
-        self.send_transaction_from_main_screen = SendTransactionFromMainButton(self.driver)
-        self.transaction_history_button = TransactionHistoryButton(self.driver)
-        self.usd_total_value = Text(self.driver, accessibility_id="total-amount-value-text")
-
-        self.receive_transaction_button = ReceiveTransactionButton(self.driver)
-        self.options_button = Button(self.driver, accessibility_id="options-menu-button")
-        self.manage_assets_button = Button(self.driver, accessibility_id="wallet-manage-assets")
-        self.manage_accounts_button = Button(self.driver, accessibility_id="wallet-manage-accounts")
-        self.scan_tokens_button = Button(self.driver, accessibility_id="wallet-scan-token")
-        self.all_assets_full_names = Text(self.driver,
-                                          xpath="//*[@content-desc='checkbox-off']/../android.widget.TextView[1]")
-        self.all_assets_symbols = Button(self.driver,
-                                         xpath="//*[@content-desc='checkbox-off']/../android.widget.TextView[2]")
-        self.currency_item_text = Text(self.driver, xpath="//*[@content-desc='currency-item']//android.widget.TextView")
-
-        self.address_text = Text(self.driver, accessibility_id="address-text")
-
-        self.remind_me_later_button = Button(self.driver, translation_id="remind-me-later")
-
-        self.total_amount_text = Text(self.driver, accessibility_id="total-amount-value-text")
-        self.currency_text = Text(self.driver, accessibility_id="total-amount-currency-text")
-        self.backup_recovery_phrase = BackupRecoveryPhrase(self.driver)
-        self.backup_recovery_phrase_warning_text = Text(self.driver,
-                                                        accessibility_id="back-up-your-seed-phrase-warning")
-
-        self.add_custom_token_button = AddCustomTokenButton(self.driver)
-
-        # elements for multiaccount
-        self.multiaccount_more_options = Button(self.driver, accessibility_id="accounts-more-options")
         self.accounts_status_account = AccountElementButton(self.driver, account_name=self.status_account_name)
-        self.set_currency_button = Button(self.driver, translation_id="set-currency")
-        self.add_account_button = Button(self.driver, accessibility_id="add-new-account")
-        self.generate_an_account_button = Button(self.driver, accessibility_id="add-account-sheet-generate")
-        self.add_watch_only_address_button = Button(self.driver, accessibility_id="add-account-sheet-watch")
-        self.enter_a_seed_phrase_button = Button(self.driver, accessibility_id="add-account-sheet-seed")
-        self.enter_a_private_key_button = Button(self.driver, accessibility_id="add-account-sheet-private-key")
-        self.enter_address_input = EditBox(self.driver, accessibility_id="add-account-enter-watch-address")
-        self.enter_seed_phrase_input = EditBox(self.driver, accessibility_id="add-account-enter-seed")
-        self.enter_a_private_key_input = EditBox(self.driver, accessibility_id="add-account-enter-private-key")
-        self.delete_account_button = Button(self.driver, translation_id="delete-account")
-        self.enter_your_password_input = EditBox(self.driver, accessibility_id="add-account-enter-password")
-        self.account_name_input = EditBox(self.driver, accessibility_id="enter-account-name")
-        self.account_color_button = AccountColorButton(self.driver)
-        self.add_account_generate_account_button = Button(self.driver,
-                                                          accessibility_id="add-account-add-account-button")
-        self.status_account_total_usd_value = Text(self.driver, accessibility_id="account-total-value")
-        self.scan_qr_button = Button(self.driver, accessibility_id="accounts-qr-code")
-        self.close_send_transaction_view_button = Button(self.driver,
-                                                         xpath="//androidx.appcompat.widget.LinearLayoutCompat")
-        self.hide_account_button = Button(self.driver, accessibility_id="hide-account-button")
-
-        # collectibles
-        self.collectibles_button = Button(self.driver, translation_id="wallet-collectibles")
-        self.nft_asset_button = Button(self.driver, accessibility_id="nft-asset")
-        self.set_collectible_as_profile_photo_button = Button(self.driver, accessibility_id="set-nft-as-pfp")
-        self.view_collectible_on_opensea_button = Button(self.driver, translation_id="view-on-opensea")
-
-        # individual account settings
-        self.account_settings_button = Button(self.driver, translation_id="account-settings")
-        self.apply_settings_button = Button(self.driver, translation_id="apply")
-        self.password_delete_account_input = EditBox(self.driver,
-                                                     xpath='//*[@text="Password"]/following-sibling::*/android.widget.EditText')
-        self.delete_account_confirm_button = Button(self.driver, accessibility_id="delete-account-confirm")
-
-    def wait_balance_is_equal_expected_amount(self, asset='ETH', expected_balance=0.1, wait_time=300):
-        counter = 0
-        while True:
-            if counter >= wait_time:
-                self.driver.fail('**Balance is not changed during %s seconds!**' % wait_time)
-            elif self.get_asset_amount_by_name(asset) != expected_balance:
-                counter += 10
-                time.sleep(10)
-                self.swipe_down()
-                self.driver.info('Waiting %s seconds for %s balance update to be equal to %s' % (
-                    counter, asset, expected_balance))
-            else:
+
+    def wait_balance_is_equal_expected_amount(self, asset='ETH', expected_balance=0.1, wait_time=300, address=None):
+        watch = BalanceWatch(address, asset) if address else None
+        start_time, chain_changed = time.time(), False
+        while time.time() - start_time < wait_time:
+            if self.get_asset_amount_by_name(asset) == expected_balance:
                 self.driver.info('Balance for %s is equal to %s' % (asset, expected_balance))
                 return
+            if watch and watch.is_supported and not chain_changed:
+                initial_balance = watch.balance
+                chain_changed = watch.wait_until(
+                    lambda balance: balance != initial_balance or balance == expected_balance,
+                    wait_time - (time.time() - start_time))
+                if not chain_changed:
+                    break
+            else:
+                time.sleep(10)
+            self.swipe_down()
+            self.driver.info('Waiting %s seconds for %s balance update to be equal to %s' % (
+                int(time.time() - start_time), asset, expected_balance))
+        self.driver.fail('**Balance is not changed during %s seconds!**' % wait_time)
 
-    def wait_balance_is_changed(self, asset='ETH', initial_balance=0, wait_time=400, scan_tokens=False):
+    def wait_balance_is_changed(self, asset='ETH', initial_balance=0, wait_time=400, scan_tokens=False, address=None):
+        """If `address` is set, wallet is refreshed only when the balance is changed on chain"""
         self.driver.info('Waiting %ss for %s updated balance' % (wait_time, asset))
-        counter = 0
-        while True:
-            if counter >= wait_time:
-                self.driver.fail(
-                    'Balance %s %s is not changed during %s seconds!' % (asset, initial_balance, wait_time))
-            elif self.asset_by_name(asset).is_element_present() and self.get_asset_amount_by_name(
-                    asset) == initial_balance:
-                if scan_tokens:
-                    self.scan_tokens()
-                if (counter / 60).is_integer():
-                    self.pull_to_refresh()
-                    counter += 20
-                counter += 10
-                time.sleep(10)
-                self.driver.info('Waiting %ss for %s updated balance' % (counter, asset))
-            elif not self.asset_by_name(asset).is_element_present(10):
-                if scan_tokens:
-                    self.scan_tokens()
-                self.swipe_up()
-                counter += 10
-                time.sleep(10)
-                self.driver.info('Waiting %s seconds for %s to display asset' % (counter, asset))
-            else:
+        watch = BalanceWatch(address, asset) if address else None
+        start_time, last_refresh, chain_changed = time.time(), time.time(), False
+        while time.time() - start_time < wait_time:
+            asset_is_shown = self.asset_by_name(asset).is_element_present(10)
+            if asset_is_shown and self.get_asset_amount_by_name(asset) != initial_balance:
                 self.driver.info('Balance is updated!')
                 self.wallet_button.double_click()
                 self.element_by_translation_id("wallet-total-value").scroll_to_element(direction='up')
                 return self
+            if watch and watch.is_supported and not chain_changed:
+                chain_changed = watch.wait_until(lambda balance: balance != initial_balance,
+                                                 wait_time - (time.time() - start_time))
+                if not chain_changed:
+                    break
+                self.driver.info('%s balance is changed on chain, refreshing wallet' % asset)
+            if scan_tokens:
+                self.scan_tokens()
+            if not asset_is_shown:
+                self.swipe_up()
+                self.driver.info('Waiting %s seconds for %s to display asset' % (int(time.time() - start_time), asset))
+            elif chain_changed or time.time() - last_refresh >= 60:
+                self.pull_to_refresh(wait_sec=5)
+                last_refresh = time.time()
+            if not chain_changed:
+                time.sleep(10)
+            self.driver.info('Waiting %ss for %s updated balance' % (int(time.time() - start_time), asset))
+        self.driver.fail('Balance %s %s is not changed during %s seconds!' % (asset, initial_balance, wait_time))
 
     def get_sign_in_phrase(self):
         return ' '.join([element.text for element in self.sign_in_phrase.find_elements()])
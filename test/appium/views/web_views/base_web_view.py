@@ -1,45 +1,42 @@
 import time
 
-from views.base_element import EditBox, Button, BaseElement
+from views.base_element import EditBox, Button, BaseElement, ViewElement
 from views.base_view import BaseView
 
 
 class BaseWebView(BaseView):
 
-    def __init__(self, driver):
-        super().__init__(driver)
+    progress_bar_icon = ViewElement(Button, xpath="//android.widget.ProgressBar")
+    url_edit_box_lock_icon = ViewElement(Button, xpath="'(//android.view.ViewGroup[@content-desc='icon'])[2]")
+    policy_summary = ViewElement(Button,
+                                 xpath="//*[@content-desc='Status Privacy Policy'] | //*[@text='Status Privacy Policy']")
+    terms_of_use_summary = ViewElement(Button, xpath="//*[@content-desc='Status App Terms of Use']")
 
-        self.progress_bar_icon = Button(self.driver, xpath="//android.widget.ProgressBar")
-        self.url_edit_box_lock_icon = Button(self.driver, xpath="'(//android.view.ViewGroup[@content-desc='icon'])[2]")
-        self.policy_summary = Button(self.driver,
-                                     xpath="//*[@content-desc='Status Privacy Policy'] | //*[@text='Status Privacy Policy']")
-        self.terms_of_use_summary = Button(self.driver, xpath="//*[@content-desc='Status App Terms of Use']")
+    browser_previous_page_button = ViewElement(Button, accessibility_id="previous-page-button")
+    browser_next_page_button = ViewElement(Button, accessibility_id="next-page-button")
 
-        self.browser_previous_page_button = Button(self.driver, accessibility_id="previous-page-button")
-        self.browser_next_page_button = Button(self.driver, accessibility_id="next-page-button")
+    web_view_browser = ViewElement(Button, xpath="//*[contains(@text,'WebView Browser Tester')]")
+    always_button = ViewElement(Button, xpath="//*[contains(@text,'ALWAYS')]")
+    browser_refresh_page_button = ViewElement(Button, accessibility_id="refresh-page-button")
+    share_url_button = ViewElement(Button, accessibility_id="share")
+    go_back_button = ViewElement(Button, translation_id="browsing-site-blocked-go-back")
+    options_button = ViewElement(Button, accessibility_id="browser-options")
+    connect_account_button = ViewElement(Button, accessibility_id="connect-account")
+    connected_account_button = ViewElement(Button, accessibility_id="connected-account")
+    open_chat_from_dapp_button = ViewElement(Button, accessibility_id="open-chat")
+    new_tab_button = ViewElement(Button, accessibility_id="new-tab")
+    continue_anyway_button = ViewElement(Button, translation_id="continue-anyway")
+    open_tabs_button = ViewElement(Button, accessibility_id="browser-open-tabs")
+    open_new_tab_plus_button = ViewElement(Button, accessibility_id="plus-button")
+    close_all_button = ViewElement(Button, accessibility_id="close-all")
+    empty_tab_button = ViewElement(Button, accessibility_id="tab-itemEmpty tab")
+    camera_image_in_dapp = ViewElement(BaseElement, class_name="android.widget.Image")
+    close_privacy_policy_button = ViewElement(Button, xpath="//androidx.appcompat.widget.LinearLayoutCompat")
 
-        self.web_view_browser = Button(self.driver, xpath="//*[contains(@text,'WebView Browser Tester')]")
-        self.always_button = Button(self.driver, xpath="//*[contains(@text,'ALWAYS')]")
-        self.browser_refresh_page_button = Button(self.driver, accessibility_id="refresh-page-button")
-        self.share_url_button = Button(self.driver, accessibility_id="share")
-        self.go_back_button = Button(self.driver, translation_id="browsing-site-blocked-go-back")
-        self.options_button = Button(self.driver, accessibility_id="browser-options")
-        self.connect_account_button = Button(self.driver, accessibility_id="connect-account")
-        self.connected_account_button = Button(self.driver, accessibility_id="connected-account")
-        self.open_chat_from_dapp_button = Button(self.driver, accessibility_id="open-chat")
-        self.new_tab_button = Button(self.driver, accessibility_id="new-tab")
-        self.continue_anyway_button = Button(self.driver, translation_id="continue-anyway")
-        self.open_tabs_button = Button(self.driver, accessibility_id="browser-open-tabs")
-        self.open_new_tab_plus_button = Button(self.driver, accessibility_id="plus-button")
-        self.close_all_button = Button(self.driver, accessibility_id="close-all")
-        self.empty_tab_button = Button(self.driver, accessibility_id="tab-itemEmpty tab")
-        self.camera_image_in_dapp = BaseElement(self.driver, class_name="android.widget.Image")
-        self.close_privacy_policy_button = Button(self.driver, xpath="//androidx.appcompat.widget.LinearLayoutCompat")
-
-        # bookmarks management
-        self.add_remove_favorites_button = Button(self.driver, accessibility_id="add-remove-fav")
-        self.bookmark_name_input = EditBox(self.driver, accessibility_id="bookmark-input")
-        self.save_bookmark_button = Button(self.driver, accessibility_id="save-bookmark")
+    # bookmarks management
+    add_remove_favorites_button = ViewElement(Button, accessibility_id="add-remove-fav")
+    bookmark_name_input = ViewElement(EditBox, accessibility_id="bookmark-input")
+    save_bookmark_button = ViewElement(Button, accessibility_id="save-bookmark")
 
     def wait_for_d_aap_to_load(self, wait_time=35):
         self.driver.info("Waiting %ss for dapp to load" % wait_time)
@@ -1,4 +1,4 @@
-from views.web_views.base_web_view import BaseWebView, Button
+from views.web_views.base_web_view import BaseWebView, Button, ViewElement
 import time
 
 
@@ -95,25 +95,21 @@ class SendOneTransactionInBatchButton(Button):
 
 class StatusTestDAppView(BaseWebView):
 
-    def __init__(self, driver):
-        super(StatusTestDAppView, self).__init__(driver)
-        self.driver = driver
-
-        self.assets_button = Button(self.driver, webview="Assets")
-        self.request_eth_button = Button(self.driver, webview="Request Ropsten ETH")
-        self.request_stt_button = RequestSTTButton(self.driver)
-
-        self.transactions_button = TransactionsButton(self.driver)
-        self.sign_message_button = TransactionsButton.SignMessageButton(self.driver)
-        self.deploy_contract_button = TransactionsButton.DeployContractButton(self.driver)
-        self.send_one_tx_in_batch_button = SendOneTransactionInBatchButton(self.driver)
-        self.send_two_tx_one_by_one_button = TransactionsButton.SendTwoTxOneByOneButton(self.driver)
-        self.send_two_tx_in_batch_button = TransactionsButton.SendTwoTxInBatchButton(self.driver)
-        self.test_filters_button = TransactionsButton.TestFiltersButton(self.driver)
-        self.sign_typed_message_button = TransactionsButton.SignTypedMessageButton(self.driver)
-
-        self.status_api_button = StatusAPIButton(self.driver)
-        self.request_contact_code_button = Button(self.driver, xpath="//*[@text='Request contact code (public key)']")
+    assets_button = ViewElement(Button, webview="Assets")
+    request_eth_button = ViewElement(Button, webview="Request Ropsten ETH")
+    request_stt_button = ViewElement(RequestSTTButton)
+
+    transactions_button = ViewElement(TransactionsButton)
+    sign_message_button = ViewElement(TransactionsButton.SignMessageButton)
+    deploy_contract_button = ViewElement(TransactionsButton.DeployContractButton)
+    send_one_tx_in_batch_button = ViewElement(SendOneTransactionInBatchButton)
+    send_two_tx_one_by_one_button = ViewElement(TransactionsButton.SendTwoTxOneByOneButton)
+    send_two_tx_in_batch_button = ViewElement(TransactionsButton.SendTwoTxInBatchButton)
+    test_filters_button = ViewElement(TransactionsButton.TestFiltersButton)
+    sign_typed_message_button = ViewElement(TransactionsButton.SignTypedMessageButton)
+
+    status_api_button = ViewElement(StatusAPIButton)
+    request_contact_code_button = ViewElement(Button, xpath="//*[@text='Request contact code (public key)']")
 
     def wait_for_d_aap_to_load(self, wait_time=10):
         self.driver.info("**Wait %ss for assets in simpledapp**" % wait_time)